@@ -1,12 +1,17 @@
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+from sentiment_engine import sentiment_engine
 
 def analyze_sentiment(text):
     """
-    使用vader分析文本的情感倾向
+    使用vader分析文本的情感倾向(共用一个分析器,长文本分句打分后汇总)
     arags: text(str)
     return dict:包含情感得分的字典,例如,position,negivite,neu,compund(综合得分)
     """
-    analyzer=SentimentIntensityAnalyzer()
-    scores=analyzer.polarity_scores(text)
+    scores=sentiment_engine.score(text)
     return scores
+
+def analyze_sentiments(texts):
+    """
+    批量分析多条文本的情感倾向,句子去重后一次打分
+    """
+    return sentiment_engine.score_many(texts)
     
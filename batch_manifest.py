@@ -0,0 +1,168 @@
+"""
+增量批处理清单模块
+
+清单保存在输出文件夹中，记录每个输入文件的相对路径、大小、修改时间、
+内容哈希和输出路径，以及生成这些输出时的处理配置指纹。再次运行时只处理
+新增或变化的文件，并清理已删除输入对应的输出；处理配置指纹变化时所有
+文件都重新处理。
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+
+
+class BatchManifest:
+    """增量批处理清单"""
+
+    FILE_NAME = ".manifest.json"
+
+    def __init__(self, output_folder: Union[str, Path], fingerprint: Optional[str] = None):
+        self.output_folder = Path(output_folder)
+        self.path = self.output_folder / self.FILE_NAME
+        self.fingerprint = fingerprint
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        # 清单中的输出是否由不同的处理配置生成（需要全部重新处理）
+        self.stale = False
+        # plan 时记录的待处理文件的大小、修改时间和哈希，处理成功后写入清单
+        self._planned: Dict[str, Dict[str, Any]] = {}
+
+    @classmethod
+    def load(cls, output_folder: Union[str, Path],
+             fingerprint: Optional[str] = None) -> "BatchManifest":
+        """加载清单，不存在或损坏时返回空清单
+
+        fingerprint 为当前的处理配置指纹；与清单中的指纹不同时保留条目
+        （用于清理已删除输入的输出），但所有文件都需要重新处理。
+        """
+        manifest = cls(output_folder, fingerprint)
+        if not manifest.path.exists():
+            return manifest
+
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == MANIFEST_VERSION:
+                manifest.entries = data.get("files", {})
+                if manifest.entries and data.get("fingerprint") != fingerprint:
+                    logger.info(f"处理配置已变化，将重新处理全部文件: {manifest.path}")
+                    manifest.stale = True
+            else:
+                logger.warning(f"清单版本不匹配，将重新处理全部文件: {manifest.path}")
+        except (json.JSONDecodeError, IOError) as e:
+            logger.warning(f"清单加载失败，将重新处理全部文件: {e}")
+
+        return manifest
+
+    def plan(self, input_folder: Path, files: List[Path],
+             output_paths: Dict[Path, Path], hash_func) -> Tuple[List[Path], int, List[str]]:
+        """比较当前输入与清单，返回 (需要处理的文件, 未变化文件数, 已删除的相对路径)
+
+        大小和修改时间都未变化时直接跳过，不读取文件内容；只有大小相同但
+        修改时间变化时才计算哈希确认内容是否真的变化。需要处理的文件在这里
+        计算一次哈希，record 直接使用，处理完成后不再读取文件。
+        """
+        to_process = []
+        unchanged = 0
+        seen = set()
+
+        for file_path in files:
+            rel = file_path.relative_to(input_folder).as_posix()
+            seen.add(rel)
+            entry = self.entries.get(rel)
+            output_path = output_paths[file_path]
+            stat = file_path.stat()
+            content_hash = None
+
+            if entry is not None and not self.stale and output_path.exists():
+                if entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                    unchanged += 1
+                    continue
+
+                if entry["size"] == stat.st_size:
+                    content_hash = self._hash(hash_func, file_path)
+                    if content_hash is not None and entry.get("sha256") == content_hash:
+                        # 内容未变（例如被 touch 过），只更新修改时间
+                        entry["mtime_ns"] = stat.st_mtime_ns
+                        unchanged += 1
+                        continue
+
+            if content_hash is None:
+                content_hash = self._hash(hash_func, file_path)
+            self._planned[rel] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns,
+                                  "sha256": content_hash}
+            # 配置变化后旧条目已经过期，先移除，处理失败的文件下次运行仍会重新处理
+            if self.stale:
+                self.entries.pop(rel, None)
+            to_process.append(file_path)
+
+        deleted = [rel for rel in self.entries if rel not in seen]
+        return to_process, unchanged, deleted
+
+    @staticmethod
+    def _hash(hash_func, file_path: Path) -> Optional[str]:
+        """计算文件哈希，读取失败时返回 None（由后续处理报告错误）"""
+        try:
+            return hash_func(file_path)
+        except OSError as e:
+            logger.warning(f"计算文件哈希失败 {file_path}: {e}")
+            return None
+
+    def record(self, input_folder: Path, file_path: Path, output_path: Path,
+               content_hash: Optional[str] = None) -> None:
+        """记录处理成功的文件
+
+        大小、修改时间和哈希取 plan 时的值（处理期间文件再被修改时，下次运行
+        会重新处理）；没有经过 plan 的文件才读取当前状态，此时需要传入 content_hash。
+        """
+        rel = file_path.relative_to(input_folder).as_posix()
+        planned = self._planned.pop(rel, None)
+        if planned is None:
+            stat = file_path.stat()
+            planned = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": None}
+        if content_hash is not None:
+            planned["sha256"] = content_hash
+        self.entries[rel] = {
+            **planned,
+            "output": output_path.relative_to(self.output_folder).as_posix(),
+        }
+
+    def remove_deleted(self, deleted: List[str]) -> int:
+        """删除已不存在的输入对应的输出文件和清单条目，返回删除数
+
+        不同子文件夹中的同名输入会写到同一个输出文件，仍有输入使用的输出不删除。
+        """
+        removed_entries = [self.entries.pop(rel) for rel in deleted if rel in self.entries]
+        live_outputs = {entry["output"] for entry in self.entries.values()}
+        removed = 0
+        for entry in removed_entries:
+            if entry["output"] in live_outputs:
+                removed += 1
+                continue
+
+            output_path = self.output_folder / entry["output"]
+            try:
+                if output_path.exists():
+                    output_path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.error(f"删除过期输出失败 {output_path}: {e}")
+
+        return removed
+
+    def save(self) -> None:
+        """原子地保存清单（先写临时文件再替换）"""
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"version": MANIFEST_VERSION, "fingerprint": self.fingerprint,
+                           "files": self.entries},
+                          f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except IOError as e:
+            logger.error(f"保存清单失败 {self.path}: {e}")
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+批量处理执行后端基准测试
+
+对比 thread / process 两种执行后端在不同工作数下的吞吐量（文件/秒），
+用于确认进程池随核心数扩展。
+
+用法:
+  python benchmarks/bench_executor.py --files 200 --workers 1 2 4 8
+"""
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from improved_main import FileProcessor
+
+SAMPLE_SENTENCES = [
+    "Apple announced record revenue of 123.45 billion dollars on 2024-01-15.",
+    "The team in New York was very happy with the excellent results.",
+    "Shipping delays in London caused terrible frustration for 1,200 customers.",
+    "Microsoft and Google met in Seattle on 03/12/2023 to discuss the merger.",
+    "Overall the quarter was fine, although costs rose by 7.5 percent.",
+]
+
+
+def generate_corpus(folder: Path, file_count: int, sentences_per_file: int) -> None:
+    """生成测试语料"""
+    rng = random.Random(0)
+    for index in range(file_count):
+        text = " ".join(rng.choice(SAMPLE_SENTENCES) for _ in range(sentences_per_file))
+        (folder / f"doc_{index:05d}.txt").write_text(text, encoding="utf-8")
+
+
+def run_once(processor: FileProcessor, input_folder: Path, executor_type: str,
+             workers: int) -> float:
+    """运行一次批量处理，返回吞吐量（文件/秒）"""
+    with tempfile.TemporaryDirectory() as output_folder:
+        start = time.perf_counter()
+        result = processor.process_batch(
+            str(input_folder), output_folder, "json",
+            use_pipe=False, executor_type=executor_type, max_workers=workers
+        )
+        elapsed = time.perf_counter() - start
+    return result.get("processed", 0) / elapsed if elapsed > 0 else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="执行后端吞吐量基准测试")
+    parser.add_argument("--files", type=int, default=200, help="测试文件数")
+    parser.add_argument("--sentences", type=int, default=40, help="每个文件的句子数")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}),
+                        help="要测试的工作数")
+    parser.add_argument("--executors", nargs="+", default=["thread", "process"],
+                        choices=["thread", "process"], help="要测试的执行后端")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    processor = FileProcessor()
+
+    with tempfile.TemporaryDirectory() as input_folder:
+        input_folder = Path(input_folder)
+        generate_corpus(input_folder, args.files, args.sentences)
+
+        print(f"文件数: {args.files}, CPU核心数: {os.cpu_count()}")
+        print(f"{'后端':<10}{'工作数':>8}{'文件/秒':>12}{'加速比':>10}")
+
+        for executor_type in args.executors:
+            baseline = None
+            for workers in args.workers:
+                throughput = run_once(processor, input_folder, executor_type, workers)
+                baseline = baseline or throughput
+                speedup = throughput / baseline if baseline else 0.0
+                print(f"{executor_type:<10}{workers:>8}{throughput:>12.1f}{speedup:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+处理结果内存占用基准测试
+
+对比原来的 ProcessingResult（普通 dataclass，每个实体一个字典）与 __slots__ +
+EntitySpans 的紧凑实现，统计在内存中保留 N 个结果时新分配的内存。
+输入文本由调用方持有，两种实现都只引用它，不计入结果。
+
+用法:
+  python benchmarks/bench_result_memory.py --docs 100000 --entities 20
+"""
+import argparse
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from entity_spans import EntitySpans
+from improved_data_processor import ProcessingResult
+
+LABELS = ["PERSON", "ORG", "GPE", "DATE", "MONEY"]
+
+
+@dataclass
+class LegacyResult:
+    """原实现"""
+    original_text: str
+    processed_text: str
+    language: str
+    sentiment: Dict[str, float]
+    numbers: List[float]
+    dates: List[str]
+    entities: List[Dict[str, str]]
+    statistics: Dict[str, Any]
+    errors: List[str]
+
+
+def make_text(index: int, entities: int) -> str:
+    return " ".join(f"Entity{index}x{n} said something" for n in range(entities))
+
+
+def fresh(value: str) -> str:
+    """返回内容相同的新字符串对象（spaCy 的 ent.label_ 每次返回新对象）"""
+    return (" " + value)[1:]
+
+
+def build_legacy(text: str, entities: int) -> LegacyResult:
+    spans = []
+    position = 0
+    for n in range(entities):
+        start = text.index("Entity", position)
+        end = text.index(" ", start)
+        position = end
+        spans.append({"text": text[start:end], "label": fresh(LABELS[n % len(LABELS)]),
+                      "start": start, "end": end})
+    return LegacyResult(text, "", fresh("en"), {}, [], [], spans, {}, [])
+
+
+def build_compact(text: str, entities: int) -> ProcessingResult:
+    spans = EntitySpans(text)
+    position = 0
+    for n in range(entities):
+        start = text.index("Entity", position)
+        end = text.index(" ", start)
+        position = end
+        spans.append(fresh(LABELS[n % len(LABELS)]), start, end)
+    return ProcessingResult(text, "", fresh("en"), {}, [], [], spans, {}, [])
+
+
+def measure(builder, texts: List[str], entities: int) -> int:
+    """返回保留全部结果时新分配的字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    results = [builder(text, entities) for text in texts]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del results
+    return used
+
+
+def main():
+    parser = argparse.ArgumentParser(description="处理结果内存占用基准测试")
+    parser.add_argument("--docs", type=int, default=20000, help="结果数量")
+    parser.add_argument("--entities", type=int, default=20, help="每个结果的实体数")
+    args = parser.parse_args()
+
+    texts = [make_text(index, args.entities) for index in range(args.docs)]
+    legacy = measure(build_legacy, texts, args.entities)
+    compact = measure(build_compact, texts, args.entities)
+
+    print(f"{'实现':<10}{'内存(MB)':>12}{'每个结果(B)':>14}")
+    for name, used in (("原实现", legacy), ("紧凑实现", compact)):
+        print(f"{name:<10}{used / 1024 / 1024:>12.1f}{used / args.docs:>14.0f}")
+    print(f"节省 {1 - compact / legacy:.0%}")
+
+
+if __name__ == "__main__":
+    main()
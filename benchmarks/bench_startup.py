@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+命令行冷启动基准测试
+
+分别测量 `improved_main.py --config` 和处理单个小 .txt 文件的冷启动耗时，
+以及子进程的峰值内存（RSS，仅类 Unix 系统）。
+
+用法:
+  python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+MAIN_SCRIPT = PROJECT_ROOT / "improved_main.py"
+
+# 在独立的包装进程中运行命令，只统计该命令自身的峰值内存
+RSS_WRAPPER = (
+    "import resource, subprocess, sys\n"
+    "subprocess.run(sys.argv[1:], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)\n"
+    "print(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)\n"
+)
+
+
+def measure(command, runs: int):
+    """多次运行命令，返回耗时列表（秒）和峰值内存（MB，不可用时为 None）"""
+    timings = []
+    peak_rss = None
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-c", RSS_WRAPPER] + command,
+                cwd=PROJECT_ROOT, capture_output=True, text=True
+            )
+            rss_kb = int(completed.stdout.strip().splitlines()[-1])
+            peak_rss = max(peak_rss or 0, rss_kb / 1024)
+        except (ValueError, IndexError):
+            # resource 模块不可用（例如 Windows），只统计耗时
+            subprocess.run(command, cwd=PROJECT_ROOT,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+
+    return timings, peak_rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="命令行冷启动基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="每个场景的运行次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sample_file = Path(tmp_dir) / "sample.txt"
+        sample_file.write_text(
+            "Hello world! This is a small test with 123 numbers and 2024-01-01 date.",
+            encoding="utf-8"
+        )
+        output_file = Path(tmp_dir) / "sample.out.txt"
+
+        scenarios = {
+            "--config": [sys.executable, str(MAIN_SCRIPT), "--config"],
+            "小文件 .txt": [sys.executable, str(MAIN_SCRIPT),
+                          str(sample_file), str(output_file)],
+        }
+
+        print(f"{'场景':<14}{'中位数(s)':>12}{'最小(s)':>10}{'峰值RSS(MB)':>14}")
+        for name, command in scenarios.items():
+            timings, peak_rss = measure(command, args.runs)
+            rss_text = f"{peak_rss:.1f}" if peak_rss is not None else "n/a"
+            print(f"{name:<14}{statistics.median(timings):>12.3f}"
+                  f"{min(timings):>10.3f}{rss_text:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+分层（turbo）处理基准测试
+
+对比所有文档都做完整 NLP（AdvancedTextProcessor.process_texts）与分层处理
+（TieredTextProcessor.process_texts，只有包含关键词的文档升级到完整层）的耗时。
+生成的文档中有 --escalate-ratio 比例包含升级关键词。
+
+用法:
+  python benchmarks/bench_tiered.py --docs 5000 --escalate-ratio 0.02
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from improved_data_processor import AdvancedTextProcessor
+from tiered_processor import EscalationRules, TieredTextProcessor
+
+WORDS = ["order", "shipped", "invoice", "customer", "payment", "received", "the", "was",
+         "on", "time", "and", "package", "delivered", "account", "updated", "thanks"]
+KEYWORD = "refund"
+
+
+def make_docs(count: int, ratio: float, seed: int):
+    rng = random.Random(seed)
+    docs = []
+    for index in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(20, 80))]
+        if rng.random() < ratio:
+            words.insert(rng.randrange(len(words)), KEYWORD)
+        docs.append(f"Ticket {index} on 2024-03-{index % 28 + 1:02d}: " + " ".join(words) + ".")
+    return docs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="分层处理基准测试")
+    parser.add_argument("--docs", type=int, default=2000, help="文档数量")
+    parser.add_argument("--escalate-ratio", type=float, default=0.02, help="包含升级关键词的文档比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    docs = make_docs(args.docs, args.escalate_ratio, args.seed)
+    full_processor = AdvancedTextProcessor()
+    tiered = TieredTextProcessor(full_processor, rules=EscalationRules(keywords=[KEYWORD]))
+
+    # 预热：加载模型，避免计入第一次加载的时间
+    full_processor.process_texts(docs[:10])
+
+    start = time.perf_counter()
+    full_processor.process_texts(docs)
+    full_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tiered.process_texts(docs)
+    tiered_seconds = time.perf_counter() - start
+
+    print(f"{'模式':<10}{'耗时(秒)':>10}{'文档/秒':>12}")
+    for name, seconds in (("完整处理", full_seconds), ("分层处理", tiered_seconds)):
+        print(f"{name:<10}{seconds:>10.2f}{len(docs) / seconds:>12.0f}")
+    stats = tiered.stats()
+    print(f"简化层 {stats['simple']} 个，完整层 {stats['full']} 个，"
+          f"加速 {full_seconds / tiered_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+VADER 情感打分基准测试
+
+对比 NLTK SentimentIntensityAnalyzer.polarity_scores 逐句打分与
+VectorizedVader.polarity_scores_batch 批量打分的耗时，并报告两者 compound
+分数的最大差异。句子由 VADER 词典中的词和常见否定词、加强词随机组成。
+
+用法:
+  python benchmarks/bench_vader.py --sentences 100000 --batch-size 10000
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from sentiment_engine import SentimentEngine
+from vader_vectorized import VectorizedVader
+
+FILLER = ["the", "a", "movie", "service", "was", "is", "and", "it", "food", "I",
+          "not", "never", "very", "really", "but", "kind", "of", "!", "?"]
+
+
+def make_sentences(lexicon, count: int, seed: int):
+    rng = random.Random(seed)
+    words = sorted(lexicon)[:3000] + FILLER * 100
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(3, 30))) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VADER 情感打分基准测试")
+    parser.add_argument("--sentences", type=int, default=50000, help="句子数量")
+    parser.add_argument("--batch-size", type=int, default=10000, help="向量化每批句子数")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    analyzer = SentimentEngine().get_analyzer()
+    vectorized = VectorizedVader.from_analyzer(analyzer)
+    sentences = make_sentences(analyzer.lexicon, args.sentences, args.seed)
+
+    start = time.perf_counter()
+    expected = [analyzer.polarity_scores(sentence) for sentence in sentences]
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = []
+    for offset in range(0, len(sentences), args.batch_size):
+        actual.extend(vectorized.polarity_scores_batch(sentences[offset:offset + args.batch_size]))
+    batch_seconds = time.perf_counter() - start
+
+    max_diff = max((abs(e["compound"] - a["compound"]) for e, a in zip(expected, actual)),
+                   default=0.0)
+
+    print(f"{'实现':<16}{'耗时(秒)':>10}{'句子/秒':>12}")
+    for name, seconds in (("polarity_scores", loop_seconds), ("向量化批量", batch_seconds)):
+        print(f"{name:<16}{seconds:>10.2f}{len(sentences) / seconds:>12.0f}")
+    print(f"加速 {loop_seconds / batch_seconds:.1f}x，compound 最大差异 {max_diff:.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+.xlsx 读取基准测试
+
+分别生成"宽表"（少行多列）和"长表"（多行少列）工作簿，对比
+openpyxl read_only 路径与 xlsx_reader 直接解析XML路径的耗时和峰值内存。
+
+用法:
+  python benchmarks/bench_xlsx.py --tall-rows 200000 --wide-cols 500 --workers 4
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# 添加项目根目录到路径
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from xlsx_reader import read_workbook_text
+
+CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '{overrides}'
+    '<Override PartName="/xl/sharedStrings.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/>'
+    '</Types>'
+)
+ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+
+WORDS = ["alpha", "beta", "gamma", "delta", "销售", "报告", "excellent", "poor"]
+
+
+def column_letter(index: int) -> str:
+    """从0开始的列号转换为列字母"""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def write_workbook(path: Path, sheets: int, rows: int, cols: int) -> None:
+    """生成测试工作簿：偶数列为共享字符串，奇数列为数字"""
+    shared = [f"{WORDS[i % len(WORDS)]} {i}" for i in range(1000)]
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        overrides = "".join(
+            f'<Override PartName="/xl/worksheets/sheet{n}.xml" '
+            'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+            for n in range(1, sheets + 1))
+        zf.writestr("[Content_Types].xml", CONTENT_TYPES.format(overrides=overrides))
+        zf.writestr("_rels/.rels", ROOT_RELS)
+        zf.writestr("xl/workbook.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"><sheets>'
+            + "".join(f'<sheet name="Sheet{n}" sheetId="{n}" r:id="rId{n}"/>'
+                      for n in range(1, sheets + 1))
+            + '</sheets></workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(f'<Relationship Id="rId{n}" Target="worksheets/sheet{n}.xml" '
+                      'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+                      for n in range(1, sheets + 1))
+            + f'<Relationship Id="rId{sheets + 1}" Target="sharedStrings.xml" '
+            'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+            '</Relationships>'))
+        zf.writestr("xl/sharedStrings.xml", (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            f'<sst xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            f'count="{len(shared)}" uniqueCount="{len(shared)}">'
+            + "".join(f"<si><t>{escape(s)}</t></si>" for s in shared)
+            + '</sst>'))
+
+        letters = [column_letter(c) for c in range(cols)]
+        for n in range(1, sheets + 1):
+            with zf.open(f"xl/worksheets/sheet{n}.xml", "w") as f:
+                f.write(b'<?xml version="1.0" encoding="UTF-8"?>'
+                        b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+                        b'<sheetData>')
+                for r in range(1, rows + 1):
+                    cells = []
+                    for c, letter in enumerate(letters):
+                        if c % 2 == 0:
+                            cells.append(f'<c r="{letter}{r}" t="s"><v>{(r * 7 + c) % len(shared)}</v></c>')
+                        else:
+                            cells.append(f'<c r="{letter}{r}"><v>{r * c * 0.5}</v></c>')
+                    f.write(f'<row r="{r}">{"".join(cells)}</row>'.encode("utf-8"))
+                f.write(b'</sheetData></worksheet>')
+
+
+def read_with_openpyxl(path: Path) -> str:
+    """原 openpyxl read_only 路径（与 FileHandler._read_excel_file 相同）"""
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(str(path), read_only=True)
+    text_parts = []
+    for sheet_name in workbook.sheetnames:
+        sheet_text = []
+        for row in workbook[sheet_name].iter_rows(values_only=True):
+            row_text = ' '.join(str(cell) for cell in row if cell is not None)
+            if row_text.strip():
+                sheet_text.append(row_text)
+        if sheet_text:
+            text_parts.append(f"Sheet: {sheet_name}\n" + '\n'.join(sheet_text))
+    workbook.close()
+    return '\n\n'.join(text_parts)
+
+
+def measure(func, *args):
+    """返回 (耗时秒, 峰值内存MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=".xlsx 读取基准测试")
+    parser.add_argument("--tall-rows", type=int, default=100000, help="长表行数")
+    parser.add_argument("--wide-cols", type=int, default=500, help="宽表列数")
+    parser.add_argument("--sheets", type=int, default=4, help="每个工作簿的工作表数")
+    parser.add_argument("--workers", type=int, default=4, help="并行解析工作表的进程数")
+    args = parser.parse_args()
+
+    try:
+        import openpyxl  # noqa: F401
+        have_openpyxl = True
+    except ImportError:
+        have_openpyxl = False
+        print("未安装 openpyxl，只测试 XML 路径")
+
+    shapes = {
+        "长表": (args.tall_rows // args.sheets, 6),
+        "宽表": (2000 // args.sheets, args.wide_cols),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'工作簿':<8}{'方式':<14}{'耗时(s)':>10}{'峰值内存(MB)':>14}")
+        for label, (rows, cols) in shapes.items():
+            path = Path(tmp) / f"{label}.xlsx"
+            write_workbook(path, args.sheets, rows, cols)
+
+            if have_openpyxl:
+                elapsed, peak = measure(read_with_openpyxl, path)
+                print(f"{label:<8}{'openpyxl':<14}{elapsed:>10.3f}{peak:>14.1f}")
+            elapsed, peak = measure(read_workbook_text, path, 1)
+            print(f"{label:<8}{'xml':<14}{elapsed:>10.3f}{peak:>14.1f}")
+            # 子进程的内存不计入 tracemalloc，这里只比较耗时
+            elapsed, _ = measure(read_workbook_text, path, args.workers)
+            print(f"{label:<8}{f'xml x{args.workers}':<14}{elapsed:>10.3f}{'-':>14}")
+
+
+if __name__ == "__main__":
+    main()
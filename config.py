@@ -12,9 +12,63 @@ class Config:
     DEFAULT_CONFIG = {
         "processing": {
             "max_file_size_mb": 100,
-            "chunk_size": 1024,
+            "chunk_size": 256,
+            "stream_threshold_mb": 10,
+            "stream_max_processed_chars": 1000000,
+            "stream_max_entities": 10000,
+            "pdf_workers": None,
+            "batch_extract_workers": 1,
+            "pdf_max_pages": None,
+            "pdf_page_range": None,
+            "xlsx_reader": "xml",
+            "xlsx_workers": 1,
+            "typed_cells": True,
+            "scan_workers": 8,
             "max_workers": 4,
-            "supported_formats": [".txt", ".csv", ".json", ".pdf", ".xlsx", ".docx"]
+            "executor": "thread",
+            "nlp_pipe": False,
+            "pipe_batch_size": 64,
+            "pipe_n_process": 1,
+            "supported_formats": [".txt", ".csv", ".json", ".jsonl", ".pdf", ".xlsx", ".docx"]
+        },
+        "pipeline": {
+            "enabled": False,
+            "read_workers": 2,
+            "nlp_workers": 4,
+            "write_workers": 2,
+            "queue_size": 32,
+            "max_inflight_mb": 256,
+            "report_interval_s": 5
+        },
+        "sentiment": {
+            "weighting": "length",
+            "cache_size": 10000,
+            "backend": "vader"
+        },
+        "turbo": {
+            "enabled": False,
+            "sentiment": False,
+            "escalate_streamed": False,
+            "escalate_min_chars": None,
+            "escalate_languages": [],
+            "escalate_keywords": []
+        },
+        "output_writer": {
+            "enabled": False,
+            "batch_size": 64,
+            "fsync": "none"
+        },
+        "sharded_output": {
+            "enabled": False,
+            "max_shard_mb": 256,
+            "compress": False,
+            "prefix": "part"
+        },
+        "json_records": {
+            "enabled": False,
+            "records_path": None,
+            "text_fields": [],
+            "batch_size": 256
         },
         "nlp": {
             "models": {
@@ -23,7 +77,25 @@ class Config:
                 "multi": "xx_ent_wiki_sm"
             },
             "detect_language": True,
-            "sentiment_analysis": True
+            "language_sample_size": 200,
+            "language_cache_size": 4096,
+            "sentiment_analysis": True,
+            "profile": "full",
+            "profiles": {
+                "stats-only": {"lemmas": False, "entities": False, "sentiment": False,
+                               "sentences": "sentencizer"},
+                "lemmas": {"lemmas": True, "entities": False, "sentiment": False,
+                           "sentences": "sentencizer"},
+                "entities": {"lemmas": False, "entities": True, "sentiment": False,
+                             "sentences": "sentencizer"},
+                "full": {"lemmas": True, "entities": True, "sentiment": True,
+                         "sentences": "parser"}
+            }
+        },
+        "cache": {
+            "enabled": False,
+            "path": ".cache/results.sqlite3",
+            "max_size_mb": 512
         },
         "logging": {
             "level": "INFO",
@@ -35,7 +107,8 @@ class Config:
             "format": "txt",
             "encoding": "utf-8",
             "generate_summary": True,
-            "include_statistics": True
+            "include_statistics": True,
+            "include_original_text": False
         }
     }
     
@@ -0,0 +1,57 @@
+"""
+并发目录扫描模块
+
+基于 os.scandir 遍历目录树，各子目录在线程池中并行扫描（网络文件系统上
+目录读取以等待I/O为主），每扫描完一个目录就返回其中的文件，调用方可以
+边发现边处理。返回的 DirEntry 缓存了文件类型和 stat 结果，校验时不必
+再对每个文件重复 stat。
+"""
+import logging
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def _scan_dir(path: str) -> Tuple[List[os.DirEntry], List[str]]:
+    """扫描单个目录，返回 (文件, 子目录)"""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    # 不跟随目录符号链接，避免循环
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError as e:
+                    logger.warning(f"无法访问 {entry.path}: {e}")
+    except OSError as e:
+        logger.warning(f"无法扫描目录 {path}: {e}")
+    return files, subdirs
+
+
+def scan_files(root: Union[str, Path], workers: int = 8) -> Iterator[os.DirEntry]:
+    """并行遍历目录树，按发现顺序返回文件的 DirEntry（顺序不确定）"""
+    root = str(root)
+    if workers <= 1:
+        stack = [root]
+        while stack:
+            files, subdirs = _scan_dir(stack.pop())
+            stack.extend(subdirs)
+            yield from files
+        return
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan") as executor:
+        pending = {executor.submit(_scan_dir, root)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                for subdir in subdirs:
+                    pending.add(executor.submit(_scan_dir, subdir))
+                yield from files
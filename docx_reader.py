@@ -0,0 +1,95 @@
+"""
+.docx 流式读取模块
+
+直接从 zip 中用 iterparse 流式解析 word/document.xml，按文档顺序逐个
+返回段落文本和表格行，不构建 python-docx 的完整对象树。
+"""
+import logging
+import zipfile
+from pathlib import Path
+from typing import Iterator, List, Union
+from xml.etree.ElementTree import iterparse
+
+logger = logging.getLogger(__name__)
+
+_NS_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_BODY = f"{_NS_W}body"
+_PARAGRAPH = f"{_NS_W}p"
+_TABLE_ROW = f"{_NS_W}tr"
+_TABLE_CELL = f"{_NS_W}tc"
+_TEXT = f"{_NS_W}t"
+_TAB = f"{_NS_W}tab"
+_BREAKS = {f"{_NS_W}br", f"{_NS_W}cr"}
+
+# 表格行内各单元格之间的分隔符
+CELL_SEPARATOR = '\t'
+
+
+def _paragraph_text(paragraph) -> str:
+    """拼接段落中各文本片段（修订中删除的文本 w:delText 不计入）"""
+    parts = []
+    for node in paragraph.iter():
+        tag = node.tag
+        if tag == _TEXT:
+            if node.text:
+                parts.append(node.text)
+        elif tag == _TAB:
+            parts.append('\t')
+        elif tag in _BREAKS:
+            parts.append('\n')
+    return ''.join(parts)
+
+
+def iter_docx_blocks(file_path: Union[str, Path]) -> Iterator[str]:
+    """按文档顺序返回非空段落文本和表格行文本
+
+    表格的每一行作为一个块返回，单元格以 CELL_SEPARATOR 分隔，单元格内
+    的多个段落以换行连接；嵌套表格的行并入外层单元格。
+    """
+    with zipfile.ZipFile(str(file_path)) as zf, zf.open("word/document.xml") as f:
+        body = None
+        cell_stack: List[List[str]] = []   # 每个未结束单元格中的段落
+        row_stack: List[List[str]] = []    # 每个未结束表格行中的单元格
+
+        for event, elem in iterparse(f, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                if tag == _TABLE_CELL:
+                    cell_stack.append([])
+                elif tag == _TABLE_ROW:
+                    row_stack.append([])
+                elif tag == _BODY:
+                    body = elem
+                continue
+
+            if tag == _PARAGRAPH:
+                text = _paragraph_text(elem)
+                elem.clear()
+                if cell_stack:
+                    cell_stack[-1].append(text)
+                    continue
+                if text.strip():
+                    yield text
+            elif tag == _TABLE_CELL:
+                paragraphs = cell_stack.pop()
+                row_stack[-1].append('\n'.join(p for p in paragraphs if p.strip()))
+                continue
+            elif tag == _TABLE_ROW:
+                row_text = CELL_SEPARATOR.join(row_stack.pop())
+                if cell_stack:
+                    cell_stack[-1].append(row_text)
+                    continue
+                if row_text.strip():
+                    yield row_text
+            else:
+                continue
+
+            # 顶层块处理完毕后清空 body，保持内存占用恒定
+            if body is not None and not row_stack:
+                body.clear()
+
+
+def read_docx_text(file_path: Union[str, Path]) -> str:
+    """读取整个 .docx 文档的文本，块之间以换行分隔"""
+    return '\n'.join(iter_docx_blocks(file_path))
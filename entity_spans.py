@@ -0,0 +1,135 @@
+"""
+紧凑的命名实体存储模块
+
+每个实体原来是一个有 4 个字符串键的字典，处理大量文档时这些字典占用了
+大部分内存。EntitySpans 把所有实体的标签编号和起止偏移量分别存入
+array，标签名全局只保存一份；实体文本不再复制，而是按偏移量从原文引用中
+切片得到（没有原文的流式结果才逐个保存实体文本）。
+迭代和下标访问仍返回 {"text", "label", "start", "end"} 字典，兼容原来的用法。
+"""
+import threading
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# 全局标签表：标签名 <-> 编号
+_LABELS: List[str] = []
+_LABEL_IDS: Dict[str, int] = {}
+_label_lock = threading.Lock()
+
+
+def label_id(label: str) -> int:
+    """返回标签的编号，首次出现时登记"""
+    index = _LABEL_IDS.get(label)
+    if index is None:
+        with _label_lock:
+            index = _LABEL_IDS.get(label)
+            if index is None:
+                index = len(_LABELS)
+                _LABELS.append(label)
+                _LABEL_IDS[label] = index
+    return index
+
+
+class EntitySpans:
+    """按列存储的实体列表
+
+    source 是原文的引用（不复制），实体文本为 source[start:end]；
+    source 为 None 时（例如流式处理不保留原文）实体文本单独保存。
+    """
+
+    __slots__ = ('source', '_texts', '_labels', '_starts', '_ends')
+
+    def __init__(self, source: Optional[str] = None):
+        self.source = source
+        self._texts: Optional[List[str]] = None if source is not None else []
+        self._labels = array('I')
+        self._starts = array('q')
+        self._ends = array('q')
+
+    @classmethod
+    def from_dicts(cls, entities: Iterable[Dict[str, Any]],
+                   source: Optional[str] = None) -> "EntitySpans":
+        """由实体字典列表创建（例如旧格式的缓存条目）"""
+        spans = cls(source)
+        for entity in entities:
+            spans.append(entity["label"], entity["start"], entity["end"], entity.get("text"))
+        return spans
+
+    def append(self, label: str, start: int, end: int, text: Optional[str] = None) -> None:
+        """添加实体；有原文引用时 text 被忽略"""
+        self._labels.append(label_id(label))
+        self._starts.append(start)
+        self._ends.append(end)
+        if self._texts is not None:
+            self._texts.append(text if text is not None else "")
+
+    def extend_shifted(self, other: "EntitySpans", offset: int,
+                       limit: Optional[int] = None) -> None:
+        """追加另一段文本中的实体，偏移量加上 offset（用于合并分块结果）
+
+        limit 为最多追加的实体数。
+        """
+        count = len(other) if limit is None else max(0, min(limit, len(other)))
+        for index in range(count):
+            self._labels.append(other._labels[index])
+            self._starts.append(other._starts[index] + offset)
+            self._ends.append(other._ends[index] + offset)
+            if self._texts is not None:
+                self._texts.append(other.text(index))
+
+    def text(self, index: int) -> str:
+        if self._texts is not None:
+            return self._texts[index]
+        return self.source[self._starts[index]:self._ends[index]]
+
+    def label(self, index: int) -> str:
+        return _LABELS[self._labels[index]]
+
+    def labels(self) -> List[str]:
+        """所有实体的标签（按出现顺序）"""
+        return [_LABELS[index] for index in self._labels]
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """转换为实体字典列表（用于序列化）"""
+        return [self[index] for index in range(len(self))]
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("实体下标越界")
+        return {
+            "text": self.text(index),
+            "label": self.label(index),
+            "start": self._starts[index],
+            "end": self._ends[index]
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self)):
+            yield self[index]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (EntitySpans, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"EntitySpans({self.to_list()!r})"
+
+    def __reduce__(self):
+        # 标签编号只在本进程内有效，跨进程传递时按标签名重建
+        return (_rebuild, (self.source, self._texts, self.labels(),
+                           self._starts.tolist(), self._ends.tolist()))
+
+
+def _rebuild(source: Optional[str], texts: Optional[List[str]], labels: List[str],
+             starts: List[int], ends: List[int]) -> EntitySpans:
+    spans = EntitySpans(source)
+    for index, label in enumerate(labels):
+        spans.append(label, starts[index], ends[index],
+                     texts[index] if texts is not None else None)
+    return spans
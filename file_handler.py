@@ -188,10 +188,8 @@ def read_pdf(file_path):
     """
     try:
         reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        return text
+        # 先收集各页文本再一次性拼接，避免 += 带来的平方级复制
+        return "".join(page.extract_text() for page in reader.pages)
     except Exception as e:
         logging.error(f"无法读取 PDF 文件：{file_path}, 错误信息：{e}")
         return None
@@ -2,42 +2,85 @@
 改进的数据处理模块
 """
 import re
+import sys
 import logging
 import json
-from typing import Optional, List, Dict, Any, Union
+import threading
+from bisect import bisect_right
+from typing import Optional, List, Dict, Any, Iterable, Tuple, Union
 from dataclasses import dataclass
 from datetime import datetime
-import spacy
-from langdetect import detect, LangDetectException, DetectorFactory
-from transformers import pipeline
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
 from config import config
+from entity_spans import EntitySpans
+from language_detector import LanguageDetector
+from processing_profiles import ProcessingProfile, get_profile
+from sentiment_engine import sentiment_engine
+from structured_content import StructuredContent
+from text_extractors import extract_numbers, extract_dates, extract_numbers_and_dates
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
-# 设置随机种子以获得一致的语言检测结果
-DetectorFactory.seed = 0
+# 文本没有经过 spaCy 解析（没有可用模型或解析失败）时记录在结果中的错误
+NLP_UNAVAILABLE_ERROR = "NLP解析不可用：没有可用的spaCy模型或解析失败"
 
 @dataclass
 class ProcessingResult:
-    """处理结果数据类"""
+    """处理结果数据类
+    
+    使用 __slots__ 存储（字段都没有默认值，可以直接在 dataclass 中声明，
+    兼容 Python 3.7+）；original_text 是输入文本的引用（不复制），实体以
+    EntitySpans 按列存储，实体文本按偏移量从原文中取出；语言名被 intern，
+    大量结果共用同一个字符串对象。
+    """
+    __slots__ = ('original_text', 'processed_text', 'language', 'sentiment', 'numbers',
+                 'dates', 'entities', 'statistics', 'errors')
+    
     original_text: str
     processed_text: str
     language: str
     sentiment: Dict[str, float]
     numbers: List[float]
     dates: List[str]
-    entities: List[Dict[str, str]]
+    entities: EntitySpans
     statistics: Dict[str, Any]
     errors: List[str]
+    
+    def __post_init__(self):
+        self.language = sys.intern(self.language)
+        if not isinstance(self.entities, EntitySpans):
+            # 兼容实体字典列表（例如旧的缓存条目）
+            self.entities = EntitySpans.from_dicts(self.entities, self.original_text or None)
+    
+    def as_dict(self, include_original_text: bool = True) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的字典（实体展开为字典列表）"""
+        data = {
+            "original_text": self.original_text,
+            "processed_text": self.processed_text,
+            "language": self.language,
+            "sentiment": self.sentiment,
+            "numbers": self.numbers,
+            "dates": self.dates,
+            "entities": self.entities.to_list(),
+            "statistics": self.statistics,
+            "errors": self.errors
+        }
+        if not include_original_text:
+            del data["original_text"]
+        return data
 
 class NLPModelManager:
-    """NLP模型管理器 - 单例模式"""
+    """NLP模型管理器 - 单例模式
+    
+    模型在第一次使用时才加载（按实际检测到的语言），导入模块和创建
+    管理器都不会加载任何模型；spaCy 和 NLTK 也只在需要时才导入。
+    spaCy 模型按 语言 + 配置档的组件组合 缓存，只加载配置档需要的组件。
+    """
     _instance = None
     _models = {}
+    _failed = set()
+    _lock = threading.Lock()
     
     def __new__(cls):
         if cls._instance is None:
@@ -47,89 +90,350 @@ class NLPModelManager:
     def __init__(self):
         if not hasattr(self, 'initialized'):
             self.initialized = True
-            self._load_models()
     
-    def _load_models(self):
-        """加载NLP模型"""
-        model_config = config.get('nlp.models', {})
+    def _load_model(self, model_key: str):
+        """按键加载单个模型，失败时返回 None"""
+        if model_key == 'sentiment':
+            return self._load_sentiment_model()
+        return None
+    
+    def _load_spacy_model(self, lang: str, profile: ProcessingProfile):
+        """加载指定语言的spaCy模型，排除配置档用不到的组件"""
+        model_name = config.get('nlp.models', {}).get(lang)
+        if model_name is None:
+            return None
         
-        # 加载spaCy模型
-        for lang, model_name in model_config.items():
-            try:
-                self._models[f"spacy_{lang}"] = spacy.load(model_name)
-                logger.info(f"已加载 spaCy 模型: {model_name}")
-            except OSError:
-                logger.warning(f"无法加载 spaCy 模型: {model_name}")
-                # 使用备用模型
-                if lang == 'en':
-                    try:
-                        self._models[f"spacy_{lang}"] = spacy.load("en_core_web_sm")
-                    except OSError:
-                        logger.error("无法加载英文模型")
-        
-        # 加载情感分析模型
-        if config.get('nlp.sentiment_analysis', True):
-            try:
-                # 下载VADER词典（如果需要）
-                nltk.download('vader_lexicon', quiet=True)
-                self._models['sentiment'] = SentimentIntensityAnalyzer()
-                logger.info("已加载 VADER 情感分析模型")
-            except Exception as e:
-                logger.error(f"无法加载情感分析模型: {e}")
+        try:
+            import spacy
+        except ImportError as e:
+            # 没有安装 spaCy 时与模型缺失一样处理：记为加载失败，不再重试
+            logger.error(f"无法导入 spaCy: {e}")
+            return None
+        
+        exclude = profile.excluded_components()
+        try:
+            nlp_model = spacy.load(model_name, exclude=exclude)
+            logger.info(f"已加载 spaCy 模型: {model_name} (配置档 {profile.name}, "
+                        f"组件: {', '.join(nlp_model.pipe_names) or '无'})")
+            return profile.configure(nlp_model)
+        except OSError:
+            logger.warning(f"无法加载 spaCy 模型: {model_name}")
+            # 使用备用模型
+            if lang == 'en':
+                try:
+                    return profile.configure(spacy.load("en_core_web_sm", exclude=exclude))
+                except OSError:
+                    logger.error("无法加载英文模型")
+            return None
     
-    def get_model(self, model_key: str):
-        """获取模型"""
-        return self._models.get(model_key)
+    def _load_sentiment_model(self):
+        """加载VADER情感分析模型（与 sentiment_engine 共用同一个分析器）"""
+        if not config.get('nlp.sentiment_analysis', True):
+            return None
+        
+        try:
+            return sentiment_engine.get_analyzer()
+        except Exception as e:
+            logger.error(f"无法加载情感分析模型: {e}")
+            return None
+    
+    def get_model(self, model_key: str, loader=None):
+        """获取模型，第一次使用时加载（loader 为自定义的加载函数）"""
+        model = self._models.get(model_key)
+        if model is not None or model_key in self._failed:
+            return model
+        
+        with self._lock:
+            # 双重检查，避免多个线程重复加载同一个模型
+            model = self._models.get(model_key)
+            if model is None and model_key not in self._failed:
+                model = loader() if loader is not None else self._load_model(model_key)
+                if model is None:
+                    self._failed.add(model_key)
+                else:
+                    self._models[model_key] = model
+        
+        return model
+    
+    def warmup(self, languages: Optional[List[str]] = None,
+               profile: Optional[ProcessingProfile] = None):
+        """预加载模型（用于进程池初始化等需要提前加载的场景）"""
+        profile = profile or get_profile()
+        if languages is None:
+            languages = list(config.get('nlp.models', {}).keys())
+        
+        for lang in languages:
+            self._get_spacy_model(lang, profile)
+        if profile.sentiment:
+            self.get_model('sentiment')
+    
+    def _get_spacy_model(self, language: str, profile: ProcessingProfile):
+        return self.get_model(f"spacy_{language}:{profile.pipeline_key}",
+                              lambda: self._load_spacy_model(language, profile))
+    
+    def get_spacy_model(self, language: str, profile: Optional[ProcessingProfile] = None):
+        """获取指定语言、按配置档裁剪过的spaCy模型，缺失时回退到英文模型"""
+        profile = profile or get_profile()
+        nlp_model = self._get_spacy_model(language, profile)
+        if nlp_model is None:
+            nlp_model = self._get_spacy_model("en", profile)
+        return nlp_model
+    
+    def pipe(self, texts: List[str], language: str, batch_size: int = 64,
+             n_process: int = 1, profile: Optional[ProcessingProfile] = None):
+        """使用 nlp.pipe 批量解析同一语言的文本，没有可用模型时逐个返回 None"""
+        nlp_model = self.get_spacy_model(language, profile)
+        if nlp_model is None:
+            logger.warning("没有可用的NLP模型")
+            return iter([None] * len(texts))
+        
+        return nlp_model.pipe(texts, batch_size=batch_size, n_process=n_process)
 
 class AdvancedTextProcessor:
-    """高级文本处理器"""
+    """高级文本处理器
     
-    def __init__(self):
+    profile 决定运行哪些处理阶段（见 processing_profiles），默认使用 nlp.profile。
+    """
+    
+    def __init__(self, profile: Optional[ProcessingProfile] = None):
+        self.profile = profile or get_profile()
         self.model_manager = NLPModelManager()
         self.language_detector_enabled = config.get('nlp.detect_language', True)
+        self.language_detector = LanguageDetector(
+            sample_size=config.get('nlp.language_sample_size', 200),
+            cache_size=config.get('nlp.language_cache_size', 4096)
+        )
+    
+    def set_profile(self, profile: Union[str, ProcessingProfile]) -> None:
+        """切换处理配置档（名称或配置档对象）"""
+        self.profile = get_profile(profile) if isinstance(profile, str) else profile
+        logger.info(f"处理配置档: {self.profile.name}")
+    
+    def sentiment_enabled(self) -> bool:
+        return self.profile.sentiment and config.get('nlp.sentiment_analysis', True)
     
     def process_text(self, text: str) -> ProcessingResult:
         """处理文本的主方法"""
         if not text or not text.strip():
             return self._create_empty_result(text)
         
+        # 语言检测
+        language = self._detect_language(text)
+        
+        # 文本预处理（同时记录清理后文本到原文的偏移映射）
+        cleaned_text, offset_map = self._clean_text_with_offsets(text)
+        
+        # 每个文档只解析一次，词元、实体和统计信息共享同一个 Doc
+        doc = self._parse(cleaned_text, language)
+        
+        return self._build_result(text, language, cleaned_text, offset_map, doc)
+    
+    def process_content(self, content: Union[str, Iterable[str], StructuredContent]
+                        ) -> ProcessingResult:
+        """处理文件内容：字符串整体处理，文本块迭代器按流式方式处理，
+        结构化内容只对自由文本做NLP"""
+        if content is None or isinstance(content, str):
+            return self.process_text(content)
+        if isinstance(content, StructuredContent):
+            return self.process_structured(content)
+        return self.process_chunks(content)
+    
+    def process_structured(self, content: StructuredContent) -> ProcessingResult:
+        """处理结构化内容
+        
+        只有自由文本单元格经过语言检测、spaCy 和情感分析；带类型的数字和日期
+        单元格直接并入结果。
+        """
+        return merge_structured(self.process_text(content.text), content)
+    
+    def process_chunks(self, chunks: Iterable[str]) -> ProcessingResult:
+        """流式处理文本块并合并为一个结果
+        
+        每次只解析一个文本块，合并数字、日期、实体（偏移量换算为全文位置）、
+        统计信息和情感分数（按字符数加权），原文不会保留在结果中。
+        处理后文本最多保留 processing.stream_max_processed_chars 个字符，实体
+        （含实体文本）最多保留 processing.stream_max_entities 个，超出部分只计入
+        统计（statistics 中 processed_text_truncated / entities_truncated 为 True），
+        因此除去去重后的数字和日期，内存占用有固定上限，与文件大小无关。
+        """
+        max_processed_chars = config.get('processing.stream_max_processed_chars', 1000000)
+        max_entities = config.get('processing.stream_max_entities', 10000)
+        language = None
+        processed_parts = []
+        processed_chars = 0
+        processed_truncated = False
+        entity_count = 0
+        numbers = set()
+        dates = set()
+        entities = EntitySpans()
+        errors = []
+        sentiment_sums: Dict[str, float] = {}
+        sentiment_chars = 0
+        char_offset = 0
+        chunk_count = 0
+        totals = {"char_count": 0, "word_count": 0, "token_count": 0, "sentence_count": 0}
+        total_word_length = 0.0
+        
+        for chunk in chunks:
+            if not chunk or not chunk.strip():
+                char_offset += len(chunk or "")
+                continue
+            
+            # 语言按第一个非空块确定，保证所有块使用同一个模型
+            if language is None:
+                language = self._detect_language(chunk)
+            
+            cleaned_text, offset_map = self._clean_text_with_offsets(chunk)
+            doc = self._parse(cleaned_text, language)
+            partial = self._build_result(chunk, language, cleaned_text, offset_map, doc)
+            del doc
+            
+            chunk_count += 1
+            if partial.processed_text:
+                room = max_processed_chars - processed_chars
+                kept = partial.processed_text[:max(room, 0)]
+                if kept:
+                    processed_parts.append(kept)
+                    processed_chars += len(kept) + 1  # 合并时的分隔空格
+                processed_truncated = processed_truncated or len(kept) < len(partial.processed_text)
+            numbers.update(partial.numbers)
+            dates.update(partial.dates)
+            # 每个块都会遇到的错误（例如没有可用模型）只记录一次
+            errors.extend(error for error in partial.errors if error not in errors)
+            
+            # 不保留原文，实体文本从块中取出单独保存（最多 max_entities 个）
+            entities.extend_shifted(partial.entities, char_offset, max_entities - len(entities))
+            entity_count += len(partial.entities)
+            
+            if partial.sentiment:
+                for key, value in partial.sentiment.items():
+                    sentiment_sums[key] = sentiment_sums.get(key, 0.0) + value * len(chunk)
+                sentiment_chars += len(chunk)
+            
+            for key in totals:
+                totals[key] += partial.statistics.get(key, 0)
+            total_word_length += (partial.statistics.get("avg_word_length", 0)
+                                  * partial.statistics.get("word_count", 0))
+            
+            char_offset += len(chunk)
+        
+        if chunk_count == 0:
+            return self._create_empty_result("")
+        
+        result = ProcessingResult(
+            original_text="",
+            processed_text=" ".join(processed_parts),
+            language=language,
+            sentiment={key: value / sentiment_chars for key, value in sentiment_sums.items()}
+                      if sentiment_chars else {},
+            numbers=sorted(numbers),
+            dates=sorted(dates),
+            entities=entities,
+            statistics={},
+            errors=errors
+        )
+        result.statistics = {
+            **totals,
+            "avg_word_length": total_word_length / totals["word_count"] if totals["word_count"] else 0,
+            "number_count": len(result.numbers),
+            "date_count": len(result.dates),
+            "entity_count": entity_count,
+            "language": language,
+            "processing_errors": len(errors),
+            "chunk_count": chunk_count,
+            "streamed": True,
+            "processed_text_truncated": processed_truncated,
+            "entities_truncated": entity_count > len(entities)
+        }
+        return result
+    
+    def process_texts(self, texts: List[str], batch_size: Optional[int] = None,
+                      n_process: Optional[int] = None) -> List[ProcessingResult]:
+        """批量处理文本
+        
+        按检测到的语言分组，每组通过 nlp.pipe 批量解析，结果顺序与输入一致。
+        """
+        batch_size = batch_size or config.get('processing.pipe_batch_size', 64)
+        n_process = n_process or config.get('processing.pipe_n_process', 1)
+        
+        results: List[Optional[ProcessingResult]] = [None] * len(texts)
+        groups: Dict[str, List[Tuple[int, str, Tuple[List[int], List[int]]]]] = {}
+        
+        # 语言检测和预处理
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                results[index] = self._create_empty_result(text)
+                continue
+            
+            language = self._detect_language(text)
+            cleaned_text, offset_map = self._clean_text_with_offsets(text)
+            groups.setdefault(language, []).append((index, cleaned_text, offset_map))
+        
+        # 每种语言一次 nlp.pipe
+        for language, items in groups.items():
+            try:
+                docs = self.model_manager.pipe(
+                    [cleaned_text for _, cleaned_text, _ in items],
+                    language, batch_size=batch_size, n_process=n_process,
+                    profile=self.profile
+                )
+                docs = list(docs)
+            except Exception as e:
+                logger.error(f"批量NLP解析失败 ({language}): {e}")
+                docs = [None] * len(items)
+            
+            # 同一组文本的情感一次批量打分
+            sentiments = None
+            if self.sentiment_enabled():
+                sentiments = self._analyze_sentiments([cleaned_text for _, cleaned_text, _ in items])
+            
+            for position, ((index, cleaned_text, offset_map), doc) in enumerate(zip(items, docs)):
+                results[index] = self._build_result(
+                    texts[index], language, cleaned_text, offset_map, doc,
+                    sentiment=sentiments[position] if sentiments is not None else None
+                )
+        
+        return results
+    
+    def _build_result(self, text: str, language: str, cleaned_text: str,
+                      offset_map: Tuple[List[int], List[int]], doc,
+                      sentiment: Optional[Dict[str, float]] = None) -> ProcessingResult:
+        """根据已解析的 Doc 组装处理结果（sentiment 为批量计算好的情感分数）"""
         result = ProcessingResult(
             original_text=text,
             processed_text="",
-            language="unknown",
+            language=language,
             sentiment={},
             numbers=[],
             dates=[],
-            entities=[],
+            entities=EntitySpans(text),
             statistics={},
             errors=[]
         )
         
+        if doc is None and cleaned_text:
+            # 没有可用模型或解析失败时结果只有基础处理，记录错误（也使其不被缓存）
+            result.errors.append(NLP_UNAVAILABLE_ERROR)
+        
         try:
-            # 语言检测
-            result.language = self._detect_language(text)
-            
-            # 文本预处理
-            cleaned_text = self._clean_text(text)
-            
             # NLP处理
-            result.processed_text = self._process_with_nlp(cleaned_text, result.language)
+            result.processed_text = self._process_with_nlp(doc, cleaned_text, result.language)
             
-            # 提取数字
-            result.numbers = self._extract_numbers(text)
-            
-            # 提取日期
-            result.dates = self._extract_dates(text)
+            # 提取数字和日期（单次扫描）
+            result.numbers, result.dates = extract_numbers_and_dates(text)
             
             # 情感分析
-            if config.get('nlp.sentiment_analysis', True):
+            if sentiment is not None:
+                result.sentiment = sentiment
+            elif self.sentiment_enabled():
                 result.sentiment = self._analyze_sentiment(cleaned_text)
             
             # 实体识别
-            result.entities = self._extract_entities(text, result.language)
+            if self.profile.entities:
+                result.entities = self._extract_entities(doc, text, offset_map)
             
             # 生成统计信息
-            result.statistics = self._generate_statistics(text, result)
+            result.statistics = self._generate_statistics(text, result, doc)
             
         except Exception as e:
             logger.error(f"处理文本时发生错误: {e}")
@@ -157,24 +461,7 @@ class AdvancedTextProcessor:
             return "en"  # 默认英语
         
         try:
-            # 使用前200个字符进行检测，提高准确性
-            sample_text = text[:200].strip()
-            if not sample_text:
-                return "unknown"
-            
-            detected = detect(sample_text)
-            
-            # 规范化语言代码
-            if detected in ["zh-cn", "zh-tw", "zh"]:
-                return "zh"
-            elif detected.startswith("en"):
-                return "en"
-            else:
-                return detected
-                
-        except LangDetectException:
-            logger.warning("语言检测失败，使用默认语言")
-            return "en"
+            return self.language_detector.detect(text)
         except Exception as e:
             logger.error(f"语言检测发生错误: {e}")
             return "unknown"
@@ -192,32 +479,80 @@ class AdvancedTextProcessor:
         
         return cleaned
     
-    def _process_with_nlp(self, text: str, language: str) -> str:
-        """使用NLP模型处理文本"""
+    def _clean_text_with_offsets(self, text: str) -> Tuple[str, Tuple[List[int], List[int]]]:
+        """清理文本，并返回清理后文本到原文的偏移映射
+        
+        映射由每个非空白片段在清理后文本和原文中的起始位置组成，
+        与 _clean_text 的结果完全一致。
+        """
+        parts = []
+        clean_starts = []
+        orig_starts = []
+        position = 0
+        
+        for match in re.finditer(r'\S+', text or ""):
+            if parts:
+                position += 1  # 片段之间的单个空格
+            clean_starts.append(position)
+            orig_starts.append(match.start())
+            parts.append(match.group())
+            position += len(match.group())
+        
+        return " ".join(parts), (clean_starts, orig_starts)
+    
+    def _map_offset(self, offset_map: Tuple[List[int], List[int]], 
+                    position: int, is_end: bool = False) -> int:
+        """把清理后文本中的字符位置映射回原文"""
+        clean_starts, orig_starts = offset_map
+        if not clean_starts:
+            return position
+        
+        # 结束位置按最后一个字符映射，避免落在被压缩的空白上
+        target = position - 1 if is_end else position
+        index = max(bisect_right(clean_starts, target) - 1, 0)
+        mapped = orig_starts[index] + target - clean_starts[index]
+        return mapped + 1 if is_end else mapped
+    
+    def _get_nlp_model(self, language: str):
+        """获取指定语言的spaCy模型，缺失时回退到英文模型"""
+        return self.model_manager.get_spacy_model(language, self.profile)
+    
+    def _parse(self, text: str, language: str):
+        """使用spaCy解析文本，返回 Doc；没有可用模型或解析失败时返回 None"""
+        if not text:
+            return None
+        
         try:
-            # 选择合适的模型
-            model_key = f"spacy_{language}"
-            nlp_model = self.model_manager.get_model(model_key)
-            
+            nlp_model = self._get_nlp_model(language)
             if nlp_model is None:
-                # 使用英文模型作为后备
-                nlp_model = self.model_manager.get_model("spacy_en")
-                if nlp_model is None:
-                    logger.warning("没有可用的NLP模型")
-                    return text
+                logger.warning("没有可用的NLP模型")
+                return None
             
-            # 处理文本
-            doc = nlp_model(text)
+            return nlp_model(text)
             
+        except Exception as e:
+            logger.error(f"NLP解析失败: {e}")
+            return None
+    
+    def _process_with_nlp(self, doc, text: str, language: str) -> str:
+        """从已解析的 Doc 中提取词元"""
+        if doc is None:
+            return text
+        
+        try:
             # 提取词元和词干
             if language == "zh":
                 # 中文保留原词
                 tokens = [token.text for token in doc 
                          if not token.is_punct and not token.is_space]
-            else:
+            elif self.profile.lemmas:
                 # 英文使用词干化
                 tokens = [token.lemma_.lower() for token in doc 
                          if not token.is_stop and not token.is_punct and not token.is_space]
+            else:
+                # 配置档不做词形还原时只转小写
+                tokens = [token.lower_ for token in doc 
+                         if not token.is_stop and not token.is_punct and not token.is_space]
             
             return " ".join(tokens) if tokens else text
             
@@ -227,108 +562,64 @@ class AdvancedTextProcessor:
     
     def _extract_numbers(self, text: str) -> List[float]:
         """提取数字"""
-        numbers = []
-        
-        try:
-            # 匹配各种数字格式
-            patterns = [
-                r'\b\d+\.\d+\b',      # 小数
-                r'\b\d+\b',           # 整数
-                r'\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b',  # 带逗号的数字
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    try:
-                        # 去除逗号
-                        cleaned_number = match.replace(',', '')
-                        numbers.append(float(cleaned_number))
-                    except ValueError:
-                        continue
-            
-            # 去重并排序
-            return sorted(list(set(numbers)))
-            
-        except Exception as e:
-            logger.error(f"提取数字时发生错误: {e}")
-            return []
+        return extract_numbers(text)
     
     def _extract_dates(self, text: str) -> List[str]:
         """提取日期"""
-        dates = []
-        
-        try:
-            # 各种日期格式
-            date_patterns = [
-                r'\b\d{4}-\d{1,2}-\d{1,2}\b',           # YYYY-MM-DD
-                r'\b\d{1,2}/\d{1,2}/\d{4}\b',           # MM/DD/YYYY
-                r'\b\d{1,2}-\d{1,2}-\d{4}\b',           # MM-DD-YYYY
-                r'\b\d{4}年\d{1,2}月\d{1,2}日\b',        # 中文日期
-            ]
-            
-            for pattern in date_patterns:
-                matches = re.findall(pattern, text)
-                dates.extend(matches)
-            
-            return list(set(dates))  # 去重
-            
-        except Exception as e:
-            logger.error(f"提取日期时发生错误: {e}")
-            return []
+        return extract_dates(text)
     
     def _analyze_sentiment(self, text: str) -> Dict[str, float]:
-        """分析情感"""
+        """分析情感（分句打分后汇总，见 sentiment_engine）"""
+        return self._analyze_sentiments([text])[0]
+    
+    def _analyze_sentiments(self, texts: List[str]) -> List[Dict[str, float]]:
+        """批量分析情感，句子在所有文本之间去重后一次打分"""
         try:
-            sentiment_analyzer = self.model_manager.get_model('sentiment')
-            if sentiment_analyzer is None:
-                return {}
-            
-            scores = sentiment_analyzer.polarity_scores(text)
-            return scores
+            if self.model_manager.get_model('sentiment') is None:
+                return [{} for _ in texts]
+            return sentiment_engine.score_many(texts)
             
         except Exception as e:
             logger.error(f"情感分析失败: {e}")
-            return {}
+            return [{} for _ in texts]
     
-    def _extract_entities(self, text: str, language: str) -> List[Dict[str, str]]:
-        """提取命名实体"""
-        entities = []
+    def _extract_entities(self, doc, original_text: str,
+                          offset_map: Tuple[List[int], List[int]]) -> EntitySpans:
+        """从已解析的 Doc 中提取命名实体，偏移量映射回原文"""
+        entities = EntitySpans(original_text)
+        
+        if doc is None:
+            return entities
         
         try:
-            model_key = f"spacy_{language}"
-            nlp_model = self.model_manager.get_model(model_key)
-            
-            if nlp_model is None:
-                nlp_model = self.model_manager.get_model("spacy_en")
-                if nlp_model is None:
-                    return []
-            
-            doc = nlp_model(text)
-            
             for ent in doc.ents:
-                entities.append({
-                    "text": ent.text,
-                    "label": ent.label_,
-                    "start": ent.start_char,
-                    "end": ent.end_char
-                })
+                start = self._map_offset(offset_map, ent.start_char)
+                end = self._map_offset(offset_map, ent.end_char, is_end=True)
+                entities.append(ent.label_, start, end)
             
             return entities
             
         except Exception as e:
             logger.error(f"实体识别失败: {e}")
-            return []
+            return EntitySpans(original_text)
     
-    def _generate_statistics(self, original_text: str, result: ProcessingResult) -> Dict[str, Any]:
+    def _generate_statistics(self, original_text: str, result: ProcessingResult,
+                             doc=None) -> Dict[str, Any]:
         """生成统计信息"""
         try:
             words = original_text.split()
             
+            # 句子数优先使用 Doc 中已有的分句结果
+            if doc is not None and doc.has_annotation("SENT_START"):
+                sentence_count = sum(1 for _ in doc.sents)
+            else:
+                sentence_count = len(re.split(r'[.!?。！？]', original_text))
+            
             stats = {
                 "char_count": len(original_text),
                 "word_count": len(words),
-                "sentence_count": len(re.split(r'[.!?。！？]', original_text)),
+                "token_count": len(doc) if doc is not None else len(words),
+                "sentence_count": sentence_count,
                 "avg_word_length": sum(len(word) for word in words) / len(words) if words else 0,
                 "number_count": len(result.numbers),
                 "date_count": len(result.dates),
@@ -343,30 +634,45 @@ class AdvancedTextProcessor:
             logger.error(f"生成统计信息失败: {e}")
             return {}
 
+def merge_structured(result: ProcessingResult, content: StructuredContent) -> ProcessingResult:
+    """把结构化内容中带类型的数字和日期单元格并入自由文本的处理结果"""
+    if not content.text.strip() and content.typed_cells:
+        # 全部是数字/日期的表格不算空输入
+        result.errors = []
+    
+    numbers = set(result.numbers)
+    numbers.update(content.numbers)
+    result.numbers = sorted(numbers)
+    result.dates = list(dict.fromkeys(result.dates + content.dates))
+    
+    result.statistics["number_count"] = len(result.numbers)
+    result.statistics["date_count"] = len(result.dates)
+    result.statistics["typed_cell_count"] = content.typed_cells
+    result.statistics["text_cell_count"] = content.text_cells
+    return result
+
 class ResultFormatter:
     """结果格式化器"""
     
     @staticmethod
-    def to_dict(result: ProcessingResult) -> Dict[str, Any]:
-        """转换为字典格式"""
-        return {
-            "original_text": result.original_text,
-            "processed_text": result.processed_text,
-            "language": result.language,
-            "sentiment": result.sentiment,
-            "numbers": result.numbers,
-            "dates": result.dates,
-            "entities": result.entities,
-            "statistics": result.statistics,
-            "errors": result.errors,
-            "timestamp": datetime.now().isoformat()
-        }
+    def to_dict(result: ProcessingResult,
+                include_original_text: Optional[bool] = None) -> Dict[str, Any]:
+        """转换为字典格式
+        
+        默认不包含原文（output.include_original_text），避免每个输出再复制一份输入。
+        """
+        if include_original_text is None:
+            include_original_text = config.get('output.include_original_text', False)
+        data = result.as_dict(include_original_text)
+        data["timestamp"] = datetime.now().isoformat()
+        return data
     
     @staticmethod
-    def to_json(result: ProcessingResult, indent: int = 2) -> str:
+    def to_json(result: ProcessingResult, indent: int = 2,
+                include_original_text: Optional[bool] = None) -> str:
         """转换为JSON格式"""
         return json.dumps(
-            ResultFormatter.to_dict(result),
+            ResultFormatter.to_dict(result, include_original_text),
             ensure_ascii=False,
             indent=indent
         )
@@ -395,7 +701,7 @@ class ResultFormatter:
         
         # 实体
         if result.entities:
-            entity_types = list(set(ent['label'] for ent in result.entities))
+            entity_types = list(set(result.entities.labels()))
             summary_parts.append(f"实体类型: {', '.join(entity_types)}")
         
         # 错误信息
@@ -409,4 +715,20 @@ class ResultFormatter:
 
 # 全局处理器实例
 text_processor = AdvancedTextProcessor()
-result_formatter = ResultFormatter()
\ No newline at end of file
+result_formatter = ResultFormatter()
+
+def init_worker(profile: Union[str, ProcessingProfile, None] = None, warmup: bool = True):
+    """进程池初始化函数：每个工作进程只预加载一次模型
+    
+    profile 为主进程使用的配置档（用 functools.partial 传入），
+    保证工作进程与主进程运行相同的处理阶段；warmup 为 False 时模型在
+    第一次使用时才加载（分层处理中多数文档用不到模型）。
+    """
+    if profile is not None:
+        text_processor.set_profile(profile)
+    if warmup:
+        NLPModelManager().warmup(profile=text_processor.profile)
+
+def process_text_in_worker(content: Union[str, Iterable[str]]) -> ProcessingResult:
+    """进程池任务函数：返回处理结果本身，由主进程负责格式化"""
+    return text_processor.process_content(content)
\ No newline at end of file
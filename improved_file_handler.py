@@ -2,17 +2,28 @@
 改进的文件处理模块
 """
 import csv
+import hashlib
+import io
 import json
 import logging
 import os
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Union
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Any, Iterator, Union
+from concurrent.futures import Future, ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 import mimetypes
 from tqdm import tqdm
 
-from PyPDF2 import PdfReader
-import openpyxl
+from batch_manifest import BatchManifest
+from dir_scanner import scan_files
+from stage_pipeline import ByteBudget, Stage, StagePipeline
+from output_writer import AsyncOutputWriter
+from shard_writer import ShardedJsonlWriter
+from mmap_reader import MappedTextFile, read_text as read_mapped_text
+from pdf_extractor import iter_pdf_pages, parse_page_range
+from xlsx_reader import read_workbook_text
+from docx_reader import read_docx_text
+from structured_content import STRUCTURED_FORMATS, StructuredContent, read_structured
 from config import config
 
 # 配置日志
@@ -27,15 +38,36 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# 可以按块流式处理的文件格式
+STREAMABLE_FORMATS = {'.txt', '.jsonl', '.pdf'}
+
 class FileHandler:
     """文件处理类"""
     
     def __init__(self):
         self.supported_formats = set(config.get('processing.supported_formats', []))
         self.max_file_size = config.get('processing.max_file_size_mb', 100) * 1024 * 1024
+        self.stream_threshold = config.get('processing.stream_threshold_mb', 10) * 1024 * 1024
+        self.chunk_bytes = config.get('processing.chunk_size', 256) * 1024
+        self.pdf_workers = config.get('processing.pdf_workers')
+        # 批量处理时多个文件已经并行，单个文件内部默认不再开进程池
+        self.batch_extract_workers = config.get('processing.batch_extract_workers', 1)
+        self.pdf_max_pages = config.get('processing.pdf_max_pages')
+        page_range = config.get('processing.pdf_page_range')
+        self.pdf_page_range = parse_page_range(page_range) if page_range else None
+        self.xlsx_reader = config.get('processing.xlsx_reader', 'xml')
+        self.xlsx_workers = config.get('processing.xlsx_workers', 1)
+        self.typed_cells = config.get('processing.typed_cells', True)
+        self.scan_workers = config.get('processing.scan_workers', 8)
+        self.async_writes = config.get('output_writer.enabled', False)
+        self._output_writer = None
+        self._writer_lock = threading.Lock()
     
-    def validate_file(self, file_path: Union[str, Path]) -> bool:
-        """验证文件是否有效"""
+    def validate_file(self, file_path: Union[str, Path], allow_stream: bool = False) -> bool:
+        """验证文件是否有效
+        
+        allow_stream 为 True 时，可流式处理的文本文件不受最大文件大小限制。
+        """
         file_path = Path(file_path)
         
         if not file_path.exists():
@@ -46,7 +78,8 @@ class FileHandler:
             logger.error(f"路径不是文件: {file_path}")
             return False
         
-        if file_path.stat().st_size > self.max_file_size:
+        streamable = allow_stream and file_path.suffix.lower() in STREAMABLE_FORMATS
+        if not streamable and file_path.stat().st_size > self.max_file_size:
             logger.error(f"文件太大: {file_path} ({file_path.stat().st_size} bytes)")
             return False
         
@@ -56,8 +89,42 @@ class FileHandler:
         
         return True
     
-    def read_file(self, file_path: Union[str, Path]) -> Optional[str]:
-        """通用文件读取方法"""
+    def validate_entry(self, entry: os.DirEntry, allow_stream: bool = False) -> bool:
+        """验证扫描得到的文件（复用 DirEntry 缓存的类型和 stat 结果）"""
+        suffix = os.path.splitext(entry.name)[1].lower()
+        if suffix not in self.supported_formats:
+            logger.warning(f"不支持的文件格式: {suffix}")
+            return False
+        
+        streamable = allow_stream and suffix in STREAMABLE_FORMATS
+        if not streamable:
+            try:
+                size = entry.stat().st_size
+            except OSError as e:
+                logger.error(f"无法读取文件信息 {entry.path}: {e}")
+                return False
+            if size > self.max_file_size:
+                logger.error(f"文件太大: {entry.path} ({size} bytes)")
+                return False
+        
+        return True
+    
+    def iter_input_files(self, input_folder: Union[str, Path], allow_stream: bool = False,
+                         exclude_suffixes: Optional[set] = None) -> Iterator[Path]:
+        """边扫描边返回输入文件夹中可处理的文件（顺序不确定）"""
+        for entry in scan_files(input_folder, workers=self.scan_workers):
+            if exclude_suffixes and os.path.splitext(entry.name)[1].lower() in exclude_suffixes:
+                continue
+            if self.validate_entry(entry, allow_stream=allow_stream):
+                yield Path(entry.path)
+    
+    def read_file(self, file_path: Union[str, Path],
+                  workers: Optional[int] = None) -> Optional[str]:
+        """通用文件读取方法
+        
+        workers 为单个PDF / xlsx 工作簿并行提取的进程数，为空时使用
+        processing.pdf_workers / processing.xlsx_workers。
+        """
         file_path = Path(file_path)
         
         if not self.validate_file(file_path):
@@ -73,9 +140,13 @@ class FileHandler:
             elif suffix == '.json':
                 return self._read_json_file(file_path)
             elif suffix == '.pdf':
-                return self._read_pdf_file(file_path)
+                return self._read_pdf_file(file_path, workers)
+            elif suffix == '.xlsx' and self.xlsx_reader == 'xml':
+                return self._read_xlsx_file(file_path, workers)
             elif suffix in ['.xlsx', '.xls']:
                 return self._read_excel_file(file_path)
+            elif suffix == '.docx':
+                return self._read_docx_file(file_path)
             else:
                 # 尝试作为文本文件读取
                 return self._read_text_file(file_path)
@@ -85,31 +156,90 @@ class FileHandler:
             return None
     
     def _read_text_file(self, file_path: Path) -> Optional[str]:
-        """读取文本文件"""
+        """读取文本文件（内存映射 + 前缀嗅探编码，只解码一次）"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except UnicodeDecodeError:
-            # 尝试其他编码
-            for encoding in ['gbk', 'iso-8859-1', 'cp1252']:
-                try:
-                    with open(file_path, 'r', encoding=encoding) as f:
-                        content = f.read()
-                        logger.info(f"使用 {encoding} 编码读取文件: {file_path}")
-                        return content
-                except UnicodeDecodeError:
-                    continue
-            logger.error(f"无法确定文件编码: {file_path}")
+            content, encoding = read_mapped_text(file_path)
+            if encoding != 'utf-8':
+                logger.info(f"使用 {encoding} 编码读取文件: {file_path}")
+            return content
+        except (OSError, ValueError) as e:
+            logger.error(f"读取文本文件失败 {file_path}: {e}")
             return None
     
+    def read_content(self, file_path: Union[str, Path], workers: Optional[int] = None
+                     ) -> Union[str, Iterator[str], StructuredContent, None]:
+        """读取文件内容，大文本文件返回分块生成器
+        
+        超过 processing.stream_threshold_mb 的文本/PDF文件不会一次性读入内存，
+        而是返回 iter_text_chunks / iter_pdf_chunks 生成的文本块；
+        processing.typed_cells 启用时，CSV/Excel/JSON 返回 StructuredContent
+        （数字和日期单元格不再展开为文本）；其他文件与 read_file 相同。
+        workers 的含义与 read_file 相同。
+        """
+        file_path = Path(file_path)
+        
+        if not self.validate_file(file_path, allow_stream=True):
+            return None
+        
+        if (file_path.suffix.lower() in STREAMABLE_FORMATS
+                and file_path.stat().st_size > self.stream_threshold):
+            logger.info(f"使用流式分块读取大文件: {file_path}")
+            if file_path.suffix.lower() == '.pdf':
+                return self.iter_pdf_chunks(file_path, workers=workers)
+            return self.iter_text_chunks(file_path)
+        
+        if self.typed_cells and file_path.suffix.lower() in STRUCTURED_FORMATS:
+            try:
+                return read_structured(file_path)
+            except Exception as e:
+                logger.warning(f"带类型读取失败，改为按文本读取 {file_path}: {e}")
+        
+        return self.read_file(file_path, workers)
+    
+    def iter_text_chunks(self, file_path: Union[str, Path],
+                         chunk_bytes: Optional[int] = None) -> Iterator[str]:
+        """按段落/句子边界分块读取文本文件
+        
+        文件通过内存映射读取，每块最多 chunk_bytes 字节（默认 processing.chunk_size KB），
+        优先在段落边界切分，其次是换行、句子结尾，最后是空白字符；
+        每个字节只解码一次。
+        """
+        chunk_bytes = chunk_bytes or self.chunk_bytes
+        
+        with MappedTextFile(file_path) as mapped:
+            yield from mapped.iter_text_chunks(chunk_bytes)
+    
+    def iter_pdf_chunks(self, file_path: Union[str, Path],
+                        chunk_bytes: Optional[int] = None,
+                        workers: Optional[int] = None) -> Iterator[str]:
+        """按页流式提取PDF文本，相邻页合并到约 chunk_bytes 个字符一块"""
+        chunk_bytes = chunk_bytes or self.chunk_bytes
+        if workers is None:
+            workers = self.pdf_workers
+        pages = []
+        size = 0
+        
+        for text in iter_pdf_pages(file_path, max_pages=self.pdf_max_pages,
+                                   page_range=self.pdf_page_range,
+                                   workers=workers):
+            pages.append(text)
+            size += len(text)
+            if size >= chunk_bytes:
+                yield '\n'.join(pages)
+                pages = []
+                size = 0
+        
+        if pages:
+            yield '\n'.join(pages)
+    
     def _read_csv_file(self, file_path: Path) -> Optional[str]:
         """读取CSV文件"""
         try:
+            text, _ = read_mapped_text(file_path)
             rows = []
-            with open(file_path, 'r', encoding='utf-8') as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    rows.append(' '.join(str(cell) for cell in row))
+            reader = csv.reader(io.StringIO(text, newline=''))
+            for row in reader:
+                rows.append(' '.join(str(cell) for cell in row))
             return '\n'.join(rows)
         except Exception as e:
             logger.error(f"读取CSV文件失败 {file_path}: {e}")
@@ -125,23 +255,34 @@ class FileHandler:
             logger.error(f"JSON格式错误 {file_path}: {e}")
             return None
     
-    def _read_pdf_file(self, file_path: Path) -> Optional[str]:
+    def _read_pdf_file(self, file_path: Path, workers: Optional[int] = None) -> Optional[str]:
         """读取PDF文件"""
+        if workers is None:
+            workers = self.pdf_workers
         try:
-            reader = PdfReader(str(file_path))
-            text_parts = []
-            for page in reader.pages:
-                text = page.extract_text()
-                if text.strip():
-                    text_parts.append(text)
-            return '\n'.join(text_parts)
+            # 大PDF按页码区间在进程池中并行提取
+            return '\n'.join(iter_pdf_pages(file_path, max_pages=self.pdf_max_pages,
+                                            page_range=self.pdf_page_range,
+                                            workers=workers))
         except Exception as e:
             logger.error(f"读取PDF文件失败 {file_path}: {e}")
             return None
     
+    def _read_xlsx_file(self, file_path: Path, workers: Optional[int] = None) -> Optional[str]:
+        """直接解析XML读取.xlsx文件，失败时回退到openpyxl"""
+        if workers is None:
+            workers = self.xlsx_workers
+        try:
+            return read_workbook_text(file_path, workers=workers)
+        except Exception as e:
+            logger.warning(f"XML方式读取Excel失败，改用openpyxl {file_path}: {e}")
+            return self._read_excel_file(file_path)
+    
     def _read_excel_file(self, file_path: Path) -> Optional[str]:
-        """读取Excel文件"""
+        """读取Excel文件（openpyxl）"""
         try:
+            import openpyxl
+            
             workbook = openpyxl.load_workbook(str(file_path), read_only=True)
             text_parts = []
             
@@ -162,6 +303,14 @@ class FileHandler:
             logger.error(f"读取Excel文件失败 {file_path}: {e}")
             return None
     
+    def _read_docx_file(self, file_path: Path) -> Optional[str]:
+        """读取Word文档（流式解析 word/document.xml）"""
+        try:
+            return read_docx_text(file_path)
+        except Exception as e:
+            logger.error(f"读取Word文档失败 {file_path}: {e}")
+            return None
+    
     def write_file(self, file_path: Union[str, Path], content: str, mode: str = 'w') -> bool:
         """写入文件"""
         file_path = Path(file_path)
@@ -180,10 +329,63 @@ class FileHandler:
             logger.error(f"写入文件失败 {file_path}: {e}")
             return False
     
+    def get_output_writer(self) -> AsyncOutputWriter:
+        """返回批处理共用的异步输出写入器（首次调用时创建）"""
+        with self._writer_lock:
+            if self._output_writer is None:
+                self._output_writer = AsyncOutputWriter(
+                    batch_size=config.get('output_writer.batch_size', 64),
+                    fsync=config.get('output_writer.fsync', 'none'),
+                    encoding=config.get('output.encoding', 'utf-8')
+                )
+            return self._output_writer
+    
+    def flush_writes(self) -> None:
+        """等待异步写入器中已提交的输出全部落盘"""
+        if self._output_writer is not None:
+            self._output_writer.flush()
+    
     def batch_process(self, input_folder: Union[str, Path], 
                      output_folder: Union[str, Path],
-                     processor_func) -> Dict[str, Any]:
-        """批量处理文件"""
+                     processor_func,
+                     formatter_func=None,
+                     executor_type: Optional[str] = None,
+                     initializer=None,
+                     max_workers: Optional[int] = None,
+                     cache=None,
+                     incremental: bool = False,
+                     stream_large_files: bool = False,
+                     exclude_suffixes: Optional[set] = None,
+                     shard_writer: Optional[ShardedJsonlWriter] = None,
+                     fingerprint: Optional[str] = None) -> Dict[str, Any]:
+        """批量处理文件
+        
+        processor_func 把文件内容转换为处理结果，formatter_func（可选）再把结果
+        转换为输出文本。executor_type 为 "thread" 时读取、处理、写入都在线程中完成；
+        为 "process" 时读取和处理在进程池中执行，processor_func 和 initializer
+        必须是可 pickle 的模块级函数，工作进程只回传处理结果，由主进程格式化并写出。
+        
+        传入 cache（ResultCache）时按文件内容哈希查找缓存，命中则跳过读取和处理，
+        返回的统计中包含本次运行的 cache_hits / cache_misses。
+        
+        incremental 为 True 时使用输出文件夹中的清单（BatchManifest），只处理新增
+        或变化的文件，并删除已不存在的输入对应的输出。fingerprint 为处理配置指纹，
+        与清单中记录的不同时重新处理全部文件。
+        
+        stream_large_files 为 True 时，大文本文件以分块生成器（见 read_content）
+        传给 processor_func，且不受最大文件大小限制。
+        
+        exclude_suffixes 中的文件格式不在此处处理（例如由调用方按记录处理的 JSON）。
+        
+        非增量模式下输入文件夹由 dir_scanner 并行扫描，文件边发现边提交给执行器。
+        
+        output_writer.enabled 为 True 时输出交给异步写入器（见 output_writer），
+        文件在写入完成后才计为成功，返回前等待所有写入完成。
+        
+        传入 shard_writer 时不再为每个输入创建输出文件：formatter_func 需返回字典，
+        结果加上 "source"（相对输入文件夹的路径）后写入分片 JSONL（见 shard_writer），
+        分片由调用方关闭。分片模式不支持增量处理。
+        """
         input_folder = Path(input_folder)
         output_folder = Path(output_folder)
         
@@ -194,47 +396,369 @@ class FileHandler:
         # 创建输出文件夹
         output_folder.mkdir(parents=True, exist_ok=True)
         
-        # 获取所有支持的文件
-        files_to_process = []
-        for file_path in input_folder.rglob('*'):
-            if file_path.is_file() and self.validate_file(file_path):
-                files_to_process.append(file_path)
+        if incremental and shard_writer is not None:
+            logger.warning("分片输出不支持增量处理，改为处理全部文件")
+            incremental = False
+        
+        manifest = None
+        skipped_count = 0
+        removed_count = 0
+        batch_result = {
+            "success": True,
+            "processed": 0,
+            "errors": 0,
+            "total": 0
+        }
+        
+        if incremental:
+            # 增量模式需要完整的文件列表才能找出已删除的输入
+            all_files = self._collect_files(input_folder, allow_stream=stream_large_files,
+                                            exclude_suffixes=exclude_suffixes)
+            output_paths = {file_path: self._output_path(input_folder, output_folder, file_path)
+                            for file_path in all_files}
+            manifest = BatchManifest.load(output_folder, fingerprint)
+            files_to_process, skipped_count, deleted = manifest.plan(
+                input_folder, all_files, output_paths, self.file_hash
+            )
+            removed_count = manifest.remove_deleted(deleted)
+            logger.info(f"增量处理: {len(files_to_process)} 个待处理, "
+                        f"{skipped_count} 个未变化, {removed_count} 个已删除")
+            batch_result["total"] = len(all_files)
+            batch_result["skipped"] = skipped_count
+            batch_result["removed"] = removed_count
+            
+            if not files_to_process:
+                manifest.save()
+                if not all_files:
+                    logger.warning("没有找到可处理的文件")
+                return batch_result
+        else:
+            # 边扫描边提交，处理与目录遍历重叠进行
+            files_to_process = self.iter_input_files(input_folder, allow_stream=stream_large_files,
+                                                     exclude_suffixes=exclude_suffixes)
+        
+        # 并行处理文件
+        if max_workers is None:
+            max_workers = config.get('processing.max_workers', 4)
+        if executor_type is None:
+            executor_type = config.get('processing.executor', 'thread')
+        use_processes = executor_type == 'process'
+        processed_count = 0
+        error_count = 0
+        discovered_count = 0
+        cache_stats_before = cache.stats() if cache else None
+        count_lock = threading.Lock()
+        
+        def record_done(file_path: Path, output_path: Path, success: bool):
+            """统计单个文件的处理结果，并在增量模式下更新清单"""
+            nonlocal processed_count, error_count
+            with count_lock:
+                if not success:
+                    error_count += 1
+                    return
+                processed_count += 1
+            if manifest is not None:
+                try:
+                    # 使用 plan 时计算的哈希，不再读取文件
+                    manifest.record(input_folder, file_path, output_path)
+                except OSError as e:
+                    logger.error(f"更新清单失败 {file_path}: {e}")
+        
+        def on_file_done(file_path: Path, output_path: Path, written):
+            """written 为异步写入的 Future 时，在写入完成后再统计"""
+            self._when_written(written, lambda success: record_done(file_path, output_path, success))
+        
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=initializer)
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers, initializer=initializer)
+        
+        try:
+            with executor:
+                # 提交任务
+                future_to_file = {}
+                cached_count = 0
+                for file_path in files_to_process:
+                    discovered_count += 1
+                    output_path = self._output_path(input_folder, output_folder, file_path)
+                    
+                    if use_processes:
+                        # 缓存查找在主进程完成，命中的文件不再提交给工作进程
+                        cache_key = self._cache_key(cache, file_path)
+                        cached = cache.get(cache_key) if cache_key else None
+                        if cached is not None:
+                            on_file_done(file_path, output_path,
+                                         self._write_result(output_path, cached, formatter_func,
+                                                            shard_writer, self._source(input_folder, file_path)))
+                            cached_count += 1
+                            continue
+                        future = executor.submit(_read_and_process, file_path, processor_func,
+                                                 stream_large_files, self.batch_extract_workers)
+                    else:
+                        cache_key = None
+                        future = executor.submit(self._process_single_file, 
+                                               file_path, output_path, processor_func,
+                                               formatter_func, cache, stream_large_files,
+                                               shard_writer, self._source(input_folder, file_path))
+                    future_to_file[future] = (file_path, output_path, cache_key)
+                
+                if not incremental:
+                    batch_result["total"] = discovered_count
+                    if not discovered_count:
+                        logger.warning("没有找到可处理的文件")
+                
+                # 收集结果
+                with tqdm(total=len(future_to_file) + cached_count, initial=cached_count,
+                          desc="处理文件") as pbar:
+                    for future in as_completed(future_to_file):
+                        file_path, output_path, cache_key = future_to_file[future]
+                        try:
+                            if use_processes:
+                                payload = future.result()
+                                if cache_key and payload is not None:
+                                    cache.put(cache_key, payload)
+                                success = self._write_result(output_path, payload,
+                                                             formatter_func, shard_writer,
+                                                             self._source(input_folder, file_path))
+                            else:
+                                success = future.result()
+                            on_file_done(file_path, output_path, success)
+                        except Exception as e:
+                            logger.error(f"处理文件时发生错误 {file_path}: {e}")
+                            record_done(file_path, output_path, False)
+                        
+                        pbar.update(1)
+        finally:
+            # 清单只记录已经落盘的输出
+            self.flush_writes()
+            # 中断时也保存已完成部分，下次运行可以继续
+            if manifest is not None:
+                manifest.save()
+        
+        logger.info(f"批量处理完成: {processed_count} 成功, {error_count} 失败")
+        batch_result["processed"] = processed_count
+        batch_result["errors"] = error_count
+        
+        if cache:
+            cache_stats = cache.stats()
+            batch_result["cache_hits"] = cache_stats["cache_hits"] - cache_stats_before["cache_hits"]
+            batch_result["cache_misses"] = cache_stats["cache_misses"] - cache_stats_before["cache_misses"]
+            logger.info(f"缓存命中: {batch_result['cache_hits']}, 未命中: {batch_result['cache_misses']}")
+        
+        return batch_result
+    
+    def batch_process_staged(self, input_folder: Union[str, Path],
+                             output_folder: Union[str, Path],
+                             processor_func,
+                             formatter_func=None,
+                             executor_type: Optional[str] = None,
+                             initializer=None,
+                             cache=None,
+                             stream_large_files: bool = False,
+                             exclude_suffixes: Optional[set] = None,
+                             shard_writer: Optional[ShardedJsonlWriter] = None) -> Dict[str, Any]:
+        """分阶段批量处理文件：读取 → NLP → 写入
+        
+        三个阶段各有独立的线程数（pipeline.read_workers / nlp_workers / write_workers），
+        由容量为 pipeline.queue_size 的有界队列连接，在途文件的总大小不超过
+        pipeline.max_inflight_mb（按输入大小计，从读取前一直占用到结果写入完成，
+        处理结果在 NLP→写入 队列中等待时同样计入），读取与NLP、NLP与写入在时间上重叠。
+        executor_type 为 "process" 时 NLP 阶段的线程把内容提交给进程池处理
+        （分块生成器不能跨进程传递，仍在线程中处理）。
+        返回的统计中 "stages" 包含各阶段的处理数、忙碌率和队列深度。
+        shard_writer 的用法同 batch_process，每个写入线程写自己的分片。
+        """
+        input_folder = Path(input_folder)
+        output_folder = Path(output_folder)
+        
+        if not input_folder.exists():
+            logger.error(f"输入文件夹不存在: {input_folder}")
+            return {"success": False, "error": "输入文件夹不存在"}
+        
+        output_folder.mkdir(parents=True, exist_ok=True)
+        
+        if executor_type is None:
+            executor_type = config.get('processing.executor', 'thread')
+        nlp_workers = config.get('pipeline.nlp_workers', 4)
+        budget = ByteBudget(config.get('pipeline.max_inflight_mb', 256) * 1024 * 1024)
+        cache_stats_before = cache.stats() if cache else None
+        process_pool = None
+        if executor_type == 'process':
+            process_pool = ProcessPoolExecutor(max_workers=nlp_workers, initializer=initializer)
+        
+        def read_stage(file_path: Path):
+            """读取阶段：缓存命中时跳过读取和NLP"""
+            output_path = self._output_path(input_folder, output_folder, file_path)
+            cache_key = self._cache_key(cache, file_path)
+            cached = cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                return [file_path, output_path, cache_key, cached, 0, True]
+            
+            size = file_path.stat().st_size
+            if (stream_large_files and file_path.suffix.lower() in STREAMABLE_FORMATS
+                    and size > self.stream_threshold):
+                # 流式读取的大文件同一时间只有一个文本块在内存中
+                size = self.chunk_bytes
+            charged = budget.acquire(size)
+            try:
+                content = (self.read_content(file_path, self.batch_extract_workers)
+                           if stream_large_files
+                           else self.read_file(file_path, self.batch_extract_workers))
+            except Exception:
+                budget.release(charged)
+                raise
+            if content is None:
+                budget.release(charged)
+                return None
+            return [file_path, output_path, cache_key, content, charged, False]
+        
+        def nlp_stage(item):
+            """NLP阶段：字节预算随结果传给写入阶段；处理失败或没有结果时在这里释放并丢弃该项"""
+            file_path, output_path, cache_key, content, charged, done = item
+            if done:
+                return item
+            try:
+                if process_pool is not None and isinstance(content, (str, StructuredContent)):
+                    payload = process_pool.submit(processor_func, content).result()
+                else:
+                    payload = processor_func(content)
+            except Exception:
+                budget.release(charged)
+                raise
+            if payload is None:
+                budget.release(charged)
+                return None
+            if cache_key:
+                cache.put(cache_key, payload)
+            return [file_path, output_path, cache_key, payload, charged, True]
+        
+        def write_stage(item):
+            """写入阶段：结果写入完成后（异步写入时在写入线程中）才释放字节预算"""
+            file_path, output_path, _, payload, charged, _ = item
+            written = False
+            try:
+                written = self._write_result(output_path, payload, formatter_func, shard_writer,
+                                             self._source(input_folder, file_path))
+            finally:
+                self._when_written(written, lambda _: budget.release(charged))
+            return written or None
+        
+        processed_count = 0
+        count_lock = threading.Lock()
+        
+        def count_written(success: bool):
+            nonlocal processed_count
+            if success:
+                with count_lock:
+                    processed_count += 1
+        
+        def on_written(written):
+            self._when_written(written, count_written)
+        
+        pipeline = StagePipeline(
+            [Stage("read", read_stage, config.get('pipeline.read_workers', 2)),
+             Stage("nlp", nlp_stage, nlp_workers),
+             Stage("write", write_stage, config.get('pipeline.write_workers', 2))],
+            queue_size=config.get('pipeline.queue_size', 32),
+            report_interval=config.get('pipeline.report_interval_s', 5)
+        )
+        try:
+            summary = pipeline.run(
+                self.iter_input_files(input_folder, allow_stream=stream_large_files,
+                                      exclude_suffixes=exclude_suffixes),
+                on_output=on_written
+            )
+        finally:
+            if process_pool is not None:
+                process_pool.shutdown()
+            self.flush_writes()
+        
+        total = summary["items"]
+        if not total:
+            logger.warning("没有找到可处理的文件")
+        logger.info(f"批量处理完成: {processed_count} 成功, {total - processed_count} 失败")
+        for name, stats in summary["stages"].items():
+            logger.info(f"阶段 {name}: {stats['items']} 项, 忙碌率 {stats['utilization']:.0%}, "
+                        f"队列深度 最大 {stats['queue_max']} 平均 {stats['queue_mean']:.1f}")
+        
+        batch_result = {
+            "success": True,
+            "processed": processed_count,
+            "errors": total - processed_count,
+            "total": total,
+            "stages": summary["stages"],
+            "peak_inflight_bytes": budget.peak,
+        }
+        if cache:
+            cache_stats = cache.stats()
+            batch_result["cache_hits"] = cache_stats["cache_hits"] - cache_stats_before["cache_hits"]
+            batch_result["cache_misses"] = cache_stats["cache_misses"] - cache_stats_before["cache_misses"]
+        return batch_result
+    
+    def batch_process_pipe(self, input_folder: Union[str, Path],
+                           output_folder: Union[str, Path],
+                           batch_processor_func,
+                           group_size: Optional[int] = None,
+                           exclude_suffixes: Optional[set] = None,
+                           shard_writer: Optional[ShardedJsonlWriter] = None) -> Dict[str, Any]:
+        """分组批量处理文件
+        
+        每次读取 group_size 个文件，把内容列表整体交给 batch_processor_func
+        （例如按语言分组后走 nlp.pipe），返回的结果仍按文件逐个写出，
+        或在传入 shard_writer 时写入分片（用法同 batch_process）。
+        """
+        input_folder = Path(input_folder)
+        output_folder = Path(output_folder)
+        
+        if not input_folder.exists():
+            logger.error(f"输入文件夹不存在: {input_folder}")
+            return {"success": False, "error": "输入文件夹不存在"}
+        
+        output_folder.mkdir(parents=True, exist_ok=True)
+        
+        files_to_process = self._collect_files(input_folder, exclude_suffixes=exclude_suffixes)
         
         if not files_to_process:
             logger.warning("没有找到可处理的文件")
             return {"success": True, "processed": 0, "errors": 0}
         
-        # 并行处理文件
+        if group_size is None:
+            group_size = (config.get('processing.pipe_batch_size', 64)
+                          * max(1, config.get('processing.pipe_n_process', 1)) * 8)
         max_workers = config.get('processing.max_workers', 4)
         processed_count = 0
         error_count = 0
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 提交任务
-            future_to_file = {}
-            for file_path in files_to_process:
-                relative_path = file_path.relative_to(input_folder)
-                output_path = output_folder / f"{relative_path.stem}.processed{relative_path.suffix}"
+        # 读文件是I/O密集型，用线程池并发读取；NLP在主线程按组批量执行
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                tqdm(total=len(files_to_process), desc="处理文件") as pbar:
+            for start in range(0, len(files_to_process), group_size):
+                group = files_to_process[start:start + group_size]
+                contents = list(executor.map(
+                    lambda file_path: self.read_file(file_path, self.batch_extract_workers), group
+                ))
                 
-                future = executor.submit(self._process_single_file, 
-                                       file_path, output_path, processor_func)
-                future_to_file[future] = file_path
-            
-            # 收集结果
-            with tqdm(total=len(files_to_process), desc="处理文件") as pbar:
-                for future in as_completed(future_to_file):
-                    file_path = future_to_file[future]
-                    try:
-                        success = future.result()
-                        if success:
-                            processed_count += 1
-                        else:
-                            error_count += 1
-                    except Exception as e:
-                        logger.error(f"处理文件时发生错误 {file_path}: {e}")
+                readable = [(file_path, content) for file_path, content in zip(group, contents)
+                            if content is not None]
+                error_count += len(group) - len(readable)
+                
+                try:
+                    outputs = batch_processor_func([content for _, content in readable])
+                except Exception as e:
+                    logger.error(f"批量处理文件组失败: {e}")
+                    error_count += len(readable)
+                    pbar.update(len(group))
+                    continue
+                
+                for (file_path, _), output_content in zip(readable, outputs):
+                    output_path = self._output_path(input_folder, output_folder, file_path)
+                    if self._write_result(output_path, output_content, None, shard_writer,
+                                          self._source(input_folder, file_path)):
+                        processed_count += 1
+                    else:
                         error_count += 1
-                    
-                    pbar.update(1)
+                
+                pbar.update(len(group))
         
         logger.info(f"批量处理完成: {processed_count} 成功, {error_count} 失败")
         return {
@@ -244,23 +768,108 @@ class FileHandler:
             "total": len(files_to_process)
         }
     
+    def _collect_files(self, input_folder: Path, allow_stream: bool = False,
+                       exclude_suffixes: Optional[set] = None) -> List[Path]:
+        """收集输入文件夹中所有可处理的文件（按路径排序）"""
+        return sorted(self.iter_input_files(input_folder, allow_stream=allow_stream,
+                                            exclude_suffixes=exclude_suffixes))
+    
+    def _output_path(self, input_folder: Path, output_folder: Path, file_path: Path) -> Path:
+        """计算输入文件对应的输出路径"""
+        relative_path = file_path.relative_to(input_folder)
+        return output_folder / f"{relative_path.stem}.processed{relative_path.suffix}"
+    
+    @staticmethod
+    def _source(input_folder: Path, file_path: Path) -> str:
+        """分片记录中标识来源文件的相对路径（不会像输出文件名那样冲突）"""
+        return file_path.relative_to(input_folder).as_posix()
+    
     def _process_single_file(self, input_path: Path, output_path: Path, 
-                           processor_func) -> bool:
+                           processor_func, formatter_func=None, cache=None,
+                           stream: bool = False, shard_writer=None,
+                           source: Optional[str] = None) -> bool:
         """处理单个文件"""
         try:
-            content = self.read_file(input_path)
-            if content is None:
-                return False
+            cache_key = self._cache_key(cache, input_path)
+            payload = cache.get(cache_key) if cache_key else None
             
-            processed_content = processor_func(content)
-            if processed_content is None:
-                return False
+            if payload is None:
+                workers = self.batch_extract_workers
+                content = (self.read_content(input_path, workers) if stream
+                           else self.read_file(input_path, workers))
+                if content is None:
+                    return False
+                
+                payload = processor_func(content)
+                if cache_key and payload is not None:
+                    cache.put(cache_key, payload)
             
-            return self.write_file(output_path, processed_content)
+            return self._write_result(output_path, payload, formatter_func,
+                                      shard_writer, source)
             
         except Exception as e:
             logger.error(f"处理单个文件失败 {input_path}: {e}")
             return False
+    
+    def file_hash(self, file_path: Union[str, Path], block_size: int = 1024 * 1024) -> str:
+        """计算文件内容的 SHA-256 哈希"""
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _cache_key(self, cache, file_path: Path) -> Optional[str]:
+        """计算文件的缓存键，没有缓存或读取失败时返回 None"""
+        if cache is None:
+            return None
+        try:
+            return cache.make_key(self.file_hash(file_path))
+        except OSError as e:
+            logger.error(f"计算文件哈希失败 {file_path}: {e}")
+            return None
+    
+    def _write_result(self, output_path: Path, payload, formatter_func=None,
+                      shard_writer: Optional[ShardedJsonlWriter] = None,
+                      source: Optional[str] = None) -> Union[bool, Future]:
+        """格式化处理结果并写入输出文件
+        
+        启用异步写入时只提交给写入器，返回写入完成后得到结果的 Future。
+        传入 shard_writer 时结果（字典）带上 source 写入分片，不使用 output_path。
+        """
+        if payload is None:
+            return False
+        
+        processed_content = formatter_func(payload) if formatter_func else payload
+        if processed_content is None:
+            return False
+        
+        if shard_writer is not None:
+            record = {"source": source}
+            record.update(processed_content)
+            return shard_writer.write(record)
+        if self.async_writes:
+            return self.get_output_writer().submit(output_path, processed_content)
+        return self.write_file(output_path, processed_content)
+    
+    @staticmethod
+    def _when_written(written: Union[bool, Future], callback) -> None:
+        """写入完成后以是否成功调用 callback（异步写入时在写入线程中调用）"""
+        if isinstance(written, Future):
+            written.add_done_callback(lambda future: callback(bool(future.result())))
+        else:
+            callback(bool(written))
+
+def _read_and_process(file_path: Path, processor_func, stream: bool = False,
+                      workers: Optional[int] = None):
+    """进程池任务：在工作进程中读取并处理文件，只回传处理结果"""
+    if stream:
+        content = file_handler.read_content(file_path, workers)
+    else:
+        content = file_handler.read_file(file_path, workers)
+    if content is None:
+        return None
+    return processor_func(content)
 
 # 全局文件处理器实例
 file_handler = FileHandler()
\ No newline at end of file
@@ -13,7 +13,8 @@ import webbrowser
 from typing import Optional, Callable, Any
 
 from improved_file_handler import file_handler
-from improved_data_processor import text_processor, result_formatter
+from improved_data_processor import AdvancedTextProcessor, result_formatter
+from processing_profiles import get_profile, profile_names
 from config import config
 
 class ModernStyle:
@@ -398,6 +399,17 @@ class SmartFileProcessorGUI:
         options_frame = ttk.LabelFrame(frame, text="处理选项", padding="10")
         options_frame.pack(fill=tk.X, pady=(0, 20))
         
+        ttk.Label(options_frame, text="配置档:").pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.single_profile_var = tk.StringVar(value=config.get('nlp.profile', 'full'))
+        ttk.Combobox(
+            options_frame,
+            textvariable=self.single_profile_var,
+            values=profile_names(),
+            state="readonly",
+            width=12
+        ).pack(side=tk.LEFT, padx=(0, 20))
+        
         self.single_sentiment_var = tk.BooleanVar(value=True)
         ttk.Checkbutton(
             options_frame,
@@ -505,7 +517,18 @@ class SmartFileProcessorGUI:
             textvariable=self.batch_workers_var,
             width=10
         )
-        workers_spin.pack(side=tk.LEFT)
+        workers_spin.pack(side=tk.LEFT, padx=(0, 20))
+        
+        ttk.Label(options_row1, text="配置档:").pack(side=tk.LEFT, padx=(0, 10))
+        
+        self.batch_profile_var = tk.StringVar(value=config.get('nlp.profile', 'full'))
+        ttk.Combobox(
+            options_row1,
+            textvariable=self.batch_profile_var,
+            values=profile_names(),
+            state="readonly",
+            width=12
+        ).pack(side=tk.LEFT)
         
         # 第二行选项
         options_row2 = ttk.Frame(options_frame)
@@ -755,6 +778,12 @@ class SmartFileProcessorGUI:
         self.batch_progress['value'] = 0
         
     # 处理方法
+    def _create_processor(self, profile_name, sentiment, entities):
+        """按所选配置档和复选框创建文本处理器（取消勾选的阶段不运行，相应模型组件也不加载）"""
+        disabled = [stage for stage, enabled in (("sentiment", sentiment), ("entities", entities))
+                    if not enabled]
+        return AdvancedTextProcessor(get_profile(profile_name).without(*disabled))
+    
     def process_single_file(self):
         """处理单个文件"""
         input_file = self.single_input_var.get().strip()
@@ -793,6 +822,11 @@ class SmartFileProcessorGUI:
                 return
                 
             # 处理文本
+            text_processor = self._create_processor(
+                self.single_profile_var.get(),
+                self.single_sentiment_var.get(),
+                self.single_entities_var.get()
+            )
             result = text_processor.process_text(content)
             
             # 生成输出内容
@@ -894,6 +928,12 @@ class SmartFileProcessorGUI:
             original_workers = config.get('processing.max_workers')
             config.config['processing']['max_workers'] = self.batch_workers_var.get()
             
+            text_processor = self._create_processor(
+                self.batch_profile_var.get(),
+                self.batch_sentiment_var.get(),
+                self.batch_entities_var.get()
+            )
+            
             # 处理函数
             def process_func(content):
                 result = text_processor.process_text(content)
@@ -983,6 +1023,7 @@ class SmartFileProcessorGUI:
 
 ## 处理配置
 - 输出格式: {self.batch_format_var.get()}
+- 处理配置档: {self.batch_profile_var.get()}
 - 并发数: {self.batch_workers_var.get()}
 - 情感分析: {'启用' if self.batch_sentiment_var.get() else '禁用'}
 - 实体识别: {'启用' if self.batch_entities_var.get() else '禁用'}
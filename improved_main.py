@@ -3,14 +3,26 @@
 智能文件处理工具 - 改进版本
 """
 import argparse
+import json
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
 from improved_file_handler import file_handler
-from improved_data_processor import text_processor, result_formatter
+from improved_data_processor import (
+    text_processor, result_formatter, init_worker, process_text_in_worker
+)
+from json_records import RECORD_SUFFIXES, iter_batches, iter_json_records, record_text
+from pdf_extractor import parse_page_range
+from processing_profiles import profile_names
+from result_cache import ResultCache, build_fingerprint
+from shard_writer import ShardedJsonlWriter
+from tiered_processor import tiered_processor, process_tiered_in_worker
 from config import config
+from dir_scanner import scan_files
 
 # 配置日志
 logging.basicConfig(
@@ -26,29 +38,80 @@ class FileProcessor:
         self.file_handler = file_handler
         self.text_processor = text_processor
         self.result_formatter = result_formatter
+        self._result_cache = None
+        self.turbo = False
+        self.set_turbo(config.get('turbo.enabled', False))
+    
+    def set_turbo(self, enabled: bool) -> None:
+        """切换分层（turbo）处理：先用简化层处理，只有命中升级规则的文档才做完整NLP"""
+        self.turbo = enabled
+        self.text_processor = tiered_processor if enabled else text_processor
+    
+    def get_result_cache(self, use_cache: Optional[bool] = None) -> Optional[ResultCache]:
+        """获取结果缓存，未启用时返回 None"""
+        if use_cache is None:
+            use_cache = config.get('cache.enabled', False)
+        if not use_cache:
+            return None
+        
+        if self._result_cache is None:
+            self._result_cache = ResultCache(fingerprint=self.processing_fingerprint())
+        return self._result_cache
+    
+    def processing_fingerprint(self, extra: Optional[dict] = None) -> str:
+        """当前处理设置的指纹（用于结果缓存和增量清单）
+        
+        PDF 页码限制、带类型读取和处理配置档会改变处理结果，需要计入指纹；
+        extra 为其他影响输出的设置（例如输出格式）。
+        """
+        return build_fingerprint({
+            "pdf_max_pages": self.file_handler.pdf_max_pages,
+            "pdf_page_range": self.file_handler.pdf_page_range,
+            "typed_cells": self.file_handler.typed_cells,
+            "profile": self.text_processor.profile.as_dict(),
+            "turbo": {**tiered_processor.rules.as_dict(),
+                      "sentiment": config.get('turbo.sentiment', False),
+                      "escalate_streamed": tiered_processor.escalate_streamed}
+                     if self.turbo else None,
+            **(extra or {}),
+        })
     
     def process_single_file(self, input_path: str, output_path: str, 
-                          output_format: str = "summary") -> bool:
+                          output_format: str = "summary",
+                          use_cache: Optional[bool] = None,
+                          json_records: Optional[bool] = None) -> bool:
         """处理单个文件"""
         try:
             logger.info(f"开始处理文件: {input_path}")
             
-            # 读取文件
-            content = self.file_handler.read_file(input_path)
-            if content is None:
-                logger.error(f"无法读取文件: {input_path}")
-                return False
+            if json_records is None:
+                json_records = config.get('json_records.enabled', False)
+            if json_records and Path(input_path).suffix.lower() in RECORD_SUFFIXES:
+                return self.process_json_records(input_path, output_path) is not None
             
-            # 处理文本
-            result = self.text_processor.process_text(content)
+            cache = self.get_result_cache(use_cache)
+            cache_key = None
+            result = None
+            if cache is not None and self.file_handler.validate_file(input_path, allow_stream=True):
+                cache_key = cache.make_key(self.file_handler.file_hash(input_path))
+                result = cache.get(cache_key)
             
-            # 格式化输出
-            if output_format == "json":
-                output_content = self.result_formatter.to_json(result)
-            elif output_format == "summary":
-                output_content = self.result_formatter.to_summary_text(result)
+            if result is None:
+                # 读取文件（大文本文件返回分块生成器）
+                content = self.file_handler.read_content(input_path)
+                if content is None:
+                    logger.error(f"无法读取文件: {input_path}")
+                    return False
+                
+                # 处理文本
+                result = self.text_processor.process_content(content)
+                if cache_key:
+                    cache.put(cache_key, result)
             else:
-                output_content = result.processed_text
+                logger.info(f"命中结果缓存: {input_path}")
+            
+            # 格式化输出
+            output_content = self._format_result(result, output_format)
             
             # 写入结果
             success = self.file_handler.write_file(output_path, output_content)
@@ -63,32 +126,250 @@ class FileProcessor:
             logger.error(f"处理文件时发生错误 {input_path}: {e}")
             return False
     
+    def process_json_records(self, input_path: str, output_path: str,
+                             records_path: Optional[str] = None,
+                             text_fields: Optional[list] = None,
+                             batch_size: Optional[int] = None) -> Optional[int]:
+        """按记录处理 JSON 数组 / JSONL 文件
+        
+        记录被增量解析并按 batch_size 分批通过 nlp.pipe 处理，每条记录在输出
+        文件中写一行 JSON（JSONL），输出格式参数不适用于此模式。
+        返回处理的记录数，失败时返回 None。
+        """
+        if records_path is None:
+            records_path = config.get('json_records.records_path')
+        if text_fields is None:
+            text_fields = config.get('json_records.text_fields', [])
+        if batch_size is None:
+            batch_size = config.get('json_records.batch_size', 256)
+        
+        output_path = Path(output_path)
+        record_count = 0
+        try:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            records = iter_json_records(input_path, records_path)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for batch in iter_batches(records, batch_size):
+                    texts = [record_text(record, text_fields) for record in batch]
+                    for result in self.text_processor.process_texts(texts):
+                        line = {"record_index": record_count}
+                        line.update(self.result_formatter.to_dict(result))
+                        f.write(json.dumps(line, ensure_ascii=False))
+                        f.write('\n')
+                        record_count += 1
+        except (OSError, ValueError) as e:
+            logger.error(f"按记录处理JSON失败 {input_path}: {e}")
+            return None
+        
+        logger.info(f"按记录处理完成: {input_path} -> {output_path} ({record_count} 条记录)")
+        return record_count
+    
+    def _process_record_files(self, input_folder: str, output_folder: str) -> dict:
+        """批量处理时按记录处理文件夹中的 JSON / JSONL 文件
+        
+        输出保留相对路径和原后缀（sub/a.json → sub/a.json.processed.jsonl），
+        不同子文件夹或不同后缀的同名文件不会互相覆盖。文件由 processing.max_workers
+        个线程并行处理；每个文件的记录已经按批通过 nlp.pipe 处理，输出是逐条记录的
+        JSONL，因此不使用按文件缓存 ProcessingResult 的结果缓存、增量清单和分片输出。
+        """
+        input_folder = Path(input_folder)
+        output_folder = Path(output_folder)
+        stats = {"processed": 0, "errors": 0, "total": 0, "records": 0}
+        if not input_folder.exists():
+            return stats
+        
+        # 按记录处理的文件增量解析，不受最大文件大小限制
+        files = sorted(Path(entry.path) for entry in
+                       scan_files(input_folder, workers=self.file_handler.scan_workers)
+                       if Path(entry.name).suffix.lower() in RECORD_SUFFIXES)
+        
+        def process_file(file_path: Path) -> Optional[int]:
+            relative_path = file_path.relative_to(input_folder)
+            output_name = f"{relative_path.name}.processed.jsonl"
+            output_path = output_folder / relative_path.parent / output_name
+            return self.process_json_records(str(file_path), str(output_path))
+        
+        max_workers = config.get('processing.max_workers', 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for record_count in executor.map(process_file, files):
+                stats["total"] += 1
+                if record_count is None:
+                    stats["errors"] += 1
+                else:
+                    stats["processed"] += 1
+                    stats["records"] += record_count
+        return stats
+    
     def process_batch(self, input_folder: str, output_folder: str,
-                     output_format: str = "summary") -> dict:
-        """批量处理文件"""
+                     output_format: str = "summary",
+                     use_pipe: Optional[bool] = None,
+                     executor_type: Optional[str] = None,
+                     max_workers: Optional[int] = None,
+                     use_cache: Optional[bool] = None,
+                     incremental: bool = False,
+                     json_records: Optional[bool] = None,
+                     staged: Optional[bool] = None,
+                     sharded: Optional[bool] = None) -> dict:
+        """批量处理文件（结果缓存和增量模式只作用于 thread/process 执行后端）
+        
+        json_records 为 True 时，JSON / JSONL 文件按记录处理（见 process_json_records），
+        其余文件照常处理。staged 为 True 时使用 读取 → NLP → 写入 分阶段流水线
+        （见 FileHandler.batch_process_staged），不支持增量模式。
+        sharded 为 True 时结果不再逐文件输出，而是以 to_dict 记录（带 "source"）写入
+        输出文件夹中的分片 JSONL（见 shard_writer），输出格式参数不适用，不支持增量模式。
+        """
         logger.info(f"开始批量处理: {input_folder} -> {output_folder}")
         
-        def process_func(content):
-            """文本处理函数"""
-            result = self.text_processor.process_text(content)
+        if json_records is None:
+            json_records = config.get('json_records.enabled', False)
+        record_stats = None
+        exclude_suffixes = None
+        if json_records:
+            if use_cache or incremental or sharded:
+                logger.info("按记录处理的 JSON / JSONL 文件不使用结果缓存、增量清单和分片输出")
+            record_stats = self._process_record_files(input_folder, output_folder)
+            exclude_suffixes = RECORD_SUFFIXES
+        
+        if use_pipe is None:
+            use_pipe = config.get('processing.nlp_pipe', False)
+        if use_pipe and incremental:
+            logger.warning("增量模式不支持 nlp.pipe 批处理，改用普通批量处理")
+            use_pipe = False
+        if staged is None:
+            staged = config.get('pipeline.enabled', False)
+        if staged and incremental:
+            logger.warning("增量模式不支持分阶段流水线，改用普通批量处理")
+            staged = False
+        if sharded is None:
+            sharded = config.get('sharded_output.enabled', False)
+        if sharded and incremental:
+            logger.warning("增量模式不支持分片输出，改为逐文件输出")
+            sharded = False
+        
+        shard_writer = None
+        if sharded:
+            shard_writer = ShardedJsonlWriter(
+                output_folder,
+                max_bytes=config.get('sharded_output.max_shard_mb', 256) * 1024 * 1024,
+                compress=config.get('sharded_output.compress', False),
+                prefix=config.get('sharded_output.prefix', 'part')
+            )
             
-            if output_format == "json":
-                return self.result_formatter.to_json(result)
-            elif output_format == "summary":
-                return self.result_formatter.to_summary_text(result)
-            else:
-                return result.processed_text
+            def format_result(result):
+                return self.result_formatter.to_dict(result)
+        else:
+            def format_result(result):
+                return self._format_result(result, output_format)
         
-        # 使用文件处理器的批量处理功能
-        batch_result = self.file_handler.batch_process(
-            input_folder, output_folder, process_func
-        )
+        # 增量清单记录生成输出时的设置，输出格式不同的输出也需要重新生成
+        fingerprint = (self.processing_fingerprint({"output_format": output_format})
+                       if incremental else None)
+        try:
+            batch_result = self._run_batch(input_folder, output_folder, format_result,
+                                           use_pipe, executor_type, max_workers, use_cache,
+                                           incremental, staged, exclude_suffixes, shard_writer,
+                                           fingerprint)
+        finally:
+            shards = shard_writer.close() if shard_writer is not None else None
+        if shards is not None:
+            batch_result["shards"] = [str(path) for path in shards]
+            logger.info(f"分片输出: {len(shards)} 个分片")
+        
+        if record_stats is not None:
+            for key in ("processed", "errors", "total"):
+                batch_result[key] = batch_result.get(key, 0) + record_stats[key]
+            batch_result["records"] = record_stats["records"]
+            if record_stats["errors"]:
+                batch_result["success"] = False
         
         logger.info(f"批量处理完成: 成功 {batch_result.get('processed', 0)} 个文件, "
                    f"失败 {batch_result.get('errors', 0)} 个文件")
         
+        # 各检测层的判定次数（进程池后端的检测发生在工作进程中，不计入此处）
+        detection_stats = self.text_processor.language_detector.stats()
+        batch_result["language_detection"] = detection_stats
+        logger.info(f"语言检测: 缓存 {detection_stats['cache']} 次, "
+                    f"文字分布 {detection_stats['script']} 次, "
+                    f"langdetect {detection_stats['langdetect']} 次")
+        
+        # 同样只统计在主进程中处理的文档（进程池后端没有计数）
+        tier_stats = tiered_processor.stats()
+        if self.turbo and any(tier_stats.values()):
+            batch_result["tiers"] = tier_stats
+            logger.info(f"分层处理: 简化层 {tier_stats['simple']} 个, 完整层 {tier_stats['full']} 个")
+        
         return batch_result
     
+    def _run_batch(self, input_folder: str, output_folder: str, format_result,
+                   use_pipe: bool, executor_type: Optional[str], max_workers: Optional[int],
+                   use_cache: Optional[bool], incremental: bool, staged: bool,
+                   exclude_suffixes: Optional[set], shard_writer,
+                   fingerprint: Optional[str] = None) -> dict:
+        """按所选后端批量处理（format_result 在主进程或工作线程中执行）"""
+        if use_pipe:
+            def batch_process_func(contents):
+                """按语言分组，通过 nlp.pipe 批量处理"""
+                results = self.text_processor.process_texts(contents)
+                return [format_result(result) for result in results]
+            
+            batch_result = self.file_handler.batch_process_pipe(
+                input_folder, output_folder, batch_process_func,
+                exclude_suffixes=exclude_suffixes,
+                shard_writer=shard_writer
+            )
+        else:
+            if executor_type is None:
+                executor_type = config.get('processing.executor', 'thread')
+            
+            initializer = None
+            if executor_type == 'process':
+                # 进程池：每个工作进程按当前配置档预加载模型，只回传 ProcessingResult；
+                # 分层处理时模型在有文档升级到完整层时才加载
+                processor_func = process_tiered_in_worker if self.turbo else process_text_in_worker
+                initializer = partial(init_worker, self.text_processor.profile,
+                                      warmup=not self.turbo)
+            else:
+                processor_func = self.text_processor.process_content
+            
+            if staged:
+                # 读取、NLP、写入分阶段并发，阶段之间有界排队
+                batch_result = self.file_handler.batch_process_staged(
+                    input_folder, output_folder, processor_func,
+                    formatter_func=format_result,
+                    executor_type=executor_type,
+                    initializer=initializer,
+                    cache=self.get_result_cache(use_cache),
+                    stream_large_files=True,
+                    exclude_suffixes=exclude_suffixes,
+                    shard_writer=shard_writer
+                )
+            else:
+                # 使用文件处理器的批量处理功能
+                batch_result = self.file_handler.batch_process(
+                    input_folder, output_folder, processor_func,
+                    formatter_func=format_result,
+                    executor_type=executor_type,
+                    initializer=initializer,
+                    max_workers=max_workers,
+                    cache=self.get_result_cache(use_cache),
+                    incremental=incremental,
+                    stream_large_files=True,
+                    exclude_suffixes=exclude_suffixes,
+                    shard_writer=shard_writer,
+                    fingerprint=fingerprint
+                )
+        
+        return batch_result
+    
+    def _format_result(self, result, output_format: str) -> str:
+        """按输出格式格式化处理结果"""
+        if output_format == "json":
+            return self.result_formatter.to_json(result)
+        elif output_format == "summary":
+            return self.result_formatter.to_summary_text(result)
+        else:
+            return result.processed_text
+    
     def _print_processing_summary(self, result):
         """打印处理摘要"""
         stats = result.statistics
@@ -99,6 +380,8 @@ class FileProcessor:
         print(f"- 发现数字: {stats.get('number_count', 0)} 个")
         print(f"- 发现日期: {stats.get('date_count', 0)} 个")
         print(f"- 发现实体: {stats.get('entity_count', 0)} 个")
+        if "tier" in stats:
+            print(f"- 处理层级: {'完整' if stats['tier'] == 'full' else '简化'}")
         
         if result.sentiment:
             compound = result.sentiment.get('compound', 0)
@@ -118,6 +401,16 @@ def create_parser():
   %(prog)s document.txt output.txt                    # 处理单个文件
   %(prog)s input_folder output_folder                 # 批量处理
   %(prog)s document.txt output.json --format json    # 输出JSON格式
+  %(prog)s input_folder output_folder --pipe          # 使用 nlp.pipe 批量处理
+  %(prog)s input_folder output_folder --executor process  # 使用进程池批量处理
+  %(prog)s input_folder output_folder --incremental   # 只处理新增或变化的文件
+  %(prog)s input_folder output_folder --staged        # 分阶段流水线批量处理
+  %(prog)s input_folder output_folder --async-writes  # 后台批量写入输出
+  %(prog)s input_folder output_folder --sharded       # 结果写入分片 JSONL
+  %(prog)s input_folder output_folder --profile stats-only  # 只做统计，不加载 tagger/parser/NER
+  %(prog)s input_folder output_folder --turbo         # 分层处理，只对命中规则的文档做完整NLP
+  %(prog)s report.pdf preview.txt --pages 1-20        # 只处理PDF的前20页
+  %(prog)s export.jsonl results.jsonl --json-records  # 每条记录输出一行结果
   %(prog)s --config                                   # 查看当前配置
         """
     )
@@ -130,6 +423,71 @@ def create_parser():
                        default="summary",
                        help="输出格式 (默认: summary)")
     
+    parser.add_argument("--pipe",
+                       action="store_true",
+                       default=None,
+                       help="批量处理时按语言分组，使用 nlp.pipe 批量解析")
+    
+    parser.add_argument("--executor",
+                       choices=["thread", "process"],
+                       default=None,
+                       help="批量处理的执行后端 (默认: processing.executor)")
+    
+    parser.add_argument("--cache",
+                       action="store_true",
+                       default=None,
+                       help="启用结果缓存，跳过内容未变化的文件")
+    
+    parser.add_argument("--no-cache",
+                       action="store_false",
+                       dest="cache",
+                       help="禁用结果缓存")
+    
+    parser.add_argument("--incremental",
+                       action="store_true",
+                       help="增量批处理：只处理新增或变化的文件，并清理已删除输入的输出")
+    
+    parser.add_argument("--staged",
+                       action="store_true",
+                       default=None,
+                       help="批量处理使用 读取 → NLP → 写入 分阶段流水线（有界队列和字节预算）")
+    
+    parser.add_argument("--async-writes",
+                       action="store_true",
+                       default=None,
+                       help="批量处理时由后台线程批量写入输出（临时文件 + 原子重命名）")
+    
+    parser.add_argument("--sharded",
+                       action="store_true",
+                       default=None,
+                       help="批量处理结果写入按大小轮换的分片 JSONL，而不是每个输入一个文件")
+    
+    parser.add_argument("--profile",
+                       choices=profile_names(),
+                       default=None,
+                       help="处理配置档，只运行并加载所需的处理阶段和 spaCy 组件 (默认: nlp.profile)")
+    
+    parser.add_argument("--turbo",
+                       action="store_true",
+                       default=None,
+                       help="分层处理：所有文档先用简化处理器，命中 turbo.escalate_* 规则的文档才做完整 spaCy/VADER 处理")
+    
+    parser.add_argument("--json-records",
+                       action="store_true",
+                       default=None,
+                       help="按记录处理 JSON 数组 / JSONL 文件，每条记录输出一行结果")
+    
+    parser.add_argument("--max-pages",
+                       type=int,
+                       default=None,
+                       help="PDF 最多提取的页数（用于预览）")
+    
+    parser.add_argument("--pages",
+                       type=parse_page_range,
+                       default=None,
+                       metavar="START-END",
+                       help="只提取指定页码区间的 PDF 内容，例如 1-20")
+    
     parser.add_argument("--config", "-c", 
                        action="store_true",
                        help="显示当前配置")
@@ -159,8 +517,34 @@ def main():
         print(f"- 支持的文件格式: {config.get('processing.supported_formats')}")
         print(f"- 最大文件大小: {config.get('processing.max_file_size_mb')} MB")
         print(f"- 并发处理数: {config.get('processing.max_workers')}")
+        print(f"- 执行后端: {config.get('processing.executor')}")
+        print(f"- nlp.pipe 批处理: {'启用' if config.get('processing.nlp_pipe') else '禁用'} "
+              f"(batch_size={config.get('processing.pipe_batch_size')}, "
+              f"n_process={config.get('processing.pipe_n_process')})")
+        print(f"- 结果缓存: {'启用' if config.get('cache.enabled') else '禁用'} "
+              f"({config.get('cache.path')}, 上限 {config.get('cache.max_size_mb')} MB)")
+        print(f"- 分阶段流水线: {'启用' if config.get('pipeline.enabled') else '禁用'} "
+              f"(读取 {config.get('pipeline.read_workers')} / NLP {config.get('pipeline.nlp_workers')} / "
+              f"写入 {config.get('pipeline.write_workers')} 线程, 队列 {config.get('pipeline.queue_size')}, "
+              f"在途上限 {config.get('pipeline.max_inflight_mb')} MB)")
+        print(f"- 异步输出写入: {'启用' if config.get('output_writer.enabled') else '禁用'} "
+              f"(batch_size={config.get('output_writer.batch_size')}, "
+              f"fsync={config.get('output_writer.fsync')})")
+        print(f"- 分片输出: {'启用' if config.get('sharded_output.enabled') else '禁用'} "
+              f"(每片 {config.get('sharded_output.max_shard_mb')} MB, "
+              f"gzip {'是' if config.get('sharded_output.compress') else '否'})")
+        print(f"- JSON 按记录处理: {'启用' if config.get('json_records.enabled') else '禁用'} "
+              f"(records_path={config.get('json_records.records_path')}, "
+              f"text_fields={config.get('json_records.text_fields')}, "
+              f"batch_size={config.get('json_records.batch_size')})")
         print(f"- 语言检测: {'启用' if config.get('nlp.detect_language') else '禁用'}")
         print(f"- 情感分析: {'启用' if config.get('nlp.sentiment_analysis') else '禁用'}")
+        print(f"- 分层处理: {'启用' if config.get('turbo.enabled') else '禁用'} "
+              f"(升级规则: 长度 >= {config.get('turbo.escalate_min_chars')}, "
+              f"语言 {config.get('turbo.escalate_languages')}, "
+              f"关键词 {config.get('turbo.escalate_keywords')})")
+        print(f"- 处理配置档: {config.get('nlp.profile')} "
+              f"(可用: {', '.join(profile_names())})")
         return 0
     
 
@@ -189,6 +573,16 @@ def main():
     
     # 创建处理器
     processor = FileProcessor()
+    if args.max_pages is not None:
+        processor.file_handler.pdf_max_pages = args.max_pages
+    if args.pages is not None:
+        processor.file_handler.pdf_page_range = args.pages
+    if args.async_writes is not None:
+        processor.file_handler.async_writes = args.async_writes
+    if args.turbo is not None:
+        processor.set_turbo(args.turbo)
+    if args.profile is not None:
+        processor.text_processor.set_profile(args.profile)
     
     # 处理文件
     input_path = Path(args.input)
@@ -198,14 +592,23 @@ def main():
         if input_path.is_file():
             # 处理单个文件
             success = processor.process_single_file(
-                str(input_path), str(output_path), args.format
+                str(input_path), str(output_path), args.format,
+                use_cache=args.cache,
+                json_records=args.json_records
             )
             return 0 if success else 1
             
         elif input_path.is_dir():
             # 批量处理
             result = processor.process_batch(
-                str(input_path), str(output_path), args.format
+                str(input_path), str(output_path), args.format,
+                use_pipe=args.pipe,
+                executor_type=args.executor,
+                use_cache=args.cache,
+                incremental=args.incremental,
+                json_records=args.json_records,
+                staged=args.staged,
+                sharded=args.sharded
             )
             return 0 if result.get("success") else 1
             
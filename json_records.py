@@ -0,0 +1,177 @@
+"""
+JSON / JSONL 记录流式读取模块
+
+按记录增量解析 JSON 数组和 JSONL 文件：顶层数组通过 raw_decode 在有界缓冲区
+上逐个解码元素，JSONL 逐行解析，整个文件不需要一次装入内存。每条记录中
+由 JSON 路径选出的字符串字段拼接为一个待处理文档。
+"""
+import json
+import logging
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Union
+
+logger = logging.getLogger(__name__)
+
+JSONL_SUFFIXES = {'.jsonl', '.ndjson'}
+RECORD_SUFFIXES = {'.json'} | JSONL_SUFFIXES
+
+_WHITESPACE = ' \t\n\r'
+_READ_CHARS = 1024 * 1024
+
+
+def iter_json_array(f: TextIO, read_chars: int = _READ_CHARS) -> Iterator[Any]:
+    """增量解析文本流中的顶层 JSON 数组，逐个返回元素"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill() -> bool:
+        """读入更多数据，已到文件末尾时返回 False"""
+        nonlocal buffer, pos, eof
+        chunk = f.read(read_chars)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def skip_whitespace() -> bool:
+        """跳过空白，缓冲区中还有非空白字符时返回 True"""
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return True
+            if not fill():
+                return False
+
+    if not skip_whitespace() or buffer[pos] != '[':
+        raise ValueError("JSON 顶层不是数组")
+    pos += 1
+
+    first = True
+    while True:
+        if not skip_whitespace():
+            raise ValueError("JSON 数组未结束")
+        if buffer[pos] == ']':
+            return
+        if not first:
+            if buffer[pos] != ',':
+                raise ValueError(f"JSON 数组元素之间缺少逗号（位置 {pos}）")
+            pos += 1
+            if not skip_whitespace():
+                raise ValueError("JSON 数组未结束")
+        first = False
+
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # 值恰好到达缓冲区末尾时可能被截断（例如数字），需要读入更多再解码
+                if end < len(buffer) or eof:
+                    break
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            if not fill():
+                value, end = decoder.raw_decode(buffer, pos)
+                break
+        pos = end
+        yield value
+
+
+def iter_json_records(file_path: Union[str, Path],
+                      records_path: Optional[str] = None) -> Iterator[Any]:
+    """逐条返回 JSON / JSONL 文件中的记录
+
+    JSONL 文件的每个非空行是一条记录（无法解析的行记录警告后跳过）。
+    JSON 文件的顶层为数组且未指定 records_path 时流式解析；否则整体加载后
+    取 records_path（如 "data.items"）处的值，为列表时逐个返回其元素。
+    """
+    file_path = Path(file_path)
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if file_path.suffix.lower() in JSONL_SUFFIXES:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(f"跳过无法解析的第 {line_number} 行 {file_path}: {e}")
+            return
+
+        head = f.read(64).lstrip()
+        f.seek(0)
+        if head.startswith('[') and not records_path:
+            yield from iter_json_array(f)
+            return
+
+        data = json.load(f)
+
+    for value in resolve_path(data, records_path):
+        if isinstance(value, list):
+            yield from value
+        else:
+            yield value
+
+
+def resolve_path(data: Any, path: Optional[str]) -> List[Any]:
+    """取 JSON 路径处的值，路径以 "." 分隔，"*" 匹配列表的每个元素或对象的每个值"""
+    values = [data]
+    if not path:
+        return values
+
+    for key in path.split('.'):
+        next_values = []
+        for value in values:
+            if key == '*':
+                if isinstance(value, list):
+                    next_values.extend(value)
+                elif isinstance(value, dict):
+                    next_values.extend(value.values())
+            elif isinstance(value, dict):
+                if key in value:
+                    next_values.append(value[key])
+            elif isinstance(value, list) and key.isdigit():
+                if int(key) < len(value):
+                    next_values.append(value[int(key)])
+        values = next_values
+    return values
+
+
+def _string_leaves(value: Any) -> Iterator[str]:
+    """递归返回值中所有的字符串"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _string_leaves(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _string_leaves(item)
+
+
+def record_text(record: Any, text_fields: Optional[Iterable[str]] = None) -> str:
+    """拼接记录中选中字段的字符串，未指定字段时使用全部字符串字段"""
+    if not text_fields:
+        values = [record]
+    else:
+        values = [value for path in text_fields for value in resolve_path(record, path)]
+
+    return '\n'.join(text for value in values for text in _string_leaves(value)
+                     if text.strip())
+
+
+def iter_batches(records: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+    """把记录流切分为固定大小的批次"""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,125 @@
+"""
+分层语言检测模块
+
+第一层根据文本样本的 Unicode 文字（script）分布快速判断：纯ASCII文本、
+以汉字/假名/谚文为主的文本直接得出结果；只有无法判断的样本才交给
+langdetect 的 n-gram 模型。结果按样本哈希缓存在有界的 LRU 中，
+并统计每一层各判定了多少次调用。
+"""
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# 各文字的字符范围（由 C 实现的正则一次统计，避免逐字符的 Python 循环）
+_HAN_RE = re.compile(r'[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]')
+_KANA_RE = re.compile(r'[\u3040-\u30ff\u31f0-\u31ff]')
+_HANGUL_RE = re.compile(r'[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]')
+_SPACE_RE = re.compile(r'\s')
+
+# 判定阈值（占非空白字符的比例）
+_KANA_RATIO = 0.1
+_HANGUL_RATIO = 0.3
+_HAN_RATIO = 0.3
+
+
+def script_histogram(sample: str) -> Dict[str, int]:
+    """统计样本中各文字的字符数"""
+    return {
+        "total": len(sample) - len(_SPACE_RE.findall(sample)),
+        "han": len(_HAN_RE.findall(sample)),
+        "kana": len(_KANA_RE.findall(sample)),
+        "hangul": len(_HANGUL_RE.findall(sample)),
+    }
+
+
+def detect_by_script(sample: str) -> Optional[str]:
+    """根据文字分布判断语言，无法判断时返回 None"""
+    if sample.isascii():
+        return "en"
+
+    histogram = script_histogram(sample)
+    total = histogram["total"]
+    if not total:
+        return None
+
+    if histogram["kana"] / total >= _KANA_RATIO:
+        return "ja"
+    if histogram["hangul"] / total >= _HANGUL_RATIO:
+        return "ko"
+    if histogram["han"] / total >= _HAN_RATIO:
+        return "zh"
+    return None
+
+
+def normalize_language(code: str) -> str:
+    """规范化语言代码"""
+    if code in ["zh-cn", "zh-tw", "zh"]:
+        return "zh"
+    elif code.startswith("en"):
+        return "en"
+    return code
+
+
+class LanguageDetector:
+    """分层语言检测器：LRU缓存 → 文字分布 → langdetect"""
+
+    def __init__(self, sample_size: int = 200, cache_size: int = 4096):
+        self.sample_size = sample_size
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[bytes, str]" = OrderedDict()
+        self._counts = {"cache": 0, "script": 0, "langdetect": 0}
+        self._lock = threading.Lock()
+        self._langdetect = None
+
+    def detect(self, text: str) -> str:
+        """检测文本语言，样本为空时返回 "unknown" """
+        # 使用开头的有限字符进行检测
+        sample = (text or "")[:self.sample_size].strip()
+        if not sample:
+            return "unknown"
+
+        key = hashlib.blake2b(sample.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self._counts["cache"] += 1
+                return cached
+
+        language = detect_by_script(sample)
+        layer = "script"
+        if language is None:
+            language = self._detect_with_langdetect(sample)
+            layer = "langdetect"
+
+        with self._lock:
+            self._counts[layer] += 1
+            self._cache[key] = language
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        return language
+
+    def _detect_with_langdetect(self, sample: str) -> str:
+        """使用 langdetect 检测（首次调用时才导入）"""
+        if self._langdetect is None:
+            import langdetect
+            # 设置随机种子以获得一致的语言检测结果
+            langdetect.DetectorFactory.seed = 0
+            self._langdetect = langdetect
+
+        try:
+            return normalize_language(self._langdetect.detect(sample))
+        except self._langdetect.LangDetectException:
+            logger.warning("语言检测失败，使用默认语言")
+            return "en"
+
+    def stats(self) -> Dict[str, int]:
+        """返回各层判定的调用次数"""
+        with self._lock:
+            return dict(self._counts)
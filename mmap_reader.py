@@ -0,0 +1,223 @@
+"""
+基于 mmap 的文本读取模块
+
+通过内存映射读取 .txt / .csv 文件：只用文件开头的有限字节（BOM + 统计检查）
+判断编码，整个文件只解码一次；分块读取时直接返回 memoryview 切片，不复制数据。
+"""
+import codecs
+import logging
+import mmap
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 编码嗅探使用的前缀大小
+SNIFF_SIZE = 64 * 1024
+
+# BOM 与对应编码（长的 BOM 必须排在前面，UTF-32-LE 的 BOM 以 UTF-16-LE 的 BOM 开头）
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+]
+
+# cp1252 中未定义的字节，出现时只能按 iso-8859-1 解码
+_CP1252_UNDEFINED = {0x81, 0x8D, 0x8F, 0x90, 0x9D}
+
+# 前缀嗅探误判时依次尝试的编码
+_FALLBACK_ENCODINGS = ['utf-8', 'gbk', 'cp1252', 'iso-8859-1']
+
+# 分块时优先使用的切分位置（按优先级）
+_CHUNK_SEPARATORS = ['\n\n', '\n', '. ', '。', ' ']
+
+
+def _decodes(sample: bytes, encoding: str) -> bool:
+    """样本能否按指定编码解码（允许末尾截断的多字节字符）"""
+    try:
+        codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+
+def sniff_encoding(prefix: bytes) -> Tuple[str, int]:
+    """根据文件前缀判断编码，返回 (编码, BOM长度)
+
+    顺序：BOM → UTF-8 严格校验 → GBK 严格校验（含高位字节）→ cp1252 → iso-8859-1。
+    繁体、扩展区汉字和以 ASCII 为主的 GBK 文件同样按 GBK 解码，避免误判为 cp1252。
+    """
+    for bom, encoding in _BOMS:
+        if prefix.startswith(bom):
+            return encoding, len(bom)
+
+    if _decodes(prefix, 'utf-8'):
+        return 'utf-8', 0
+
+    if any(byte >= 0x80 for byte in prefix) and _decodes(prefix, 'gbk'):
+        return 'gbk', 0
+
+    if not any(byte in _CP1252_UNDEFINED for byte in prefix):
+        return 'cp1252', 0
+
+    return 'iso-8859-1', 0
+
+
+class MappedTextFile:
+    """内存映射的文本文件
+
+    用法:
+        with MappedTextFile(path) as mapped:
+            text = mapped.read_text()
+    """
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = Path(file_path)
+        self._file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._view: Optional[memoryview] = None
+        self.encoding = 'utf-8'
+        self.bom_length = 0
+
+    def __enter__(self) -> "MappedTextFile":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def open(self) -> None:
+        """打开文件并建立映射，同时嗅探编码"""
+        self._file = open(self.file_path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        except ValueError:
+            # 空文件无法映射
+            self._view = memoryview(b'')
+
+        self.encoding, self.bom_length = sniff_encoding(bytes(self._view[:SNIFF_SIZE]))
+
+    def close(self) -> None:
+        """释放映射；调用方必须先释放自己持有的 memoryview 切片"""
+        try:
+            if self._view is not None:
+                self._view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+        except BufferError:
+            logger.warning(f"仍有未释放的内存视图，映射将在回收时关闭: {self.file_path}")
+        finally:
+            self._view = None
+            self._mmap = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @property
+    def size(self) -> int:
+        """文件字节数（不含BOM）"""
+        return len(self._view) - self.bom_length
+
+    def read_text(self) -> str:
+        """一次性解码整个文件
+
+        前缀嗅探偶尔会误判（例如前缀是纯ASCII、后面才出现中文），
+        此时按 utf-8 → gbk → cp1252 → iso-8859-1 的顺序尝试后续编码。
+        """
+        body = self._view[self.bom_length:]
+        try:
+            try:
+                return str(body, self.encoding)
+            except UnicodeDecodeError:
+                pass
+
+            if self.encoding in _FALLBACK_ENCODINGS:
+                candidates = _FALLBACK_ENCODINGS[_FALLBACK_ENCODINGS.index(self.encoding) + 1:]
+            else:
+                candidates = _FALLBACK_ENCODINGS
+            for fallback in candidates:
+                try:
+                    text = str(body, fallback)
+                except UnicodeDecodeError:
+                    continue
+                logger.info(f"{self.encoding} 解码失败，改用 {fallback}: {self.file_path}")
+                self.encoding = fallback
+                return text
+
+            # iso-8859-1 能解码任意字节，不会走到这里
+            return str(body, 'iso-8859-1')
+        finally:
+            body.release()
+
+    def iter_byte_chunks(self, chunk_bytes: int) -> Iterator[memoryview]:
+        """按段落/行/句子/空白边界切分，返回零拷贝的 memoryview 切片
+
+        每块最多 chunk_bytes 字节；找不到边界时硬切，多字节字符被切开的
+        情况由 iter_text_chunks 中的增量解码器处理。
+        """
+        separators = [self._encode(separator) for separator in _CHUNK_SEPARATORS]
+        unit = self._code_unit()
+        start = self.bom_length
+        end_of_file = len(self._view)
+
+        while start < end_of_file:
+            end = min(start + chunk_bytes, end_of_file)
+            if end < end_of_file:
+                end = self._find_boundary(start, end, separators, unit)
+            yield self._view[start:end]
+            start = end
+
+    def iter_text_chunks(self, chunk_bytes: int) -> Iterator[str]:
+        """逐块解码文本，每个字节只解码一次"""
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+        for chunk in self.iter_byte_chunks(chunk_bytes):
+            try:
+                text = decoder.decode(chunk)
+            finally:
+                chunk.release()
+            if text:
+                yield text
+
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+    def _encode(self, text: str) -> bytes:
+        """按文件编码编码分隔符，无法编码时返回空字节串"""
+        try:
+            return text.encode(self.encoding)
+        except UnicodeEncodeError:
+            return b''
+
+    def _code_unit(self) -> int:
+        """编码的最小单位字节数（UTF-16/32 切分位置必须对齐）"""
+        if self.encoding.startswith('utf-32'):
+            return 4
+        if self.encoding.startswith('utf-16'):
+            return 2
+        return 1
+
+    def _find_boundary(self, start: int, end: int, separators, unit: int) -> int:
+        """在 [start, end) 的后半部分寻找切分位置"""
+        half = start + (end - start) // 2
+
+        for separator in separators:
+            if not separator:
+                continue
+            position = self._mmap.rfind(separator, half, end)
+            while position != -1 and (position - self.bom_length) % unit:
+                position = self._mmap.rfind(separator, half, position)
+            if position != -1:
+                return position + len(separator)
+
+        # 没有合适的边界：硬切，保持编码单位对齐
+        return end - (end - self.bom_length) % unit
+
+
+def read_text(file_path: Union[str, Path]) -> Tuple[str, str]:
+    """读取整个文本文件，返回 (文本, 编码)"""
+    with MappedTextFile(file_path) as mapped:
+        return mapped.read_text(), mapped.encoding
@@ -12,7 +12,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 
 from improved_file_handler import file_handler
-from improved_data_processor import text_processor, result_formatter
+from improved_data_processor import AdvancedTextProcessor, result_formatter
+from processing_profiles import get_profile, profile_names
 from config import config
 
 class ModernFileProcessorGUI:
@@ -60,6 +61,9 @@ class ModernFileProcessorGUI:
         self.status_text = tk.StringVar(value="就绪")
         self.progress_var = tk.DoubleVar()
         self.file_count = tk.StringVar(value="文件: 0")
+        self.profile_name = tk.StringVar(value=config.get('nlp.profile', 'full'))
+        self.sentiment_enabled = tk.BooleanVar(value=config.get('nlp.sentiment_analysis', True))
+        self.entities_enabled = tk.BooleanVar(value=True)
         
     def setup_styles(self):
         """设置样式"""
@@ -210,6 +214,17 @@ class ModernFileProcessorGUI:
                 value=value
             ).pack(anchor='w', pady=1)
         
+        # 处理配置档
+        profile_frame = ttk.LabelFrame(parent, text="🧩 处理配置档", padding="10")
+        profile_frame.pack(fill='x', pady=(0, 15))
+        
+        ttk.Combobox(
+            profile_frame,
+            textvariable=self.profile_name,
+            values=profile_names(),
+            state="readonly"
+        ).pack(fill='x')
+        
         # 处理控制
         control_frame = ttk.LabelFrame(parent, text="🚀 处理控制", padding="10")
         control_frame.pack(fill='x', pady=(0, 15))
@@ -486,6 +501,13 @@ class ModernFileProcessorGUI:
         finally:
             self.message_queue.put(('complete', None))
             
+    def create_text_processor(self):
+        """按所选配置档和设置中的情感分析、实体识别开关创建文本处理器"""
+        disabled = [stage for stage, var in (("sentiment", self.sentiment_enabled),
+                                             ("entities", self.entities_enabled))
+                    if not var.get()]
+        return AdvancedTextProcessor(get_profile(self.profile_name.get()).without(*disabled))
+    
     def process_single_file_thread(self, input_path, output_path, output_format):
         """处理单个文件"""
         try:
@@ -502,7 +524,7 @@ class ModernFileProcessorGUI:
             self.message_queue.put(('status', "正在分析文本..."))
             self.message_queue.put(('progress', 50))
             
-            result = text_processor.process_text(content)
+            result = self.create_text_processor().process_text(content)
             
             # 格式化输出
             self.message_queue.put(('status', "正在格式化输出..."))
@@ -536,6 +558,7 @@ class ModernFileProcessorGUI:
         """批量处理文件"""
         try:
             self.message_queue.put(('status', "正在扫描文件..."))
+            text_processor = self.create_text_processor()
             
             def process_func(content):
                 result = text_processor.process_text(content)
@@ -686,7 +709,7 @@ class ModernFileProcessorGUI:
             
     def show_settings(self):
         """显示设置对话框"""
-        SettingsWindow(self.root)
+        SettingsWindow(self.root, self)
         
     def show_help(self):
         """显示帮助对话框"""
@@ -707,7 +730,8 @@ class ModernFileProcessorGUI:
 class SettingsWindow:
     """设置窗口"""
     
-    def __init__(self, parent):
+    def __init__(self, parent, app=None):
+        self.app = app
         self.window = tk.Toplevel(parent)
         self.window.title("⚙️ 设置")
         self.window.geometry("500x400")
@@ -785,11 +809,12 @@ class SettingsWindow:
         ttk.Checkbutton(frame, text="启用语言检测", variable=self.detect_lang_var).grid(row=0, column=0, sticky='w', pady=5)
         
         # 情感分析
-        self.sentiment_var = tk.BooleanVar(value=config.get('nlp.sentiment_analysis', True))
+        self.sentiment_var = tk.BooleanVar(
+            value=self.app.sentiment_enabled.get() if self.app else config.get('nlp.sentiment_analysis', True))
         ttk.Checkbutton(frame, text="启用情感分析", variable=self.sentiment_var).grid(row=1, column=0, sticky='w', pady=5)
         
         # 实体识别
-        self.entity_var = tk.BooleanVar(value=True)
+        self.entity_var = tk.BooleanVar(value=self.app.entities_enabled.get() if self.app else True)
         ttk.Checkbutton(frame, text="启用实体识别", variable=self.entity_var).grid(row=2, column=0, sticky='w', pady=5)
         
         # 模型信息
@@ -805,7 +830,11 @@ class SettingsWindow:
     def save_settings(self):
         """保存设置"""
         try:
-            # 这里可以实现真正的设置保存逻辑
+            # NLP 开关作用于之后的处理（与处理配置档一起决定运行哪些阶段）
+            config.config['nlp']['detect_language'] = self.detect_lang_var.get()
+            if self.app is not None:
+                self.app.sentiment_enabled.set(self.sentiment_var.get())
+                self.app.entities_enabled.set(self.entity_var.get())
             messagebox.showinfo("成功", "设置已保存")
             self.window.destroy()
         except Exception as e:
@@ -1,4 +1,13 @@
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
+import os
+import sys
+
+# 情感分析引擎在上级目录,与改进版处理器共用(只创建一个分析器,分句打分,重复句子走缓存)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from sentiment_engine import sentiment_engine
+
+def get_analyzer():
+    """返回共用的情感分析器,第一次调用时创建"""
+    return sentiment_engine.get_analyzer()
 
 def analyze_sentiment(text):
     """
@@ -6,7 +15,12 @@ def analyze_sentiment(text):
     arags: text(str)
     return dict:包含情感得分的字典,例如,position,negivite,neu,compund(综合得分)
     """
-    analyzer=SentimentIntensityAnalyzer()
-    scores=analyzer.polarity_scores(text)
+    scores=sentiment_engine.score(text)
     return scores
+
+def analyze_sentiments(texts):
+    """
+    批量分析多条文本的情感倾向,句子去重后一次打分
+    """
+    return sentiment_engine.score_many(texts)
     
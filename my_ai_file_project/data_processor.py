@@ -1,5 +1,6 @@
 import re
 import logging
+from collections import Counter
 import spacy
 from langdetect import detect, LangDetectException
 
@@ -104,6 +105,112 @@ def data_process(text):
     except Exception as e:
         logging.error(f"预处理失败: {str(e)}")
         return text  # 保证始终返回字符串
+def filter_characters(text, chars):
+    """
+    去除文本中指定的特殊字符
+    args: text(str),chars(str):需要去除的字符
+    """
+    if not text:
+        return text
+    return text.translate(str.maketrans('', '', chars))
+
+def detect_batch_language(text):
+    """批量处理用的语言检测,只区分中文和英文(检测失败默认英语)"""
+    try:
+        lang = detect(text[:100])
+    except Exception:
+        lang = "en"
+    return "zh" if lang in ["zh-cn", "zh-tw", "zh"] else "en"
+
+def doc_to_text(doc, text):
+    """把解析好的Doc转换为处理后的文本,规则与 process_text 相同"""
+    if doc.lang_ == "zh":
+        tokens = [token.text for token in doc if not token.is_punct]
+    else:
+        tokens = [token.lemma_ for token in doc if not token.is_stop and not token.is_punct]
+    return " ".join(tokens).strip() if tokens else text[:100]
+
+def process_docs(texts, batch_size=256):
+    """
+    data_process 的批量版本:按语言分组后用 nlp.pipe 批量解析
+    某一批解析出错时只影响这一批:其中的文本逐条交给 data_process 处理(失败时保留原文),Doc为None
+    args: texts(list),batch_size(int):每次送入 nlp.pipe 的文本数
+    return (list,list):处理后的文本列表和对应的Doc列表(空文本的Doc为None),顺序与输入一致
+    """
+    cleaned = [re.sub(r'[\s\n]+', ' ', text).strip() if text else "" for text in texts]
+    docs = [None] * len(cleaned)
+    failed = set()
+    groups = {"en": [], "zh": []}
+    for index, text in enumerate(cleaned):
+        if text:
+            groups[detect_batch_language(text)].append(index)
+
+    for lang, indexes in groups.items():
+        nlp = nlp_zh if lang == "zh" else nlp_en
+        for start in range(0, len(indexes), batch_size):
+            batch = indexes[start:start + batch_size]
+            try:
+                batch_docs = list(nlp.pipe([cleaned[i] for i in batch], batch_size=batch_size))
+            except Exception as e:
+                logging.error(f"批量处理失败,改为逐条处理 {len(batch)} 条文本：{e}")
+                failed.update(batch)
+                continue
+            for index, doc in zip(batch, batch_docs):
+                docs[index] = doc
+
+    processed = []
+    for index, (text, doc) in enumerate(zip(cleaned, docs)):
+        if doc is not None:
+            processed.append(doc_to_text(doc, text))
+        elif index in failed:
+            processed.append(data_process(text))
+        else:
+            processed.append(text)
+    return processed, docs
+
+def extract_keywords(doc, top_n=5):
+    """
+    提取关键词:按词频返回前 top_n 个非停用词(英文取名词/形容词的词元,中文取多字词)
+    """
+    if doc is None:
+        return []
+    counts = Counter()
+    for token in doc:
+        if token.is_stop or token.is_punct or token.is_space or token.like_num:
+            continue
+        if doc.lang_ == "zh":
+            if len(token.text) > 1:
+                counts[token.text] += 1
+        elif token.pos_ in ("NOUN", "PROPN", "ADJ") or not token.pos_:
+            counts[token.lemma_.lower()] += 1
+    return [word for word, _ in counts.most_common(top_n)]
+
+# 默认的文本分类关键词表,可以通过 json 文件替换
+DEFAULT_CATEGORIES = {
+    "天气": ["weather", "rain", "sunny", "cloudy", "snow", "天气", "下雨", "晴天", "气温"],
+    "情绪": ["happy", "sad", "angry", "love", "hate", "开心", "难过", "生气", "喜欢"],
+    "工作": ["work", "job", "office", "meeting", "boss", "工作", "会议", "老板", "加班"],
+    "产品": ["product", "price", "quality", "service", "buy", "产品", "价格", "质量", "服务"],
+}
+
+def classify_text(doc, categories=None):
+    """
+    基于关键词表的文本分类,返回命中关键词最多的类别,没有命中时返回"其他"
+    """
+    if doc is None:
+        return "其他"
+    categories = categories or DEFAULT_CATEGORIES
+    words = set()
+    for token in doc:
+        words.add(token.text.lower())
+        words.add(token.lemma_.lower())
+    best_category, best_count = "其他", 0
+    for category, keywords in categories.items():
+        count = sum(1 for keyword in keywords if keyword.lower() in words)
+        if count > best_count:
+            best_category, best_count = category, count
+    return best_category
+
 def test_data_process():
     # 测试正常文本
     text1 = "This is a test sentence with some stopwords."
@@ -138,5 +245,60 @@ def test_data_process():
     assert data_process(text8) == None, f"Test case 8 failed, expect {None} but get {data_process(text8)}"
 
     print("All test cases passed!")
-# 调用测试函数
-test_data_process()
\ No newline at end of file
+
+class _FailingPipe:
+    """测试用:单条解析正常,批量解析总是出错的模型"""
+    def __init__(self, nlp):
+        self.nlp = nlp
+    def __call__(self, text):
+        return self.nlp(text)
+    def pipe(self, texts, batch_size=None):
+        raise RuntimeError("pipe failed")
+
+def test_process_docs():
+    global nlp_en
+    texts = ["This is a test sentence with some stopwords.", "", "这是一个测试",
+             "This is a test.\n sentence!", "Test sentence example"]
+    expected = [data_process(text) for text in texts]
+
+    # 批量结果与逐条 data_process 一致,顺序不变
+    processed, docs = process_docs(texts, batch_size=2)
+    assert processed == expected, f"process_docs failed, expect {expected} but get {processed}"
+    assert docs[1] is None and all(doc is not None for i, doc in enumerate(docs) if i != 1)
+
+    # 英文批量解析出错时逐条处理,中文不受影响
+    original = nlp_en
+    nlp_en = _FailingPipe(original)
+    try:
+        processed, docs = process_docs(texts, batch_size=2)
+    finally:
+        nlp_en = original
+    assert processed == expected, f"process_docs fallback failed, expect {expected} but get {processed}"
+    assert docs[2] is not None and docs[0] is None
+
+    print("process_docs test cases passed!")
+
+def test_extract_keywords():
+    doc = nlp_en("The weather is sunny. Sunny weather makes people happy.")
+    keywords = extract_keywords(doc, top_n=2)
+    assert set(keywords) == {"weather", "sunny"}, f"extract_keywords failed, get {keywords}"
+    assert len(extract_keywords(doc, top_n=10)) > 2
+    assert "天气" in extract_keywords(nlp_zh("今天天气很好，明天天气也不错"))
+    assert extract_keywords(None) == []
+    print("extract_keywords test cases passed!")
+
+def test_classify_text():
+    assert classify_text(nlp_en("It is raining and the weather is cloudy")) == "天气"
+    assert classify_text(nlp_en("The meeting with my boss ran late at the office")) == "工作"
+    assert classify_text(nlp_zh("这个产品的价格和质量都很好")) == "产品"
+    assert classify_text(nlp_en("Completely unrelated sentence")) == "其他"
+    assert classify_text(nlp_en("I play football"), {"体育": ["football"]}) == "体育"
+    assert classify_text(None) == "其他"
+    print("classify_text test cases passed!")
+
+# 调用测试函数(只在直接运行本文件时执行,避免导入时加载测试)
+if __name__ == '__main__':
+    test_data_process()
+    test_process_docs()
+    test_extract_keywords()
+    test_classify_text()
\ No newline at end of file
@@ -90,6 +90,51 @@ def read_csv_file(file_path,delimiter=',',quotechar='"'):
     except Exception as e:
         print(f"读取文件发生错误：{e}")
         return None
+def iter_csv_batches(file_path,batch_size=1000,delimiter=',',quotechar='"'):
+    """
+    按批读取csv文件,每次返回 batch_size 行的列表,内存占用与文件大小无关
+    args:
+      file_path (str): 文件路径
+      batch_size (int): 每批的行数
+      delimiter (str, optional): 分隔符，默认为逗号 (,)。
+      quotechar (str, optional): 引号字符，默认为双引号 (").
+    yields:
+      list:一批行(第一批的第一行是表头)
+    """
+    with open(file_path,'r',encoding='utf-8',newline='') as file:
+        reader=csv.reader(file,delimiter=delimiter,quotechar=quotechar)
+        batch=[]
+        for row in reader:
+            batch.append(row)
+            if len(batch)>=batch_size:
+                yield batch
+                batch=[]
+        if batch:
+            yield batch
+def write_csv_batches(file_path,batches,headers=None,delimiter=',',quotechar='"'):
+    """
+    逐批写入csv文件,每处理完一批就写出一批
+    Args:
+      file_path (str): 文件路径。
+      batches (iterable): 每个元素是一批需要写入的行
+      headers (list, optional): CSV 文件的表头
+    Returns:
+      int or None:写入的行数,写入失败返回None
+    """
+    try :
+        count=0
+        with open(file_path,'w',encoding='utf-8',newline='') as file:
+            writer=csv.writer(file,delimiter=delimiter,quotechar=quotechar)
+            if headers:
+                writer.writerow(headers)
+            for rows in batches:
+                writer.writerows(rows)
+                count+=len(rows)
+        print(f"内容写入文件：'{file_path}'成功,共{count}行")
+        return count
+    except Exception as e:
+        print(f'写入文件发生错误： {e}')
+        return None
 def write_csv_file(file_path,data,headers=None,delimiter=',',quotechar='"'):
     """
       将数据写入指定路径的 CSV 文件。
@@ -1,8 +1,12 @@
-from file_handler import read_file ,read_csv_file,write_csv_file
+from file_handler import read_file ,read_csv_file,write_csv_file,read_json_file
 from file_handler import wirte_file,read_file_readline,read_file_readlines
-from data_processor import filter_characters,parse_numbers,data_process,parse_date
-from ai_model import analyze_sentiment
+from file_handler import iter_csv_batches,write_csv_batches
+from data_processor import filter_characters,parse_numbers,data_process
+from data_processor import process_docs,extract_keywords,classify_text
+from ai_model import analyze_sentiments
 import argparse
+import itertools
+import os
 # def main():
     
 #     # wirte_file('output_w_.txt','你好 world\n',mode='w')
@@ -58,6 +62,37 @@ import argparse
 #         wirte_file("process_data.txt",process_content)
 #     else:
 #         print("无法读取新文件，无法进行数据处理")
+# 每个操作在输出文件中新增的列名
+OPERATION_HEADERS={'sentiment':'sentiment','keywords':'keywords','classify':'category'}
+
+def process_batches(batches,operation,batch_size=1000,categories=None):
+    """
+    逐批处理csv行:每批的文本列一次性送入 nlp.pipe,处理完一批就交出一批,
+    不会把整个文件留在内存中
+    """
+    for rows in batches:
+        valid_rows=[]
+        for line in rows:
+            if len(line)>=2:
+                valid_rows.append(line)
+            else:
+                print(f'跳过数据格式不正确的行：{line}')#打印数据格式不正确的行
+        if not valid_rows:
+            continue
+        processed_texts,docs=process_docs([line[1] for line in valid_rows],batch_size=batch_size)
+        texts=[filter_characters(text,"!@#$%^&*()_+=-`~") for text in processed_texts]
+        #整批一起打分,重复的句子只算一次
+        sentiments=analyze_sentiments(texts) if operation=="sentiment" else None
+        for index,(line,text,doc) in enumerate(zip(valid_rows,texts,docs)):
+            line[1]=text
+            if operation=="sentiment":
+                line.append(str(sentiments[index]))#添加情感得分
+            elif operation=="keywords":
+                line.append(' '.join(extract_keywords(doc)))
+            elif operation=='classify':
+                line.append(classify_text(doc,categories))
+        yield valid_rows
+
 def main():
     # file_path=r'E:\my_ai_file_project\csv_data.csv'
     # delimiter=';'#set new delimiter
@@ -68,32 +103,25 @@ def main():
     parser.add_argument("-q", "--quotechar", type=str, default='"', help="CSV文件的引号字符")
     parser.add_argument("-op","--operation",type=str,default='sentiment',choices=['sentiment','keywords','classify'],help='选择操作类型')
     parser.add_argument("-o","--output",type=str,default='process_file_data.csv',help='输出文件路径')
+    parser.add_argument("-b","--batch-size",type=int,default=1000,help='每批处理的行数')
+    parser.add_argument("-c","--categories",type=str,default=None,help='分类关键词表(json文件,格式为 {类别: [关键词,...]})')
     args=parser.parse_args()
     file_path=args.file
     delimiter=args.delimiter
     quotechar=args.quotechar
     output_file=args.output
-    csv_lines=read_csv_file(file_path,delimiter=delimiter,quotechar=quotechar)
-    if csv_lines:
-        process_lines=[]
-        headers=csv_lines[0]
-        for line in csv_lines[1:]:#跳过表头
-            if len(line)>=2:
-                text=line[1]
-                line[1]=data_process(line[1])
-                line[1]=filter_characters(line[1],"!@#$%^&*()_+=-`~")
-                if args.operation=="sentiment":
-                    sentiment_scores=analyze_sentiment(line[1])
-                    line.append(str(sentiment_scores))#添加情感得分
-                elif args.operation=="keywords":
-                    line.append(f'keywords analysis is not inplemented yet')
-                elif args.operation=='classify':
-                    line.append(f"text classification is not inplemented yet")
-                process_lines.append(line)
-            else:
-                print(f'跳过数据格式不正确的行：{line}')#打印数据格式不正确的行
-        headers.append("sentiement")#添加新的表头
-        write_csv_file("process_file_data.csv",process_lines,headers,delimiter=delimiter,quotechar=quotechar)
+    if not os.path.isfile(file_path):
+        print(f"错误：文件'{file_path}'未找到。")
+        return
+    categories=read_json_file(args.categories) if args.categories else None
+    batches=iter_csv_batches(file_path,batch_size=args.batch_size,delimiter=delimiter,quotechar=quotechar)
+    first_batch=next(batches,None)
+    if first_batch:
+        headers=first_batch[0]
+        headers.append(OPERATION_HEADERS[args.operation])#添加新的表头
+        rows=itertools.chain([first_batch[1:]],batches)#跳过表头
+        write_csv_batches(output_file,process_batches(rows,args.operation,args.batch_size,categories),
+                          headers,delimiter=delimiter,quotechar=quotechar)
     else:
         print(f'无法读取文件,无法进行数据处理')
 
@@ -0,0 +1,209 @@
+"""
+异步批量输出写入模块
+
+处理线程把输出交给 AsyncOutputWriter 后立即返回，由后台写入线程统一落盘：
+已创建的目录被缓存，一批内对同一文件的多次写入合并为一次，每个文件先写入
+同目录下的临时文件再原子重命名，不会留下写了一半的输出；可选按批 fsync。
+"""
+import logging
+import os
+import queue
+import threading
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# fsync 策略
+FSYNC_NONE = "none"      # 不主动 fsync，由操作系统决定落盘时机
+FSYNC_BATCH = "batch"    # 每批写完后统一 fsync 文件，重命名后每个目录 fsync 一次
+FSYNC_MODES = (FSYNC_NONE, FSYNC_BATCH)
+
+_CLOSE = object()
+
+
+class AsyncOutputWriter:
+    """后台批量写入输出文件"""
+
+    def __init__(self, batch_size: int = 64, fsync: str = FSYNC_NONE,
+                 encoding: str = 'utf-8'):
+        if fsync not in FSYNC_MODES:
+            raise ValueError(f"无效的 fsync 策略: {fsync}")
+        self.batch_size = max(1, batch_size)
+        self.fsync = fsync
+        self.encoding = encoding
+        self._queue: "queue.Queue" = queue.Queue()
+        self._created_dirs = set()
+        self._temp_counter = 0
+        self._lock = threading.Lock()
+        self._stats = {"files": 0, "bytes": 0, "batches": 0, "coalesced": 0, "errors": 0}
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, file_path: Union[str, Path], content: str, mode: str = 'w') -> Future:
+        """提交一次写入，不等待落盘；返回的 Future 在提交完成后得到 True/False"""
+        if mode not in ('w', 'a'):
+            raise ValueError(f"不支持的写入模式: {mode}")
+        if self._closed:
+            raise RuntimeError("写入器已关闭")
+        future = Future()
+        self._queue.put((Path(file_path), content, mode, future))
+        return future
+
+    def flush(self) -> None:
+        """等待已提交的写入全部完成"""
+        marker = Future()
+        self._queue.put(marker)
+        marker.result()
+
+    def close(self) -> None:
+        """写完剩余内容并停止后台线程"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_CLOSE)
+        self._thread.join()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _run(self) -> None:
+        """后台线程：每次取出一批写入请求一起处理"""
+        while True:
+            item = self._queue.get()
+            batch = []
+            markers = []
+            closing = False
+            while True:
+                if item is _CLOSE:
+                    closing = True
+                elif isinstance(item, Future):
+                    markers.append(item)
+                else:
+                    batch.append(item)
+                if closing or len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            for marker in markers:
+                marker.set_result(True)
+            if closing:
+                return
+
+    def _write_batch(self, batch: List[Tuple[Path, str, str, Future]]) -> None:
+        """合并同一文件的写入，写临时文件、按需 fsync、再原子重命名"""
+        # 同一文件：覆盖写只保留最后一次，之后的追加内容拼接到一起
+        merged: Dict[Path, Tuple[str, List[str], List[Future]]] = {}
+        for file_path, content, mode, future in batch:
+            if file_path in merged:
+                previous_mode, parts, futures = merged[file_path]
+                if mode == 'w':
+                    merged[file_path] = ('w', [content], futures + [future])
+                else:
+                    parts.append(content)
+                    futures.append(future)
+                with self._lock:
+                    self._stats["coalesced"] += 1
+            else:
+                merged[file_path] = (mode, [content], [future])
+
+        pending = []  # (临时文件, 目标文件, futures, 字节数)
+        for file_path, (mode, parts, futures) in merged.items():
+            temp_path = None
+            try:
+                data = ''.join(parts).encode(self.encoding)
+                self._ensure_dir(file_path.parent)
+                if mode == 'a':
+                    # 追加写无法通过重命名实现原子性，直接追加
+                    with open(file_path, 'ab') as f:
+                        f.write(data)
+                        if self.fsync == FSYNC_BATCH:
+                            f.flush()
+                            os.fsync(f.fileno())
+                    self._finish(futures, True, len(data))
+                    continue
+
+                temp_path = self._temp_path(file_path)
+                with open(temp_path, 'wb') as f:
+                    f.write(data)
+                    if self.fsync == FSYNC_BATCH:
+                        f.flush()
+                        os.fsync(f.fileno())
+                pending.append((temp_path, file_path, futures, len(data)))
+            except Exception as e:
+                logger.error(f"写入文件失败 {file_path}: {e}")
+                if temp_path is not None:
+                    _remove_quietly(temp_path)
+                self._finish(futures, False, 0)
+
+        synced_dirs = set()
+        for temp_path, file_path, futures, size in pending:
+            try:
+                os.replace(temp_path, file_path)
+                synced_dirs.add(file_path.parent)
+                logger.debug(f"文件写入成功: {file_path}")
+                self._finish(futures, True, size)
+            except OSError as e:
+                logger.error(f"写入文件失败 {file_path}: {e}")
+                _remove_quietly(temp_path)
+                self._finish(futures, False, 0)
+
+        if self.fsync == FSYNC_BATCH:
+            # 每个目录只 fsync 一次，使本批的重命名持久化
+            for directory in synced_dirs:
+                _fsync_dir(directory)
+
+        with self._lock:
+            self._stats["batches"] += 1
+
+    def _ensure_dir(self, directory: Path) -> None:
+        """创建目录（已创建过的目录不再重复 mkdir）"""
+        if directory in self._created_dirs:
+            return
+        directory.mkdir(parents=True, exist_ok=True)
+        self._created_dirs.add(directory)
+
+    def _temp_path(self, file_path: Path) -> Path:
+        """同一目录下的临时文件，保证重命名不跨文件系统"""
+        self._temp_counter += 1
+        return file_path.with_name(f".{file_path.name}.{os.getpid()}.{self._temp_counter}.tmp")
+
+    def _finish(self, futures: List[Future], success: bool, size: int) -> None:
+        with self._lock:
+            if success:
+                self._stats["files"] += 1
+                self._stats["bytes"] += size
+            else:
+                self._stats["errors"] += 1
+        for future in futures:
+            future.set_result(success)
+
+
+def _remove_quietly(path: Path) -> None:
+    """删除写入失败留下的临时文件（文件不存在或删除失败时忽略）"""
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _fsync_dir(directory: Path) -> None:
+    """fsync 目录（不支持目录 fsync 的平台上忽略）"""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,117 @@
+"""
+PDF 文本提取模块
+
+大 PDF 按页码区间拆分到进程池中并行提取，结果按页序以生成器方式流出，
+下游的 NLP 处理可以在最后一页提取完成之前就开始。支持 max_pages 和
+页码区间，用于预览。
+"""
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# 少于该页数的 PDF 直接在当前进程中提取，避免进程池启动开销
+PARALLEL_MIN_PAGES = 16
+
+
+# 工作进程中已打开的 PDF（由进程池的 initializer 打开，每个工作进程只解析一次文件结构）
+_worker_reader = None
+
+
+def _extract_pages(reader, file_path: str, start: int, stop: int) -> List[str]:
+    """提取 [start, stop) 页的文本"""
+    texts = []
+    for index in range(start, stop):
+        try:
+            texts.append(reader.pages[index].extract_text() or "")
+        except Exception as e:
+            logger.warning(f"提取第 {index + 1} 页失败 {file_path}: {e}")
+            texts.append("")
+    return texts
+
+
+def _open_worker_reader(file_path: str) -> None:
+    """进程池 initializer：在工作进程中打开 PDF"""
+    global _worker_reader
+    from PyPDF2 import PdfReader
+
+    _worker_reader = PdfReader(file_path)
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """进程池任务：用工作进程中已打开的 PDF 提取 [start, stop) 页的文本"""
+    return _extract_pages(_worker_reader, file_path, start, stop)
+
+
+def resolve_page_range(page_count: int, max_pages: Optional[int] = None,
+                       page_range: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+    """把页码区间（从1开始，含两端）和 max_pages 换算为 [start, stop) 下标"""
+    start, stop = 0, page_count
+    if page_range:
+        start = max(page_range[0] - 1, 0)
+        stop = min(page_range[1], page_count)
+    if max_pages is not None:
+        stop = min(stop, start + max_pages)
+    return start, max(start, stop)
+
+
+def parse_page_range(value: str) -> Tuple[int, int]:
+    """解析 "5-20" 或 "5" 形式的页码区间"""
+    parts = value.split('-', 1)
+    first = int(parts[0])
+    last = int(parts[1]) if len(parts) > 1 and parts[1] else first
+    if first < 1 or last < first:
+        raise ValueError(f"无效的页码区间: {value}")
+    return first, last
+
+
+def iter_pdf_pages(file_path: Union[str, Path], max_pages: Optional[int] = None,
+                   page_range: Optional[Tuple[int, int]] = None,
+                   workers: Optional[int] = None) -> Iterator[str]:
+    """按页序逐页返回 PDF 文本（空白页跳过）
+
+    页数不少于 PARALLEL_MIN_PAGES 且 workers > 1 时，页码区间被拆成若干段
+    提交给进程池；按顺序等待各段结果，前面的段完成即可开始产出，
+    后面的段在后台继续提取。每个工作进程在启动时打开一次 PDF（解析交叉
+    引用表等文件结构），之后的各段复用它，而不是每段重新解析整个文件。
+    """
+    from PyPDF2 import PdfReader
+
+    file_path = str(file_path)
+    reader = PdfReader(file_path)
+    page_count = len(reader.pages)
+    start, stop = resolve_page_range(page_count, max_pages, page_range)
+    total = stop - start
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if total < PARALLEL_MIN_PAGES or workers <= 1:
+        for text in _extract_pages(reader, file_path, start, stop):
+            if text.strip():
+                yield text
+        return
+
+    # 每个工作进程分到多段，使先完成的段尽早流出
+    pages_per_task = max(1, total // (workers * 4))
+    ranges = [(page, min(page + pages_per_task, stop))
+              for page in range(start, stop, pages_per_task)]
+
+    executor = ProcessPoolExecutor(max_workers=min(workers, len(ranges)),
+                                   initializer=_open_worker_reader, initargs=(file_path,))
+    futures = []
+    try:
+        futures = [executor.submit(_extract_page_range, file_path, first, last)
+                   for first, last in ranges]
+        for future in futures:
+            for text in future.result():
+                if text.strip():
+                    yield text
+    finally:
+        # 调用方提前停止迭代时取消尚未开始的任务（shutdown 的 cancel_futures 需要 Python 3.9）
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
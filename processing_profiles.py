@@ -0,0 +1,111 @@
+"""
+处理配置档模块
+
+配置档决定 AdvancedTextProcessor 运行哪些处理阶段（词形还原、实体识别、
+情感分析），并据此只加载需要的 spaCy 组件：用不到的组件在 spacy.load 时
+直接排除；只需要句子边界时，用基于规则的 sentencizer 代替依存句法分析器。
+配置档定义在 nlp.profiles 中，默认使用 nlp.profile 指定的配置档。
+"""
+import logging
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Dict, List, Optional, Set
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# 可以开关的处理阶段
+STAGES = ("lemmas", "entities", "sentiment")
+
+# 句子边界来源：parser 使用依存句法分析器，sentencizer 使用标点规则
+SENTENCE_SOURCES = ("parser", "sentencizer")
+
+# 标准 spaCy 流水线中由配置档决定是否加载的组件，其余组件（自定义组件等）不受影响
+MANAGED_COMPONENTS = ("tok2vec", "tagger", "morphologizer", "attribute_ruler",
+                      "lemmatizer", "parser", "senter", "ner")
+
+# 各阶段需要的组件（英文词形还原依赖词性标注）
+_STAGE_COMPONENTS = {
+    "lemmas": {"tagger", "morphologizer", "attribute_ruler", "lemmatizer"},
+    "entities": {"ner"},
+}
+
+# 使用共享 tok2vec 的统计组件
+_LISTENER_COMPONENTS = {"tagger", "morphologizer", "parser", "ner"}
+
+
+@dataclass(frozen=True)
+class ProcessingProfile:
+    """一个处理配置档"""
+    name: str
+    lemmas: bool = True
+    entities: bool = True
+    sentiment: bool = True
+    sentences: str = "parser"
+
+    def __post_init__(self):
+        if self.sentences not in SENTENCE_SOURCES:
+            raise ValueError(f"无效的句子边界来源: {self.sentences}")
+
+    @classmethod
+    def from_config(cls, name: str, options: Dict[str, Any]) -> "ProcessingProfile":
+        """由 nlp.profiles 中的一项创建"""
+        unknown = set(options) - set(STAGES) - {"sentences"}
+        if unknown:
+            logger.warning(f"配置档 {name} 中有未知选项: {sorted(unknown)}")
+        return cls(name=name, **{key: value for key, value in options.items()
+                                 if key not in unknown})
+
+    def without(self, *stages: str) -> "ProcessingProfile":
+        """返回关闭指定阶段后的配置档（例如 GUI 中取消勾选的阶段）"""
+        for stage in stages:
+            if stage not in STAGES:
+                raise ValueError(f"未知的处理阶段: {stage}")
+        if not any(getattr(self, stage) for stage in stages):
+            return self
+        return replace(self, **{stage: False for stage in stages})
+
+    def required_components(self) -> Set[str]:
+        """需要加载的 spaCy 组件"""
+        components = set()
+        for stage, names in _STAGE_COMPONENTS.items():
+            if getattr(self, stage):
+                components |= names
+        if self.sentences == "parser":
+            components.add("parser")
+        if components & _LISTENER_COMPONENTS:
+            components.add("tok2vec")
+        return components
+
+    def excluded_components(self) -> List[str]:
+        """传给 spacy.load(exclude=...) 的组件"""
+        required = self.required_components()
+        return [name for name in MANAGED_COMPONENTS if name not in required]
+
+    @property
+    def pipeline_key(self) -> str:
+        """组件组合的标识；组件需求相同的配置档共用同一个已加载的模型"""
+        return ",".join(sorted(self.required_components())) + f"|{self.sentences}"
+
+    def configure(self, nlp):
+        """在已加载的模型上补充 sentencizer（没有 parser 时提供句子边界）"""
+        if self.sentences == "sentencizer" and "sentencizer" not in nlp.pipe_names:
+            nlp.add_pipe("sentencizer", first=True)
+        return nlp
+
+    def as_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def profile_names() -> List[str]:
+    """配置中定义的所有配置档名称"""
+    return list(config.get('nlp.profiles', {}))
+
+
+def get_profile(name: Optional[str] = None) -> ProcessingProfile:
+    """按名称获取配置档，name 为空时使用 nlp.profile"""
+    name = name or config.get('nlp.profile', 'full')
+    profiles = config.get('nlp.profiles', {})
+    if name not in profiles:
+        raise ValueError(f"未知的处理配置档: {name}（可用: {', '.join(profiles)}）")
+    return ProcessingProfile.from_config(name, profiles[name])
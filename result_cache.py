@@ -0,0 +1,182 @@
+"""
+处理结果缓存模块
+
+以“文件内容哈希 + 配置/模型版本指纹”为键，把序列化后的 ProcessingResult
+持久化到 SQLite 中。命中缓存时可以完全跳过读取和 NLP 处理。
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+
+from config import config
+from improved_data_processor import ProcessingResult
+
+logger = logging.getLogger(__name__)
+
+# 缓存格式版本，ProcessingResult 结构或计算方式变化时递增
+CACHE_SCHEMA_VERSION = 2
+
+# 影响处理结果的依赖包
+_VERSIONED_PACKAGES = ["spacy", "nltk", "langdetect"]
+
+
+def _package_version(name: str) -> str:
+    """获取已安装包的版本，不导入包本身"""
+    try:
+        from importlib.metadata import version, PackageNotFoundError
+    except ImportError:
+        return "unknown"
+
+    try:
+        return version(name)
+    except PackageNotFoundError:
+        return "missing"
+
+
+def build_fingerprint(extra: Optional[Dict[str, Any]] = None) -> str:
+    """根据NLP配置和模型版本生成指纹，任何一项变化都会使旧缓存失效
+
+    extra 用于加入其他影响结果的设置（例如 PDF 页码区间）。
+    """
+    model_names = sorted(config.get('nlp.models', {}).values())
+    packages = _VERSIONED_PACKAGES + model_names
+
+    payload = {
+        "schema": CACHE_SCHEMA_VERSION,
+        "nlp": config.get('nlp', {}),
+        "sentiment_weighting": config.get('sentiment.weighting', 'length'),
+        "sentiment_backend": config.get('sentiment.backend', 'vader'),
+        "versions": {name: _package_version(name) for name in packages},
+        "extra": extra or {},
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+class ResultCache:
+    """基于 SQLite 的处理结果缓存，按总大小做 LRU 淘汰"""
+
+    def __init__(self, path: Union[str, Path, None] = None,
+                 max_size_mb: Optional[float] = None,
+                 fingerprint: Optional[str] = None):
+        self.path = Path(path or config.get('cache.path', '.cache/results.sqlite3'))
+        self.max_size = int((max_size_mb or config.get('cache.max_size_mb', 512)) * 1024 * 1024)
+        self.fingerprint = fingerprint or build_fingerprint()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_results_last_access ON results (last_access)"
+        )
+        self._conn.commit()
+        self._total_size = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM results"
+        ).fetchone()[0]
+
+    def make_key(self, content_hash: str) -> str:
+        """由内容哈希和指纹组成缓存键"""
+        return f"{content_hash}:{self.fingerprint}"
+
+    def get(self, key: str) -> Optional[ProcessingResult]:
+        """读取缓存结果，未命中时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload FROM results WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE results SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        try:
+            data = json.loads(zlib.decompress(row[0]).decode('utf-8'))
+            result = ProcessingResult(**data)
+        except Exception as e:
+            logger.warning(f"缓存条目损坏，已忽略: {e}")
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, result: ProcessingResult) -> None:
+        """写入缓存结果；带错误的结果不缓存，避免固化临时故障"""
+        if not isinstance(result, ProcessingResult) or result.errors:
+            return
+
+        payload = zlib.compress(
+            json.dumps(result.as_dict(), ensure_ascii=False).encode('utf-8')
+        )
+
+        with self._lock:
+            try:
+                old = self._conn.execute(
+                    "SELECT size FROM results WHERE key = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO results (key, payload, size, last_access) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key, payload, len(payload), time.time())
+                )
+                self._total_size += len(payload) - (old[0] if old else 0)
+                self._evict()
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"写入缓存失败: {e}")
+
+    def _evict(self) -> None:
+        """按最近访问时间淘汰最旧的条目，直到总大小不超过上限"""
+        while self._total_size > self.max_size:
+            rows = self._conn.execute(
+                "SELECT key, size FROM results ORDER BY last_access LIMIT 100"
+            ).fetchall()
+            if not rows:
+                self._total_size = 0
+                break
+
+            for key, size in rows:
+                self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+                self._total_size -= size
+                if self._total_size <= self.max_size:
+                    break
+
+    def stats(self) -> Dict[str, Any]:
+        """返回缓存统计信息"""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            return {
+                "cache_hits": self.hits,
+                "cache_misses": self.misses,
+                "cache_entries": entries,
+                "cache_size_bytes": self._total_size,
+            }
+
+    def close(self) -> None:
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,172 @@
+"""
+共享的分句情感分析引擎
+
+VADER 分析器创建时要加载整个词典，这里全进程只创建一个，所有线程共用
+（polarity_scores 不修改分析器状态）。长文本按句子切分后逐句打分，再按
+可配置的权重汇总，避免把整篇文档当作一句话处理；重复出现的句子（表格行、
+模板文本等）从有界的 LRU 缓存中取分数。批量接口先对所有文档的句子去重，
+只给缓存中没有的句子打分。backend 为 "numpy" 时未命中的句子交给
+vader_vectorized 一次向量化打分（需要 NumPy，缺失时回退到逐句 polarity_scores）。
+"""
+import logging
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# 句末标点后的空白、中文句末标点之后、换行处切分
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])|\s*\n\s*')
+
+SCORE_KEYS = ("neg", "neu", "pos", "compound")
+
+# 汇总方式：length 按句子长度加权平均，mean 等权平均，max 取情感最强烈的句子
+WEIGHTINGS = ("length", "mean", "max")
+
+# 打分后端：vader 逐句调用 polarity_scores，numpy 按批向量化计算
+BACKENDS = ("vader", "numpy")
+
+
+def split_sentences(text: str) -> List[str]:
+    """把文本切分为句子（去掉空句）"""
+    return [sentence.strip() for sentence in _SENTENCE_BREAK.split(text) if sentence.strip()]
+
+
+def _empty_scores() -> Dict[str, float]:
+    return {"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0}
+
+
+class SentimentEngine:
+    """线程安全的分句 VADER 情感分析"""
+
+    def __init__(self, weighting: str = "length", cache_size: int = 10000,
+                 backend: str = "vader"):
+        if weighting not in WEIGHTINGS:
+            raise ValueError(f"无效的情感汇总方式: {weighting}")
+        if backend not in BACKENDS:
+            raise ValueError(f"无效的情感打分后端: {backend}")
+        self.weighting = weighting
+        self.cache_size = cache_size
+        self.backend = backend
+        self._analyzer = None
+        self._vectorized = None
+        self._load_lock = threading.Lock()
+        self._cache: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_analyzer(self):
+        """返回共用的 SentimentIntensityAnalyzer，第一次调用时创建"""
+        if self._analyzer is None:
+            with self._load_lock:
+                if self._analyzer is None:
+                    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+                    try:
+                        analyzer = SentimentIntensityAnalyzer()
+                    except LookupError:
+                        # 只在本地缺少VADER词典时才下载
+                        import nltk
+                        nltk.download('vader_lexicon', quiet=True)
+                        analyzer = SentimentIntensityAnalyzer()
+                    logger.info("已加载 VADER 情感分析模型")
+                    self._analyzer = analyzer
+        return self._analyzer
+
+    def score(self, text: str) -> Dict[str, float]:
+        """分析单个文本的情感，返回 neg / neu / pos / compound"""
+        return self.score_many([text])[0]
+
+    def score_many(self, texts: List[str]) -> List[Dict[str, float]]:
+        """批量分析多个文本，句子在所有文本之间去重后一次打分"""
+        documents = [split_sentences(text or "") for text in texts]
+
+        scores = self._lookup({sentence for sentences in documents for sentence in sentences})
+        return [self._aggregate(sentences, scores) for sentences in documents]
+
+    def stats(self) -> Dict[str, int]:
+        with self._cache_lock:
+            return {"cache_hits": self.hits, "cache_misses": self.misses,
+                    "cached_sentences": len(self._cache)}
+
+    def _lookup(self, sentences) -> Dict[str, Dict[str, float]]:
+        """先查缓存，未命中的句子一起打分并放入缓存"""
+        found = {}
+        missing = []
+        with self._cache_lock:
+            for sentence in sentences:
+                cached = self._cache.get(sentence)
+                if cached is None:
+                    missing.append(sentence)
+                else:
+                    self._cache.move_to_end(sentence)
+                    found[sentence] = cached
+            self.hits += len(found)
+            self.misses += len(missing)
+
+        if missing:
+            scored = self._score_sentences(missing)
+            found.update(zip(missing, scored))
+            if self.cache_size > 0:
+                with self._cache_lock:
+                    for sentence, value in zip(missing, scored):
+                        self._cache[sentence] = value
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        return found
+
+    def _get_vectorized(self):
+        """返回向量化打分器，NumPy 不可用时改用逐句打分"""
+        if self._vectorized is None and self.backend == "numpy":
+            analyzer = self.get_analyzer()
+            with self._load_lock:
+                if self._vectorized is None and self.backend == "numpy":
+                    try:
+                        from vader_vectorized import VectorizedVader
+                    except ImportError as e:
+                        logger.warning(f"无法使用向量化情感打分，改为逐句打分: {e}")
+                        self.backend = "vader"
+                        return None
+                    self._vectorized = VectorizedVader.from_analyzer(analyzer)
+        return self._vectorized
+
+    def _score_sentences(self, sentences: List[str]) -> List[Dict[str, float]]:
+        """给一批句子打分"""
+        vectorized = self._get_vectorized()
+        if vectorized is not None:
+            return vectorized.polarity_scores_batch(sentences)
+        analyzer = self.get_analyzer()
+        return [analyzer.polarity_scores(sentence) for sentence in sentences]
+
+    def _aggregate(self, sentences: List[str],
+                   scores: Dict[str, Dict[str, float]]) -> Dict[str, float]:
+        """按 weighting 汇总各句分数"""
+        if not sentences:
+            return _empty_scores()
+        if len(sentences) == 1:
+            return dict(scores[sentences[0]])
+
+        if self.weighting == "max":
+            strongest = max(sentences, key=lambda sentence: abs(scores[sentence]["compound"]))
+            return dict(scores[strongest])
+
+        totals = _empty_scores()
+        total_weight = 0.0
+        for sentence in sentences:
+            weight = len(sentence) if self.weighting == "length" else 1.0
+            for key in SCORE_KEYS:
+                totals[key] += scores[sentence].get(key, 0.0) * weight
+            total_weight += weight
+        return {key: value / total_weight for key, value in totals.items()}
+
+
+# 全局情感分析引擎
+sentiment_engine = SentimentEngine(
+    weighting=config.get('sentiment.weighting', 'length'),
+    cache_size=config.get('sentiment.cache_size', 10000),
+    backend=config.get('sentiment.backend', 'vader')
+)
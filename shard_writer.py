@@ -0,0 +1,131 @@
+"""
+分片 JSONL 输出模块
+
+批量处理海量小文件时，不再为每个输入创建一个输出文件，而是把每个结果作为
+一行 JSON 追加到少量分片文件中。每个写入线程拥有自己的分片，写入时无需加锁；
+分片达到 max_bytes（未压缩字节数）后轮换到下一个，可选 gzip 压缩。
+分片写入期间使用 .tmp 后缀，关闭时才重命名为正式文件名，下游只会读到完整的分片。
+"""
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+logger = logging.getLogger(__name__)
+
+
+class _Shard:
+    """单个写入线程的当前分片"""
+
+    def __init__(self, path: Path, compress: bool):
+        self.path = path
+        self.temp_path = path.with_name(path.name + '.tmp')
+        self.file = gzip.open(self.temp_path, 'wb') if compress else open(self.temp_path, 'wb')
+        self.size = 0
+        self.records = 0
+
+    def close(self) -> None:
+        self.file.close()
+        os.replace(self.temp_path, self.path)
+
+
+class ShardedJsonlWriter:
+    """按写入线程分片、按大小轮换的 JSONL 写入器
+
+    分片文件名为 {prefix}-{运行标识}-{线程序号}-{分片序号}.jsonl[.gz]，
+    运行标识由创建时间、进程号和随机后缀组成，同一秒内（包括不同进程）
+    多次运行写入同一文件夹时也不会互相覆盖。
+    """
+
+    def __init__(self, output_folder: Union[str, Path], max_bytes: int = 256 * 1024 * 1024,
+                 compress: bool = False, prefix: str = "part"):
+        self.output_folder = Path(output_folder)
+        self.output_folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max(1, max_bytes)
+        self.compress = compress
+        self.prefix = prefix
+        self.run_id = f"{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._worker_count = 0
+        self._open_shards: List[_Shard] = []
+        self._finished: List[Path] = []
+        self._records = 0
+        self._errors = 0
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """把一条记录写入当前线程的分片"""
+        try:
+            line = (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8')
+            shard = self._current_shard()
+            shard.file.write(line)
+            shard.size += len(line)
+            shard.records += 1
+            if shard.size >= self.max_bytes:
+                self._rotate(shard)
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"写入分片失败: {e}")
+            with self._lock:
+                self._errors += 1
+            return False
+        with self._lock:
+            self._records += 1
+        return True
+
+    def close(self) -> List[Path]:
+        """关闭所有分片，返回已完成的分片路径"""
+        with self._lock:
+            shards, self._open_shards = self._open_shards, []
+        for shard in shards:
+            self._finish(shard)
+        with self._lock:
+            return sorted(self._finished)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"records": self._records, "errors": self._errors,
+                    "shards": len(self._finished) + len(self._open_shards)}
+
+    def _current_shard(self) -> _Shard:
+        """返回当前线程的分片；首次写入时分配线程序号，轮换后在下一次写入时新建分片"""
+        shard = getattr(self._local, 'shard', None)
+        if shard is not None:
+            return shard
+        if not hasattr(self._local, 'worker'):
+            with self._lock:
+                self._local.worker = self._worker_count
+                self._worker_count += 1
+            self._local.sequence = 0
+
+        suffix = '.jsonl.gz' if self.compress else '.jsonl'
+        name = f"{self.prefix}-{self.run_id}-{self._local.worker:03d}-{self._local.sequence:05d}{suffix}"
+        self._local.sequence += 1
+        shard = _Shard(self.output_folder / name, self.compress)
+        self._local.shard = shard
+        with self._lock:
+            self._open_shards.append(shard)
+        return shard
+
+    def _rotate(self, shard: _Shard) -> None:
+        """当前分片已满：关闭它，下一次写入时创建新分片（不会留下空分片）"""
+        self._local.shard = None
+        with self._lock:
+            self._open_shards.remove(shard)
+        self._finish(shard)
+
+    def _finish(self, shard: _Shard) -> None:
+        try:
+            shard.close()
+        except OSError as e:
+            logger.error(f"关闭分片失败 {shard.path}: {e}")
+            with self._lock:
+                self._errors += 1
+            return
+        logger.info(f"分片已完成: {shard.path} ({shard.records} 条记录)")
+        with self._lock:
+            self._finished.append(shard.path)
@@ -5,10 +5,12 @@
 import re
 import json
 import logging
-from typing import Dict, Any, List
-from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+from dataclasses import dataclass, field
 from datetime import datetime
 
+from text_extractors import extract_numbers, extract_dates, extract_numbers_and_dates
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -22,11 +24,14 @@ class SimpleProcessingResult:
     sentence_count: int
     numbers: List[float]
     dates: List[str]
+    sentiment: Dict[str, float] = field(default_factory=dict)
     
 class SimpleTextProcessor:
     """简化的文本处理器"""
     
-    def __init__(self):
+    def __init__(self, sentiment_engine=None):
+        # 可选的 sentiment_engine.SentimentEngine；不传时不做情感分析，保持零模型依赖
+        self.sentiment_engine = sentiment_engine
         self.stopwords_en = {
             'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your', 'yours',
             'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she', 'her', 'hers',
@@ -41,6 +46,23 @@ class SimpleTextProcessor:
     
     def process_text(self, text: str) -> SimpleProcessingResult:
         """处理文本"""
+        result = self._process(text)
+        if self.sentiment_engine is not None and result.word_count:
+            result.sentiment = self.sentiment_engine.score(text)
+        return result
+    
+    def process_texts(self, texts: List[str]) -> List[SimpleProcessingResult]:
+        """批量处理文本，情感分数一次批量计算"""
+        results = [self._process(text) for text in texts]
+        if self.sentiment_engine is not None:
+            scored = [index for index, result in enumerate(results) if result.word_count]
+            sentiments = self.sentiment_engine.score_many([texts[index] for index in scored])
+            for index, sentiment in zip(scored, sentiments):
+                results[index].sentiment = sentiment
+        return results
+    
+    def _process(self, text: Optional[str]) -> SimpleProcessingResult:
+        """统计、清洗和数据提取（不含情感分析）"""
         if not text or not text.strip():
             return self._create_empty_result(text)
         
@@ -57,9 +79,8 @@ class SimpleTextProcessor:
             # 处理文本
             processed_text = self._process_words(words, language)
             
-            # 提取数据
-            numbers = self._extract_numbers(text)
-            dates = self._extract_dates(text)
+            # 提取数据（单次扫描）
+            numbers, dates = extract_numbers_and_dates(text)
             
             return SimpleProcessingResult(
                 original_text=text,
@@ -122,55 +143,11 @@ class SimpleTextProcessor:
     
     def _extract_numbers(self, text: str) -> List[float]:
         """提取数字"""
-        numbers = []
-        
-        try:
-            # 匹配各种数字格式
-            patterns = [
-                r'\b\d+\.\d+\b',      # 小数
-                r'\b\d+\b',           # 整数
-                r'\b\d{1,3}(?:,\d{3})*(?:\.\d+)?\b',  # 带逗号的数字
-            ]
-            
-            for pattern in patterns:
-                matches = re.findall(pattern, text)
-                for match in matches:
-                    try:
-                        # 去除逗号
-                        cleaned_number = match.replace(',', '')
-                        numbers.append(float(cleaned_number))
-                    except ValueError:
-                        continue
-            
-            # 去重并排序
-            return sorted(list(set(numbers)))
-            
-        except Exception as e:
-            logger.error(f"提取数字失败: {e}")
-            return []
+        return extract_numbers(text)
     
     def _extract_dates(self, text: str) -> List[str]:
         """提取日期"""
-        dates = []
-        
-        try:
-            # 各种日期格式
-            date_patterns = [
-                r'\b\d{4}-\d{1,2}-\d{1,2}\b',           # YYYY-MM-DD
-                r'\b\d{1,2}/\d{1,2}/\d{4}\b',           # MM/DD/YYYY
-                r'\b\d{1,2}-\d{1,2}-\d{4}\b',           # MM-DD-YYYY
-                r'\b\d{4}年\d{1,2}月\d{1,2}日\b',        # 中文日期
-            ]
-            
-            for pattern in date_patterns:
-                matches = re.findall(pattern, text)
-                dates.extend(matches)
-            
-            return list(set(dates))  # 去重
-            
-        except Exception as e:
-            logger.error(f"提取日期失败: {e}")
-            return []
+        return extract_dates(text)
 
 class SimpleResultFormatter:
     """简化的结果格式化器"""
@@ -191,6 +168,9 @@ class SimpleResultFormatter:
         if result.dates:
             summary_parts.append(f"发现日期: {len(result.dates)}个 {result.dates}")
         
+        if result.sentiment:
+            summary_parts.append(f"情感倾向: {result.sentiment.get('compound', 0.0):.3f}")
+        
         summary_parts.append("\n处理后文本:")
         processed_preview = result.processed_text[:200] + "..." if len(result.processed_text) > 200 else result.processed_text
         summary_parts.append(processed_preview)
@@ -215,6 +195,8 @@ class SimpleResultFormatter:
             },
             "timestamp": datetime.now().isoformat()
         }
+        if result.sentiment:
+            data["sentiment"] = result.sentiment
         
         return json.dumps(data, ensure_ascii=False, indent=indent)
 
@@ -0,0 +1,190 @@
+"""
+分阶段流水线模块
+
+把批处理拆成若干阶段（例如 读取 → NLP → 写入），阶段之间用有界队列连接：
+下游处理不过来时上游在 put 上阻塞（背压），每个阶段有独立的并发数。
+ByteBudget 限制在途数据的总字节数，防止大文件在队列中堆积占满内存。
+运行期间定期记录各队列深度，结束时返回各阶段的统计，用于判断瓶颈阶段。
+"""
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 阶段结束标记
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    """流水线阶段：func 把上游的项转换为下游的项，返回 None 表示丢弃"""
+    name: str
+    func: Callable[[Any], Any]
+    workers: int = 1
+
+
+class ByteBudget:
+    """在途字节预算
+
+    acquire 在预算不足时阻塞，直到其他项 release；单项超过总预算时按总预算
+    计，预算空闲时总能获得，避免大文件永久等待。
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.in_use = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        """占用 size 字节，返回实际计入的字节数（用于 release）"""
+        size = min(max(size, 0), self.capacity)
+        with self._cond:
+            while self.in_use and self.in_use + size > self.capacity:
+                self._cond.wait()
+            self.in_use += size
+            self.peak = max(self.peak, self.in_use)
+        return size
+
+    def release(self, size: int) -> None:
+        with self._cond:
+            self.in_use -= size
+            self._cond.notify_all()
+
+
+class StagePipeline:
+    """由有界队列连接的多阶段流水线"""
+
+    def __init__(self, stages: List[Stage], queue_size: int = 32,
+                 report_interval: Optional[float] = 5.0):
+        if not stages:
+            raise ValueError("流水线至少需要一个阶段")
+        self.stages = stages
+        self.queue_size = queue_size
+        self.report_interval = report_interval
+        self._queues = [queue.Queue(maxsize=queue_size) for _ in stages]
+        self._lock = threading.Lock()
+        self._stats = {stage.name: {"workers": stage.workers, "items": 0, "errors": 0,
+                                    "dropped": 0, "busy_seconds": 0.0}
+                       for stage in stages}
+        self._depth_samples = {stage.name: [] for stage in stages}
+        self._remaining_workers = [stage.workers for stage in stages]
+
+    def queue_depths(self) -> Dict[str, int]:
+        """各阶段输入队列的当前深度"""
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self._queues)}
+
+    def run(self, items: Iterable[Any],
+            on_output: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+        """运行流水线直到所有项处理完毕
+
+        最后一个阶段的返回值交给 on_output（在该阶段的工作线程中调用）。
+        返回各阶段的处理数、错误数、忙碌时间和队列深度统计。
+        """
+        start = time.perf_counter()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=self._worker, args=(index, on_output),
+                                          name=f"{stage.name}-{worker}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        stop_monitor = threading.Event()
+        monitor = None
+        if self.report_interval:
+            monitor = threading.Thread(target=self._monitor, args=(stop_monitor,),
+                                       name="pipeline-monitor", daemon=True)
+            monitor.start()
+
+        fed = 0
+        try:
+            # 第一个队列有界，扫描速度受下游处理速度约束
+            for item in items:
+                self._queues[0].put(item)
+                fed += 1
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._queues[0].put(_DONE)
+            for thread in threads:
+                thread.join()
+            stop_monitor.set()
+            if monitor is not None:
+                monitor.join()
+
+        elapsed = time.perf_counter() - start
+        return self._summary(fed, elapsed)
+
+    def _worker(self, index: int, on_output: Optional[Callable[[Any], None]]) -> None:
+        """阶段工作线程：从输入队列取项、处理、放入下一个队列"""
+        stage = self.stages[index]
+        stats = self._stats[stage.name]
+        in_queue = self._queues[index]
+        out_queue = self._queues[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = in_queue.get()
+            if item is _DONE:
+                break
+
+            began = time.perf_counter()
+            try:
+                result = stage.func(item)
+                failed = False
+            except Exception as e:
+                logger.error(f"流水线阶段 {stage.name} 处理失败: {e}")
+                result = None
+                failed = True
+            busy = time.perf_counter() - began
+
+            with self._lock:
+                stats["items"] += 1
+                stats["busy_seconds"] += busy
+                if failed:
+                    stats["errors"] += 1
+                elif result is None:
+                    stats["dropped"] += 1
+
+            if result is None:
+                continue
+            if out_queue is not None:
+                out_queue.put(result)
+            elif on_output is not None:
+                try:
+                    on_output(result)
+                except Exception as e:
+                    logger.error(f"流水线输出回调失败: {e}")
+
+        # 本阶段最后一个退出的线程通知下游阶段结束
+        with self._lock:
+            self._remaining_workers[index] -= 1
+            last = self._remaining_workers[index] == 0
+        if last and out_queue is not None:
+            for _ in range(self.stages[index + 1].workers):
+                out_queue.put(_DONE)
+
+    def _monitor(self, stop: threading.Event) -> None:
+        """定期采样并记录各队列深度"""
+        while not stop.wait(self.report_interval):
+            depths = self.queue_depths()
+            for name, depth in depths.items():
+                self._depth_samples[name].append(depth)
+            logger.info("队列深度: " + ", ".join(
+                f"{name} {depth}/{self.queue_size}" for name, depth in depths.items()))
+
+    def _summary(self, fed: int, elapsed: float) -> Dict[str, Any]:
+        """汇总各阶段统计；utilization 接近 1 的阶段是瓶颈"""
+        stages = {}
+        for stage in self.stages:
+            stats = dict(self._stats[stage.name])
+            samples = self._depth_samples[stage.name]
+            stats["queue_max"] = max(samples) if samples else 0
+            stats["queue_mean"] = sum(samples) / len(samples) if samples else 0.0
+            capacity = elapsed * stage.workers
+            stats["utilization"] = stats["busy_seconds"] / capacity if capacity else 0.0
+            stages[stage.name] = stats
+        return {"items": fed, "elapsed_seconds": elapsed, "stages": stages}
@@ -0,0 +1,171 @@
+"""
+结构化文件的带类型读取模块
+
+CSV、Excel 和 JSON 中的数字和日期单元格本来就带有类型，直接收集为数字
+和日期；只有自由文本单元格拼接为文本交给语言检测、spaCy 和情感分析。
+"""
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import date, datetime, time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Union
+
+from mmap_reader import read_text as read_mapped_text
+from text_extractors import classify_cell
+from xlsx_reader import XlsxWorkbook
+
+logger = logging.getLogger(__name__)
+
+# 支持带类型读取的文件格式
+STRUCTURED_FORMATS = {'.csv', '.json', '.xlsx', '.xls'}
+
+
+@dataclass
+class StructuredContent:
+    """结构化文件内容：自由文本与带类型的数字/日期分开保存"""
+    text: str
+    numbers: List[float] = field(default_factory=list)
+    dates: List[str] = field(default_factory=list)
+    typed_cells: int = 0
+    text_cells: int = 0
+
+
+class StructuredContentBuilder:
+    """逐个单元格收集结构化内容"""
+
+    def __init__(self):
+        self._lines: List[str] = []
+        self._row: List[str] = []
+        self._numbers = set()
+        self._dates: Dict[str, None] = {}
+        self.typed_cells = 0
+        self.text_cells = 0
+
+    def add(self, value: Any) -> None:
+        """按类型收集一个单元格的值"""
+        if value is None or isinstance(value, bool):
+            return
+        if isinstance(value, (int, float)):
+            self._numbers.add(float(value))
+            self.typed_cells += 1
+        elif isinstance(value, (datetime, date, time)):
+            self._dates.setdefault(_format_date(value), None)
+            self.typed_cells += 1
+        else:
+            value = str(value)
+            if not value.strip():
+                return
+            kind, parsed = classify_cell(value)
+            if kind == 'number':
+                self._numbers.add(parsed)
+                self.typed_cells += 1
+            elif kind == 'date':
+                self._dates.setdefault(parsed, None)
+                self.typed_cells += 1
+            else:
+                self._row.append(value)
+                self.text_cells += 1
+
+    def add_row(self, values: Iterable[Any]) -> None:
+        """收集一整行，行内文本单元格以空格连接为一行"""
+        for value in values:
+            self.add(value)
+        self.end_row()
+
+    def end_row(self) -> None:
+        if self._row:
+            self._lines.append(' '.join(self._row))
+            self._row = []
+
+    def build(self) -> StructuredContent:
+        self.end_row()
+        return StructuredContent(
+            text='\n'.join(self._lines),
+            numbers=sorted(self._numbers),
+            dates=list(self._dates),
+            typed_cells=self.typed_cells,
+            text_cells=self.text_cells,
+        )
+
+
+def _format_date(value: Union[datetime, date, time]) -> str:
+    """日期单元格格式化为 ISO 字符串（零点的日期时间只保留日期）"""
+    if isinstance(value, datetime):
+        if value.time() == time():
+            return value.date().isoformat()
+        return value.isoformat(sep=' ')
+    return value.isoformat()
+
+
+def read_csv_structured(file_path: Union[str, Path]) -> StructuredContent:
+    """带类型读取CSV文件"""
+    text, _ = read_mapped_text(file_path)
+    builder = StructuredContentBuilder()
+    for row in csv.reader(io.StringIO(text, newline='')):
+        builder.add_row(row)
+    return builder.build()
+
+
+def read_excel_structured(file_path: Union[str, Path]) -> StructuredContent:
+    """带类型读取Excel文件（.xlsx 直接解析XML，.xls 使用 openpyxl）"""
+    builder = StructuredContentBuilder()
+    if Path(file_path).suffix.lower() == '.xlsx':
+        with XlsxWorkbook(file_path) as workbook:
+            for sheet_name in workbook.sheet_names:
+                for row in workbook.iter_rows(sheet_name):
+                    builder.add_row(row)
+    else:
+        import openpyxl
+
+        workbook = openpyxl.load_workbook(str(file_path), read_only=True)
+        try:
+            for sheet_name in workbook.sheetnames:
+                for row in workbook[sheet_name].iter_rows(values_only=True):
+                    builder.add_row(row)
+        finally:
+            workbook.close()
+    return builder.build()
+
+
+def _add_json_value(builder: StructuredContentBuilder, value: Any) -> None:
+    """递归收集JSON值（只收集值，不收集键）；每个对象的标量值成为一行"""
+    if isinstance(value, dict):
+        nested = []
+        for item in value.values():
+            if isinstance(item, (dict, list)):
+                nested.append(item)
+            else:
+                builder.add(item)
+        builder.end_row()
+        for item in nested:
+            _add_json_value(builder, item)
+    elif isinstance(value, list):
+        for item in value:
+            _add_json_value(builder, item)
+        builder.end_row()
+    else:
+        builder.add(value)
+
+
+def read_json_structured(file_path: Union[str, Path]) -> StructuredContent:
+    """带类型读取JSON文件"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    builder = StructuredContentBuilder()
+    _add_json_value(builder, data)
+    return builder.build()
+
+
+def read_structured(file_path: Union[str, Path]) -> StructuredContent:
+    """按文件格式带类型读取结构化文件"""
+    suffix = Path(file_path).suffix.lower()
+    if suffix == '.csv':
+        return read_csv_structured(file_path)
+    if suffix == '.json':
+        return read_json_structured(file_path)
+    if suffix in ('.xlsx', '.xls'):
+        return read_excel_structured(file_path)
+    raise ValueError(f"不支持带类型读取的文件格式: {suffix}")
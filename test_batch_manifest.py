@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+测试增量批处理清单
+"""
+import hashlib
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from batch_manifest import BatchManifest
+
+
+def _hash(file_path):
+    return hashlib.sha256(Path(file_path).read_bytes()).hexdigest()
+
+
+def _scan(input_folder, output_folder):
+    files = sorted(input_folder.glob('*.txt'))
+    outputs = {f: output_folder / f"{f.stem}.processed.txt" for f in files}
+    return files, outputs
+
+
+def test_incremental_plan():
+    """测试新增、修改、touch 和删除文件的识别"""
+    print("测试增量清单...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_folder = Path(tmp_dir) / "input"
+        output_folder = Path(tmp_dir) / "output"
+        input_folder.mkdir()
+        output_folder.mkdir()
+
+        for name in ("a", "b", "c"):
+            (input_folder / f"{name}.txt").write_text(name, encoding='utf-8')
+
+        # 第一次运行：全部文件都需要处理
+        files, outputs = _scan(input_folder, output_folder)
+        manifest = BatchManifest.load(output_folder)
+        to_process, unchanged, deleted = manifest.plan(input_folder, files, outputs, _hash)
+        assert len(to_process) == 3 and unchanged == 0 and not deleted
+
+        for file_path in to_process:
+            outputs[file_path].write_text("result", encoding='utf-8')
+            manifest.record(input_folder, file_path, outputs[file_path], _hash(file_path))
+        manifest.save()
+        print("✓ 首次运行处理全部文件")
+
+        # 修改 a，touch b，删除 c
+        (input_folder / "a.txt").write_text("changed", encoding='utf-8')
+        os.utime(input_folder / "b.txt", ns=(0, 0))
+        (input_folder / "c.txt").unlink()
+
+        files, outputs = _scan(input_folder, output_folder)
+        manifest = BatchManifest.load(output_folder)
+        to_process, unchanged, deleted = manifest.plan(input_folder, files, outputs, _hash)
+        assert [p.name for p in to_process] == ["a.txt"]
+        assert unchanged == 1
+        assert deleted == ["c.txt"]
+
+        assert manifest.remove_deleted(deleted) == 1
+        assert not (output_folder / "c.processed.txt").exists()
+        print("✓ 只处理变化的文件并清理已删除输入的输出")
+
+
+def test_planned_hash_and_fingerprint():
+    """测试 record 复用 plan 时的哈希，以及处理配置指纹变化时全部重新处理"""
+    print("测试计划哈希和配置指纹...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_folder = Path(tmp_dir) / "input"
+        output_folder = Path(tmp_dir) / "output"
+        input_folder.mkdir()
+        output_folder.mkdir()
+        for name in ("a", "b"):
+            (input_folder / f"{name}.txt").write_text(name, encoding='utf-8')
+
+        hashed = []
+
+        def counting_hash(file_path):
+            hashed.append(Path(file_path).name)
+            return _hash(file_path)
+
+        files, outputs = _scan(input_folder, output_folder)
+        manifest = BatchManifest.load(output_folder, fingerprint="v1")
+        to_process, _, _ = manifest.plan(input_folder, files, outputs, counting_hash)
+        for file_path in to_process:
+            outputs[file_path].write_text("result", encoding='utf-8')
+            manifest.record(input_folder, file_path, outputs[file_path])
+        manifest.save()
+        # 每个文件只在 plan 时读取一次
+        assert sorted(hashed) == ["a.txt", "b.txt"]
+        assert manifest.entries["a.txt"]["sha256"] == _hash(input_folder / "a.txt")
+
+        # 指纹相同：没有需要处理的文件
+        manifest = BatchManifest.load(output_folder, fingerprint="v1")
+        to_process, unchanged, _ = manifest.plan(input_folder, files, outputs, _hash)
+        assert not to_process and unchanged == 2
+
+        # 指纹变化：全部重新处理，已删除的输入仍会被清理
+        (input_folder / "b.txt").unlink()
+        files, outputs = _scan(input_folder, output_folder)
+        manifest = BatchManifest.load(output_folder, fingerprint="v2")
+        assert manifest.stale
+        to_process, unchanged, deleted = manifest.plan(input_folder, files, outputs, _hash)
+        assert [p.name for p in to_process] == ["a.txt"] and unchanged == 0
+        assert deleted == ["b.txt"]
+
+        # 新指纹下处理完成后保存，下次运行不再重新处理
+        manifest.remove_deleted(deleted)
+        manifest.record(input_folder, to_process[0], outputs[to_process[0]])
+        manifest.save()
+        manifest = BatchManifest.load(output_folder, fingerprint="v2")
+        assert not manifest.stale
+        assert manifest.plan(input_folder, files, outputs, _hash)[0] == []
+    print("✓ 处理后不再读取文件，配置变化时重新处理")
+
+
+def test_shared_output_kept():
+    """测试删除的输入与仍存在的输入共用输出文件时不删除该输出"""
+    print("测试共用输出文件...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_folder = Path(tmp_dir) / "input"
+        output_folder = Path(tmp_dir) / "output"
+        output_folder.mkdir()
+        for sub in ("a", "b"):
+            (input_folder / sub).mkdir(parents=True)
+            (input_folder / sub / "x.txt").write_text(sub, encoding='utf-8')
+
+        def scan():
+            # 与 FileHandler._output_path 相同，输出按文件名平铺
+            files = sorted(input_folder.rglob('*.txt'))
+            return files, {f: output_folder / f"{f.stem}.processed.txt" for f in files}
+
+        files, outputs = scan()
+        manifest = BatchManifest.load(output_folder)
+        to_process, _, _ = manifest.plan(input_folder, files, outputs, _hash)
+        for file_path in to_process:
+            outputs[file_path].write_text(file_path.parent.name, encoding='utf-8')
+            manifest.record(input_folder, file_path, outputs[file_path])
+        manifest.save()
+
+        (input_folder / "a" / "x.txt").unlink()
+        files, outputs = scan()
+        manifest = BatchManifest.load(output_folder)
+        to_process, unchanged, deleted = manifest.plan(input_folder, files, outputs, _hash)
+        assert not to_process and unchanged == 1 and deleted == ["a/x.txt"]
+        assert manifest.remove_deleted(deleted) == 1
+        assert (output_folder / "x.processed.txt").exists()
+        assert "a/x.txt" not in manifest.entries and "b/x.txt" in manifest.entries
+    print("✓ 仍有输入使用的输出不会被删除")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 增量清单测试")
+    print("=" * 50)
+    test_incremental_plan()
+    test_planned_hash_and_fingerprint()
+    test_shared_output_kept()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+测试并发目录扫描
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from dir_scanner import scan_files
+
+
+def test_scan_tree():
+    """测试并行和串行扫描得到相同的文件集合"""
+    print("测试目录扫描...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        expected = set()
+        for i in range(5):
+            folder = root / f"d{i}" / "sub"
+            folder.mkdir(parents=True)
+            for name in ("a.txt", "b.csv"):
+                (folder / name).write_text("x", encoding='utf-8')
+                expected.add(str(folder / name))
+        (root / "top.json").write_text("{}", encoding='utf-8')
+        expected.add(str(root / "top.json"))
+        # 指向上级目录的符号链接不应导致无限递归
+        os.symlink(root, root / "d0" / "loop")
+
+        assert {entry.path for entry in scan_files(root, workers=4)} == expected
+        assert {entry.path for entry in scan_files(root, workers=1)} == expected
+        assert list(scan_files(root / "missing")) == []
+    print("✓ 并行扫描结果完整，符号链接目录不被跟随")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 目录扫描测试")
+    print("=" * 50)
+    test_scan_tree()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+测试 .docx 流式读取
+"""
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from docx_reader import iter_docx_blocks, read_docx_text
+
+W_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def build_document(path: Path) -> None:
+    """构造包含段落、修订、表格和嵌套表格的文档"""
+    body = (
+        '<w:p><w:r><w:t>第一段</w:t></w:r><w:r><w:t xml:space="preserve"> 继续</w:t></w:r></w:p>'
+        '<w:p/>'
+        '<w:p><w:r><w:t>A</w:t><w:tab/><w:t>B</w:t><w:br/><w:t>C</w:t></w:r>'
+        '<w:del><w:r><w:delText>已删除</w:delText></w:r></w:del></w:p>'
+        '<w:tbl>'
+        '<w:tr><w:tc><w:p><w:r><w:t>Name</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:p><w:r><w:t>Score</w:t></w:r></w:p></w:tc></w:tr>'
+        '<w:tr><w:tc><w:p><w:r><w:t>Alice</w:t></w:r></w:p><w:p><w:r><w:t>Bob</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:tbl><w:tr><w:tc><w:p><w:r><w:t>9</w:t></w:r></w:p></w:tc>'
+        '<w:tc><w:p><w:r><w:t>8</w:t></w:r></w:p></w:tc></w:tr></w:tbl></w:tc></w:tr>'
+        '</w:tbl>'
+        '<w:p><w:r><w:t>结尾</w:t></w:r></w:p>'
+    )
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("word/document.xml",
+                    f'<w:document {W_NS}><w:body>{body}<w:sectPr/></w:body></w:document>')
+
+
+def test_blocks_in_order():
+    """测试段落和表格行按文档顺序返回"""
+    print("测试Word文档读取...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "doc.docx"
+        build_document(path)
+        blocks = list(iter_docx_blocks(path))
+        text = read_docx_text(path)
+
+    assert blocks == [
+        "第一段 继续",
+        "A\tB\nC",
+        "Name\tScore",
+        "Alice\nBob\t9\t8",
+        "结尾",
+    ]
+    assert text == '\n'.join(blocks)
+    print("✓ 段落、表格行和嵌套表格按顺序提取，删除的修订文本被忽略")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - Word读取测试")
+    print("=" * 50)
+    test_blocks_in_order()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
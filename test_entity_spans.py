@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+测试紧凑的实体存储和处理结果
+"""
+import pickle
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from entity_spans import EntitySpans
+from improved_data_processor import ProcessingResult, ResultFormatter
+
+
+def test_entity_spans():
+    """测试实体按偏移量引用原文"""
+    print("测试实体存储...")
+
+    text = "Alice met Bob in Paris."
+    spans = EntitySpans(text)
+    spans.append("PERSON", 0, 5)
+    spans.append("PERSON", 10, 13)
+    spans.append("GPE", 17, 22)
+
+    assert len(spans) == 3
+    assert spans[1] == {"text": "Bob", "label": "PERSON", "start": 10, "end": 13}
+    assert spans.labels() == ["PERSON", "PERSON", "GPE"]
+    # 跨进程传递后标签和文本不变
+    assert pickle.loads(pickle.dumps(spans)) == spans
+
+    # 合并分块结果：不保留原文，实体文本单独保存
+    merged = EntitySpans()
+    merged.extend_shifted(spans, 100)
+    assert merged[2] == {"text": "Paris", "label": "GPE", "start": 117, "end": 122}
+    print("✓ 实体文本按偏移量从原文取出")
+
+
+def test_processing_result():
+    """测试处理结果的兼容构造和序列化"""
+    print("测试处理结果...")
+
+    text = "Alice lives in Paris."
+    result = ProcessingResult(
+        original_text=text, processed_text="alice live paris", language="en",
+        sentiment={}, numbers=[], dates=[],
+        entities=[{"text": "Alice", "label": "PERSON", "start": 0, "end": 5}],
+        statistics={}, errors=[]
+    )
+    assert isinstance(result.entities, EntitySpans)
+    assert not hasattr(result, "__dict__")
+
+    data = ResultFormatter.to_dict(result)
+    assert "original_text" not in data
+    assert data["entities"] == [{"text": "Alice", "label": "PERSON", "start": 0, "end": 5}]
+    assert ResultFormatter.to_dict(result, include_original_text=True)["original_text"] == text
+
+    # 缓存使用 as_dict 序列化并重建
+    assert ProcessingResult(**result.as_dict()) == result
+    print("✓ 默认不输出原文，实体序列化为字典列表")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 紧凑结果测试")
+    print("=" * 50)
+    test_entity_spans()
+    test_processing_result()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
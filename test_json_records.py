@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+测试 JSON / JSONL 记录流式读取
+"""
+import io
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from json_records import iter_batches, iter_json_array, iter_json_records, record_text
+
+
+def test_incremental_array():
+    """测试顶层数组在很小的读缓冲下增量解析"""
+    print("测试JSON数组增量解析...")
+
+    records = [{"id": i, "text": f"记录 {i}", "score": i * 1.5} for i in range(50)]
+    records += [12345, "plain", None, [1, 2]]
+    data = json.dumps(records, ensure_ascii=False, indent=1)
+
+    # 每次只读 7 个字符，元素和数字都会跨越缓冲区边界
+    assert list(iter_json_array(io.StringIO(data), read_chars=7)) == records
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+    for bad in ['{"a": 1}', '[1, 2', '[1 2]']:
+        try:
+            list(iter_json_array(io.StringIO(bad), read_chars=3))
+        except ValueError:
+            continue
+        raise AssertionError(f"应当拒绝: {bad}")
+    print("✓ 跨缓冲区的元素解析正确，非法输入被拒绝")
+
+
+def test_records_and_fields():
+    """测试 JSONL、records_path 和字段选择"""
+    print("测试记录和字段选择...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl = Path(tmp) / "data.jsonl"
+        jsonl.write_text('{"title": "A", "body": "good"}\n\nnot json\n{"title": "B"}\n',
+                         encoding='utf-8')
+        assert list(iter_json_records(jsonl)) == [{"title": "A", "body": "good"}, {"title": "B"}]
+
+        nested = Path(tmp) / "nested.json"
+        nested.write_text(json.dumps({"data": {"items": [{"t": 1}, {"t": 2}]}}), encoding='utf-8')
+        assert list(iter_json_records(nested, "data.items")) == [{"t": 1}, {"t": 2}]
+
+    record = {"title": "标题", "id": 7, "comments": [{"text": "第一条"}, {"text": " "}],
+              "meta": {"tags": ["x", "y"]}}
+    assert record_text(record, ["title", "comments.*.text"]) == "标题\n第一条"
+    assert record_text(record) == "标题\n第一条\nx\ny"
+    assert record_text(record, ["missing"]) == ""
+
+    assert list(iter_batches(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    print("✓ 记录读取、JSON路径和分批正确")
+
+
+def test_record_file_outputs():
+    """测试批量按记录处理时输出保留相对路径和原后缀"""
+    print("测试按记录处理的输出路径...")
+
+    from improved_main import FileProcessor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_folder = Path(tmp) / "input"
+        output_folder = Path(tmp) / "output"
+        (input_folder / "sub").mkdir(parents=True)
+        (input_folder / "a.json").write_text('[{"text": "one"}, {"text": "two"}]', encoding='utf-8')
+        (input_folder / "a.jsonl").write_text('{"text": "three"}\n', encoding='utf-8')
+        (input_folder / "sub" / "a.json").write_text('[{"text": "four"}]', encoding='utf-8')
+        (input_folder / "notes.txt").write_text("not a record file", encoding='utf-8')
+
+        stats = FileProcessor()._process_record_files(str(input_folder), str(output_folder))
+
+        assert stats == {"processed": 3, "errors": 0, "total": 3, "records": 4}
+        outputs = sorted(path.relative_to(output_folder).as_posix()
+                         for path in output_folder.rglob('*.jsonl'))
+        assert outputs == ["a.json.processed.jsonl", "a.jsonl.processed.jsonl",
+                           "sub/a.json.processed.jsonl"]
+        lines = (output_folder / "a.json.processed.jsonl").read_text(encoding='utf-8').splitlines()
+        assert [json.loads(line)["record_index"] for line in lines] == [0, 1]
+    print("✓ 同名的 JSON / JSONL 文件输出互不覆盖")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - JSON记录测试")
+    print("=" * 50)
+    test_incremental_array()
+    test_records_and_fields()
+    test_record_file_outputs()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+测试分层语言检测
+"""
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from language_detector import LanguageDetector, detect_by_script
+
+
+def test_script_layer():
+    """测试文字分布快速判断"""
+    print("测试文字分布判断...")
+
+    assert detect_by_script("Hello world! 123") == "en"
+    assert detect_by_script("这是一个中文测试，包含 some English") == "zh"
+    assert detect_by_script("これは日本語のテストです") == "ja"
+    assert detect_by_script("한국어 테스트입니다") == "ko"
+    # 带重音符号的拉丁文字无法仅凭文字分布判断
+    assert detect_by_script("Ça va très bien, merci") is None
+    print("✓ 纯ASCII和CJK文本由第一层直接判定")
+
+
+def test_cache_and_counters():
+    """测试LRU缓存和各层计数"""
+    print("测试缓存和计数...")
+
+    detector = LanguageDetector(cache_size=2)
+    assert detector.detect("") == "unknown"
+    assert detector.detect("Hello world") == "en"
+    assert detector.detect("Hello world") == "en"
+    assert detector.detect("中文文本") == "zh"
+    assert detector.detect("Another English text") == "en"
+    # 缓存容量为2，最早的样本已被淘汰
+    assert detector.detect("Hello world") == "en"
+
+    assert detector.stats() == {"cache": 1, "script": 4, "langdetect": 0}
+    print("✓ 缓存命中和各层计数正确")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 语言检测测试")
+    print("=" * 50)
+    test_script_layer()
+    test_cache_and_counters()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
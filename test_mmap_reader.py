@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+测试基于 mmap 的文本读取
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from mmap_reader import MappedTextFile, read_text, sniff_encoding
+
+SAMPLE_TEXT = "Hello world. Numbers: 123, 456.78.\n中文句子，测试编码。\n\n" * 500
+
+
+def test_sniff_encoding():
+    """测试编码嗅探"""
+    print("测试编码嗅探...")
+
+    assert sniff_encoding(SAMPLE_TEXT.encode('utf-8')) == ('utf-8', 0)
+    assert sniff_encoding(SAMPLE_TEXT.encode('utf-8-sig')) == ('utf-8', 3)
+    assert sniff_encoding(SAMPLE_TEXT.encode('gbk')) == ('gbk', 0)
+    assert sniff_encoding(SAMPLE_TEXT.encode('utf-16'))[0].startswith('utf-16')
+    assert sniff_encoding("café naïve".encode('cp1252')) == ('cp1252', 0)
+    # 以 ASCII 为主的 GBK 文件、繁体和扩展区汉字也按 GBK 识别
+    assert sniff_encoding(("report id=42 " * 200 + "备注：已完成").encode('gbk')) == ('gbk', 0)
+    assert sniff_encoding("繁體中文測試，資料處理與編碼識別。".encode('gbk')) == ('gbk', 0)
+    print("✓ BOM、UTF-8、GBK、cp1252 识别正确")
+
+
+def test_read_and_chunks():
+    """测试整体读取和分块读取结果一致"""
+    print("测试整体读取和分块读取...")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for encoding in ('utf-8', 'gbk', 'utf-16'):
+            file_path = Path(tmp_dir) / f"sample_{encoding}.txt"
+            file_path.write_text(SAMPLE_TEXT, encoding=encoding)
+
+            text, _ = read_text(file_path)
+            assert text == SAMPLE_TEXT
+
+            with MappedTextFile(file_path) as mapped:
+                chunks = list(mapped.iter_text_chunks(1000))
+            assert "".join(chunks) == SAMPLE_TEXT
+            assert len(chunks) > 1
+            # 分块优先落在段落边界
+            assert all(chunk.endswith("\n") for chunk in chunks)
+            print(f"✓ {encoding}: {len(chunks)} 个分块")
+
+        # 前缀是纯ASCII，后面才出现GBK中文
+        mixed_path = Path(tmp_dir) / "mixed.txt"
+        mixed_path.write_bytes(b"a" * 70000 + "中文".encode('gbk'))
+        text, encoding = read_text(mixed_path)
+        assert encoding == 'gbk' and text.endswith("中文")
+
+        traditional_path = Path(tmp_dir) / "traditional.txt"
+        traditional_text = "Order 1001: 顧客說明書與發票。\n" * 100
+        traditional_path.write_bytes(traditional_text.encode('gbk'))
+        assert read_text(traditional_path) == (traditional_text, 'gbk')
+        
+        empty_path = Path(tmp_dir) / "empty.txt"
+        empty_path.write_bytes(b"")
+        assert read_text(empty_path) == ("", "utf-8")
+        print("✓ 嗅探误判回退和空文件处理正确")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - mmap 读取测试")
+    print("=" * 50)
+    test_sniff_encoding()
+    test_read_and_chunks()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+测试异步批量输出写入
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from output_writer import AsyncOutputWriter
+
+
+def test_atomic_writes():
+    """测试写入、合并和原子重命名"""
+    print("测试异步写入...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = AsyncOutputWriter(batch_size=16, fsync="batch")
+        try:
+            futures = [writer.submit(Path(tmp) / "out" / f"{i}.txt", f"结果 {i}")
+                       for i in range(20)]
+            target = Path(tmp) / "out" / "log.txt"
+            writer.submit(target, "a\n")
+            writer.submit(target, "b\n", mode='a')
+            writer.flush()
+
+            assert all(future.result() for future in futures)
+            assert (Path(tmp) / "out" / "7.txt").read_text(encoding='utf-8') == "结果 7"
+            assert target.read_text(encoding='utf-8') == "a\nb\n"
+            # 不留下临时文件
+            assert not list((Path(tmp) / "out").glob(".*.tmp"))
+            stats = writer.stats()
+            assert stats["errors"] == 0
+            assert stats["files"] + stats["coalesced"] == 22
+        finally:
+            writer.close()
+    print("✓ 输出完整落盘，无临时文件残留")
+
+
+def test_write_failure():
+    """测试写入失败时 Future 返回 False"""
+    print("测试写入失败...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        blocker = Path(tmp) / "file"
+        blocker.write_text("x", encoding='utf-8')
+        writer = AsyncOutputWriter()
+        try:
+            future = writer.submit(blocker / "out.txt", "内容")
+            assert future.result() is False
+            assert writer.stats()["errors"] == 1
+        finally:
+            writer.close()
+    print("✓ 失败的写入被报告")
+
+
+def test_failed_write_removes_temp():
+    """测试临时文件写入过程中出错时删除临时文件"""
+    print("测试失败写入的临时文件清理...")
+
+    def failing_fsync(fd):
+        raise OSError("磁盘已满")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = AsyncOutputWriter(fsync="batch")
+        original_fsync = os.fsync
+        os.fsync = failing_fsync
+        try:
+            future = writer.submit(Path(tmp) / "out.txt", "内容")
+            assert future.result() is False
+        finally:
+            os.fsync = original_fsync
+            writer.close()
+        assert list(Path(tmp).iterdir()) == []
+    print("✓ 失败的写入不留下临时文件")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 异步输出写入测试")
+    print("=" * 50)
+    test_atomic_writes()
+    test_write_failure()
+    test_failed_write_removes_temp()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+测试PDF页码区间的解析与换算
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+import pdf_extractor
+from pdf_extractor import iter_pdf_pages, parse_page_range, resolve_page_range
+
+
+def build_pdf(path: Path, page_count: int) -> None:
+    """构造每页只有一行文字 "Page N" 的最小 PDF"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None,
+               b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for number in range(1, page_count + 1):
+        stream = f"BT /F1 12 Tf 72 720 Td (Page {number}) Tj ET".encode("ascii")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+                        ).encode("ascii"))
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode("ascii")
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+
+
+def test_parse_page_range():
+    """测试 "5-20" / "5" 形式的页码区间解析"""
+    print("测试页码区间解析...")
+
+    assert parse_page_range("5-20") == (5, 20)
+    assert parse_page_range("7") == (7, 7)
+    assert parse_page_range("3-") == (3, 3)
+    assert parse_page_range("1-1") == (1, 1)
+
+    for value in ["0-3", "5-2", "abc", "-3", ""]:
+        try:
+            parse_page_range(value)
+        except ValueError:
+            continue
+        raise AssertionError(f"应拒绝无效区间: {value!r}")
+    print("✓ 有效区间解析正确，无效区间抛出 ValueError")
+
+
+def test_resolve_page_range():
+    """测试页码区间和 max_pages 换算为 [start, stop) 下标"""
+    print("测试页码区间换算...")
+
+    assert resolve_page_range(10) == (0, 10)
+    assert resolve_page_range(10, max_pages=3) == (0, 3)
+    assert resolve_page_range(10, max_pages=30) == (0, 10)
+    assert resolve_page_range(10, page_range=(2, 5)) == (1, 5)
+    assert resolve_page_range(10, max_pages=2, page_range=(2, 5)) == (1, 3)
+    # 区间超出页数时截到最后一页
+    assert resolve_page_range(10, page_range=(8, 50)) == (7, 10)
+    # 起始页超出页数时结果为空区间
+    start, stop = resolve_page_range(10, page_range=(20, 30))
+    assert stop == start
+    assert resolve_page_range(10, max_pages=0) == (0, 0)
+    assert resolve_page_range(0) == (0, 0)
+    print("✓ 区间、max_pages 及越界情况换算正确")
+
+
+def test_parallel_pages():
+    """测试进程池并行提取时按页序输出，以及 max_pages / 页码区间 / 提前停止"""
+    print("测试并行提取PDF页...")
+
+    original_min_pages = pdf_extractor.PARALLEL_MIN_PAGES
+    pdf_extractor.PARALLEL_MIN_PAGES = 4
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "pages.pdf"
+            build_pdf(path, 12)
+
+            # 12 页、2 个工作进程：每段 12 // 8 = 1 页，共 12 段
+            pages = [text.strip() for text in iter_pdf_pages(path, workers=2)]
+            assert pages == [f"Page {n}" for n in range(1, 13)]
+            # 单进程路径结果相同
+            assert [text.strip() for text in iter_pdf_pages(path, workers=1)] == pages
+
+            pages = [text.strip() for text in iter_pdf_pages(path, max_pages=5, workers=2)]
+            assert pages == [f"Page {n}" for n in range(1, 6)]
+            pages = [text.strip() for text in
+                     iter_pdf_pages(path, max_pages=6, page_range=(3, 12), workers=3)]
+            assert pages == [f"Page {n}" for n in range(3, 9)]
+            # 截断后页数低于阈值时不启动进程池
+            pages = [text.strip() for text in iter_pdf_pages(path, max_pages=2, workers=2)]
+            assert pages == ["Page 1", "Page 2"]
+
+            # 提前停止迭代：取消剩余任务并关闭进程池，不会挂起
+            started = time.time()
+            generator = iter_pdf_pages(path, workers=2)
+            assert next(generator).strip() == "Page 1"
+            generator.close()
+            assert time.time() - started < 30
+    finally:
+        pdf_extractor.PARALLEL_MIN_PAGES = original_min_pages
+    print("✓ 并行提取按页序输出，截断和提前停止正确")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - PDF页码区间测试")
+    print("=" * 50)
+    test_parse_page_range()
+    test_resolve_page_range()
+    test_parallel_pages()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+测试流式分块处理的合并结果
+"""
+import re
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from config import config
+from entity_spans import EntitySpans
+from improved_data_processor import AdvancedTextProcessor
+from processing_profiles import ProcessingProfile
+
+CHUNKS = ["Alice met Bob on 2024-01-15. ", "  Carol   paid 5 dollars. ", "", "Dave left 7 days later."]
+
+
+class RegexEntityProcessor(AdvancedTextProcessor):
+    """把首字母大写的单词当作实体，测试不依赖 spaCy 模型"""
+
+    def _parse(self, text, language):
+        return None
+
+    def _extract_entities(self, doc, original_text, offset_map):
+        entities = EntitySpans(original_text)
+        for match in re.finditer(r'\b[A-Z][a-z]+\b', original_text):
+            entities.append("NAME", match.start(), match.end())
+        return entities
+
+
+def create_processor() -> RegexEntityProcessor:
+    return RegexEntityProcessor(ProcessingProfile("test", sentiment=False))
+
+
+def test_merge_chunks():
+    """测试数字、日期、实体偏移量和统计信息的合并"""
+    print("测试分块合并...")
+
+    full_text = "".join(CHUNKS)
+    result = create_processor().process_chunks(iter(CHUNKS))
+
+    assert result.original_text == ""
+    assert result.numbers == [5.0, 7.0] and result.dates == ["2024-01-15"]
+    # 实体偏移量换算为全文位置
+    assert [entity["text"] for entity in result.entities] == ["Alice", "Bob", "Carol", "Dave"]
+    for entity in result.entities:
+        assert full_text[entity["start"]:entity["end"]] == entity["text"]
+    assert result.statistics["chunk_count"] == 3
+    assert result.statistics["word_count"] == len(full_text.split())
+    assert result.statistics["entity_count"] == 4
+    assert not result.statistics["processed_text_truncated"]
+    assert not result.statistics["entities_truncated"]
+    assert result.processed_text == " ".join(" ".join(chunk.split()) for chunk in CHUNKS if chunk)
+    print("✓ 合并结果与整段文本一致")
+
+
+def test_bounded_results():
+    """测试处理后文本和实体数量有上限"""
+    print("测试结果上限...")
+
+    processing = config.config['processing']
+    saved = (processing.get('stream_max_processed_chars'), processing.get('stream_max_entities'))
+    processing['stream_max_processed_chars'] = 40
+    processing['stream_max_entities'] = 2
+    try:
+        result = create_processor().process_chunks(iter(CHUNKS * 100))
+    finally:
+        processing['stream_max_processed_chars'], processing['stream_max_entities'] = saved
+
+    assert len(result.processed_text) <= 40
+    assert len(result.entities) == 2
+    assert result.statistics["entity_count"] == 400
+    assert result.statistics["processed_text_truncated"]
+    assert result.statistics["entities_truncated"]
+    print("✓ 超出上限的部分只计入统计")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 流式分块处理测试")
+    print("=" * 50)
+    test_merge_chunks()
+    test_bounded_results()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
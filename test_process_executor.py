@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+测试进程池执行后端的端到端批量处理
+"""
+import json
+import sys
+import tempfile
+from functools import partial
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from improved_data_processor import init_worker, process_text_in_worker, result_formatter
+from improved_file_handler import FileHandler
+from processing_profiles import ProcessingProfile
+
+
+def test_process_executor():
+    """测试 executor_type="process" 时文件在工作进程中读取和处理，由主进程写出"""
+    print("测试进程池批量处理...")
+
+    profile = ProcessingProfile("worker-test", entities=False, sentiment=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        input_folder = Path(tmp) / "input"
+        output_folder = Path(tmp) / "output"
+        input_folder.mkdir()
+        (input_folder / "a.txt").write_text("Alice paid 5 dollars on 2024-01-15.", encoding='utf-8')
+        (input_folder / "b.txt").write_text("今天买了 3 本书。", encoding='utf-8')
+
+        # 不预热模型，测试不依赖 spaCy 是否安装
+        result = FileHandler().batch_process(
+            input_folder, output_folder, process_text_in_worker,
+            formatter_func=partial(result_formatter.to_json, include_original_text=True),
+            executor_type="process",
+            initializer=partial(init_worker, profile, warmup=False),
+            max_workers=2
+        )
+
+        assert result["success"] and result["processed"] == 2 and result["errors"] == 0
+        first = json.loads((output_folder / "a.processed.txt").read_text(encoding='utf-8'))
+        second = json.loads((output_folder / "b.processed.txt").read_text(encoding='utf-8'))
+
+    assert first["original_text"] == "Alice paid 5 dollars on 2024-01-15."
+    assert first["language"] == "en" and 5.0 in first["numbers"]
+    assert second["language"] == "zh" and 3.0 in second["numbers"]
+    # 工作进程使用主进程传入的配置档：不做情感分析
+    assert first["sentiment"] == {} and second["sentiment"] == {}
+    print("✓ 两个文件在进程池中处理，结果由主进程格式化写出")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 进程池后端测试")
+    print("=" * 50)
+    test_process_executor()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
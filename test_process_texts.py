@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+测试按语言分组的批量处理（nlp.pipe）
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from improved_data_processor import NLP_UNAVAILABLE_ERROR, AdvancedTextProcessor
+from improved_file_handler import FileHandler
+from processing_profiles import ProcessingProfile
+
+PROFILE = ProcessingProfile("test", sentiment=False)
+
+
+class FakeToken:
+    """只有文本属性的词元替身"""
+
+    is_stop = False
+    is_punct = False
+    is_space = False
+
+    def __init__(self, text):
+        self.text = text
+        self.lemma_ = text
+        self.lower_ = text.lower()
+
+
+class FakeDoc:
+    """按空白切分的 Doc 替身，没有实体和句子边界"""
+
+    ents = ()
+
+    def __init__(self, text):
+        self.tokens = [FakeToken(word) for word in text.split()]
+
+    def __iter__(self):
+        return iter(self.tokens)
+
+    def __len__(self):
+        return len(self.tokens)
+
+    def has_annotation(self, name):
+        return False
+
+
+class FakeModelManager:
+    """记录每次 nlp.pipe 调用的语言和文本，failing 中的语言批量解析时出错"""
+
+    def __init__(self, failing=()):
+        self.calls = []
+        self.failing = set(failing)
+
+    def pipe(self, texts, language, batch_size=64, n_process=1, profile=None):
+        self.calls.append((language, list(texts)))
+        if language in self.failing:
+            raise RuntimeError("pipe failed")
+        return (FakeDoc(text) for text in texts)
+
+
+def make_processor(manager):
+    processor = AdvancedTextProcessor(PROFILE)
+    processor.model_manager = manager
+    return processor
+
+
+TEXTS = ["Hello World", "今天天气很好", "", "Good  Morning", "明天见"]
+
+
+def test_grouped_order():
+    """测试每种语言只调用一次 nlp.pipe，结果顺序与输入一致"""
+    print("测试按语言分组...")
+
+    manager = FakeModelManager()
+    results = make_processor(manager).process_texts(TEXTS)
+
+    assert sorted(manager.calls) == [("en", ["Hello World", "Good Morning"]),
+                                     ("zh", ["今天天气很好", "明天见"])]
+    assert [result.original_text for result in results] == TEXTS
+    assert [result.language for result in results] == ["en", "zh", "unknown", "en", "zh"]
+    assert results[0].processed_text == "hello world"
+    assert results[3].processed_text == "good morning"
+    assert results[1].processed_text == "今天天气很好"
+    assert results[0].statistics["token_count"] == 2
+    assert all(not results[i].errors for i in (0, 1, 3, 4))
+    print("✓ 同语言文本一次批量解析，结果按输入顺序返回")
+
+
+def test_group_failure_fallback():
+    """测试一种语言的批量解析失败时只影响该组，其余组正常"""
+    print("测试分组失败回退...")
+
+    manager = FakeModelManager(failing={"zh"})
+    results = make_processor(manager).process_texts(TEXTS)
+
+    assert [result.original_text for result in results] == TEXTS
+    for index in (1, 4):
+        # 失败组逐条保留基础处理结果，并记录错误
+        assert results[index].errors == [NLP_UNAVAILABLE_ERROR]
+        assert results[index].processed_text == TEXTS[index]
+        assert results[index].statistics["char_count"] == len(TEXTS[index])
+    assert not results[0].errors and results[0].processed_text == "hello world"
+    print("✓ 失败组回退到基础处理，其他语言不受影响")
+
+
+def test_batch_process_pipe():
+    """测试分组读取文件后批量处理，输出与输入文件一一对应"""
+    print("测试文件分组批量处理...")
+
+    manager = FakeModelManager()
+    processor = make_processor(manager)
+    group_sizes = []
+
+    def batch_func(contents):
+        group_sizes.append(len(contents))
+        return [f"{result.language}|{result.processed_text}"
+                for result in processor.process_texts(contents)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_folder = Path(tmp) / "input"
+        output_folder = Path(tmp) / "output"
+        input_folder.mkdir()
+        contents = {"a": "Alpha One", "b": "第二个文件", "c": "Gamma Three", "d": "第四个", "e": "Echo"}
+        for name, content in contents.items():
+            (input_folder / f"{name}.txt").write_text(content, encoding='utf-8')
+        (input_folder / "f.xyz").write_text("unsupported", encoding='utf-8')
+
+        result = FileHandler().batch_process_pipe(input_folder, output_folder, batch_func,
+                                                  group_size=2)
+        outputs = {path.name: path.read_text(encoding='utf-8')
+                   for path in output_folder.iterdir()}
+
+    assert result["processed"] == 5 and result["errors"] == 0
+    assert group_sizes == [2, 2, 1]
+    assert outputs == {
+        "a.processed.txt": "en|alpha one",
+        "b.processed.txt": "zh|第二个文件",
+        "c.processed.txt": "en|gamma three",
+        "d.processed.txt": "zh|第四个",
+        "e.processed.txt": "en|echo",
+    }
+    print("✓ 跨组的结果写回对应的输出文件")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 批量处理测试")
+    print("=" * 50)
+    test_grouped_order()
+    test_group_failure_fallback()
+    test_batch_process_pipe()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
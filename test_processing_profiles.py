@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+测试处理配置档
+"""
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from improved_data_processor import (
+    NLP_UNAVAILABLE_ERROR, AdvancedTextProcessor, NLPModelManager
+)
+from processing_profiles import ProcessingProfile, get_profile, profile_names
+
+
+class FakePipeline:
+    """只记录组件名的模型替身"""
+
+    def __init__(self, pipe_names):
+        self.pipe_names = list(pipe_names)
+
+    def add_pipe(self, name, first=False):
+        self.pipe_names.insert(0 if first else len(self.pipe_names), name)
+
+
+def test_builtin_profiles():
+    """测试内置配置档需要的组件"""
+    print("测试内置配置档...")
+
+    assert {"stats-only", "lemmas", "entities", "full"} <= set(profile_names())
+
+    stats_only = get_profile("stats-only")
+    assert stats_only.required_components() == set()
+    assert "parser" in stats_only.excluded_components()
+    assert not stats_only.sentiment
+
+    lemmas = get_profile("lemmas")
+    assert lemmas.required_components() == {"tok2vec", "tagger", "morphologizer",
+                                             "attribute_ruler", "lemmatizer"}
+    assert {"parser", "ner"} <= set(lemmas.excluded_components())
+
+    entities = get_profile("entities")
+    assert entities.required_components() == {"tok2vec", "ner"}
+
+    full = get_profile("full")
+    assert full.excluded_components() == ["senter"]
+    assert full.lemmas and full.entities and full.sentiment
+
+    try:
+        get_profile("no-such-profile")
+        assert False, "未知配置档应当报错"
+    except ValueError:
+        pass
+    print("✓ 各配置档只保留需要的组件")
+
+
+def test_sentencizer_and_overrides():
+    """测试 sentencizer 替换和关闭阶段"""
+    print("测试 sentencizer 和阶段开关...")
+
+    nlp = get_profile("stats-only").configure(FakePipeline([]))
+    assert nlp.pipe_names == ["sentencizer"]
+    nlp = get_profile("full").configure(FakePipeline(["tok2vec", "parser"]))
+    assert "sentencizer" not in nlp.pipe_names
+
+    full = get_profile("full")
+    no_entities = full.without("entities", "sentiment")
+    assert not no_entities.entities and not no_entities.sentiment and no_entities.lemmas
+    assert "ner" in no_entities.excluded_components()
+    assert full.without() is full
+    stats_only = get_profile("stats-only")
+    assert stats_only.without("sentiment") is stats_only
+
+    # 组件需求相同的配置档共用同一个模型
+    assert (ProcessingProfile("a", sentiment=False).pipeline_key
+            == ProcessingProfile("b", sentiment=True).pipeline_key)
+    assert get_profile("lemmas").pipeline_key != get_profile("entities").pipeline_key
+
+    try:
+        ProcessingProfile("bad", sentences="regex")
+        assert False, "无效的句子边界来源应当报错"
+    except ValueError:
+        pass
+    print("✓ 配置档可按需关闭阶段")
+
+
+def test_missing_spacy():
+    """测试没有安装 spaCy 时模型记为加载失败，结果中带有错误"""
+    print("测试缺少 spaCy...")
+
+    profile = ProcessingProfile("no-spacy", lemmas=False, entities=False, sentiment=False,
+                                sentences="sentencizer")
+    keys = [f"spacy_{lang}:{profile.pipeline_key}" for lang in ("en", "zh")]
+    manager = NLPModelManager()
+    saved = sys.modules.get("spacy")
+    # sys.modules 中为 None 的模块在导入时抛出 ImportError
+    sys.modules["spacy"] = None
+    try:
+        assert manager.get_spacy_model("en", profile) is None
+        assert keys[0] in manager._failed
+
+        processor = AdvancedTextProcessor(profile)
+        result = processor.process_text("Alice paid 5 dollars.")
+        assert result.errors == [NLP_UNAVAILABLE_ERROR]
+        assert result.numbers and result.statistics["processing_errors"] == 1
+        results = processor.process_texts(["Alice paid 5 dollars.", "Bob left."])
+        assert all(item.errors == [NLP_UNAVAILABLE_ERROR] for item in results)
+    finally:
+        if saved is None:
+            sys.modules.pop("spacy", None)
+        else:
+            sys.modules["spacy"] = saved
+        for key in keys:
+            manager._failed.discard(key)
+    print("✓ 缺少 spaCy 时不再重复导入，结果中记录错误")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 处理配置档测试")
+    print("=" * 50)
+    test_builtin_profiles()
+    test_sentencizer_and_overrides()
+    test_missing_spacy()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
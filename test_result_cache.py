@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+测试处理结果缓存
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from config import config
+from entity_spans import EntitySpans
+from improved_data_processor import ProcessingResult
+from result_cache import ResultCache, build_fingerprint
+
+
+def make_result(text: str, errors=None) -> ProcessingResult:
+    """构造一个处理结果"""
+    entities = EntitySpans(text)
+    entities.append("PERSON", 0, min(len(text), 5))
+    return ProcessingResult(
+        original_text=text,
+        processed_text=text.lower(),
+        language="en",
+        sentiment={"compound": 0.5},
+        numbers=["42"],
+        dates=[],
+        entities=entities,
+        statistics={"char_count": len(text)},
+        errors=errors or []
+    )
+
+
+def test_hit_and_miss():
+    """测试命中返回相同内容，未命中返回 None"""
+    print("测试缓存命中与未命中...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(Path(tmp) / "cache.sqlite3", fingerprint="fp")
+        try:
+            key = cache.make_key("hash-a")
+            assert cache.get(key) is None
+
+            result = make_result("Alice paid 42 dollars.")
+            cache.put(key, result)
+            cached = cache.get(key)
+            assert cached is not None
+            assert cached.as_dict() == result.as_dict()
+            assert cache.get(cache.make_key("hash-b")) is None
+
+            stats = cache.stats()
+            assert stats["cache_hits"] == 1
+            assert stats["cache_misses"] == 2
+            assert stats["cache_entries"] == 1
+        finally:
+            cache.close()
+    print("✓ 命中返回原结果，统计正确")
+
+
+def test_fingerprint_invalidation():
+    """测试设置或指纹变化后旧缓存不再命中"""
+    print("测试指纹失效...")
+
+    assert build_fingerprint({"pdf_max_pages": 5}) == build_fingerprint({"pdf_max_pages": 5})
+    assert build_fingerprint({"pdf_max_pages": 5}) != build_fingerprint({"pdf_max_pages": 6})
+
+    # 切换情感打分后端会改变分数，旧缓存也要失效
+    sentiment = config.config['sentiment']
+    saved = sentiment.get('backend')
+    before = build_fingerprint()
+    sentiment['backend'] = "numpy" if saved != "numpy" else "vader"
+    try:
+        assert build_fingerprint() != before
+    finally:
+        sentiment['backend'] = saved
+    assert build_fingerprint() == before
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite3"
+        old = ResultCache(path, fingerprint=build_fingerprint({"profile": "full"}))
+        try:
+            old.put(old.make_key("hash-a"), make_result("Alice"))
+        finally:
+            old.close()
+
+        same = ResultCache(path, fingerprint=build_fingerprint({"profile": "full"}))
+        changed = ResultCache(path, fingerprint=build_fingerprint({"profile": "lemmas"}))
+        try:
+            assert same.get(same.make_key("hash-a")) is not None
+            assert changed.get(changed.make_key("hash-a")) is None
+        finally:
+            same.close()
+            changed.close()
+    print("✓ 指纹变化后同一文件不再命中")
+
+
+def test_size_bounded_eviction():
+    """测试总大小超过上限时淘汰最久未访问的条目"""
+    print("测试按大小淘汰...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 随机内容压缩后每条仍有约 1.3KB
+        cache = ResultCache(Path(tmp) / "cache.sqlite3", max_size_mb=4 / 1024, fingerprint="fp")
+        try:
+            keys = [cache.make_key(f"hash-{i}") for i in range(6)]
+            for key in keys[:2]:
+                cache.put(key, make_result(os.urandom(1000).hex()))
+            # 访问第一条，使第二条成为最久未访问的条目
+            assert cache.get(keys[0]) is not None
+            for key in keys[2:]:
+                cache.put(key, make_result(os.urandom(1000).hex()))
+
+            stats = cache.stats()
+            assert stats["cache_size_bytes"] <= cache.max_size
+            assert stats["cache_entries"] < len(keys)
+            assert cache.get(keys[1]) is None
+            assert cache.get(keys[-1]) is not None
+        finally:
+            cache.close()
+
+        # 重新打开时总大小从数据库恢复
+        reopened = ResultCache(Path(tmp) / "cache.sqlite3", max_size_mb=4 / 1024, fingerprint="fp")
+        try:
+            assert reopened.stats()["cache_size_bytes"] == stats["cache_size_bytes"]
+        finally:
+            reopened.close()
+    print("✓ 总大小不超过上限，最久未访问的条目先被淘汰")
+
+
+def test_errors_not_cached():
+    """测试带错误的结果不写入缓存"""
+    print("测试带错误的结果...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(Path(tmp) / "cache.sqlite3", fingerprint="fp")
+        try:
+            key = cache.make_key("hash-a")
+            cache.put(key, make_result("Alice", errors=["模型加载失败"]))
+            assert cache.get(key) is None
+            assert cache.stats()["cache_entries"] == 0
+        finally:
+            cache.close()
+    print("✓ 带错误的结果不会被缓存")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 结果缓存测试")
+    print("=" * 50)
+    test_hit_and_miss()
+    test_fingerprint_invalidation()
+    test_size_bounded_eviction()
+    test_errors_not_cached()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+测试分句情感分析引擎
+"""
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from sentiment_engine import SentimentEngine, split_sentences
+
+
+def test_split_sentences():
+    """测试分句"""
+    print("测试分句...")
+
+    assert split_sentences("Great day! Awful food.\nOkay") == ["Great day!", "Awful food.", "Okay"]
+    assert split_sentences("今天很好。明天不好！") == ["今天很好。", "明天不好！"]
+    assert split_sentences("  \n ") == []
+    print("✓ 按句末标点和换行切分")
+
+
+def test_aggregation():
+    """测试逐句打分和汇总"""
+    print("测试情感汇总...")
+
+    engine = SentimentEngine(weighting="length")
+    analyzer = engine.get_analyzer()
+
+    # 单句与 VADER 结果一致
+    assert engine.score("What a great movie!") == analyzer.polarity_scores("What a great movie!")
+
+    first, second = "I love this product.", "The delivery was terribly slow."
+    expected = ((analyzer.polarity_scores(first)["compound"] * len(first)
+                 + analyzer.polarity_scores(second)["compound"] * len(second))
+                / (len(first) + len(second)))
+    assert abs(engine.score(f"{first} {second}")["compound"] - expected) < 1e-9
+
+    strongest = SentimentEngine(weighting="max").score(f"{first} {second}")
+    assert strongest == max((analyzer.polarity_scores(first), analyzer.polarity_scores(second)),
+                            key=lambda scores: abs(scores["compound"]))
+    assert engine.score("")["compound"] == 0.0
+    print("✓ 按句子长度加权汇总")
+
+
+def test_memoization():
+    """测试重复句子缓存和多线程共用"""
+    print("测试句子缓存...")
+
+    engine = SentimentEngine(cache_size=100)
+    texts = ["Nice work. See you soon.", "Nice work.", "See you soon. Nice work."]
+    results = engine.score_many(texts)
+    assert results[1] == engine.score("Nice work.")
+    stats = engine.stats()
+    # 3 个文本只有 2 个不同的句子
+    assert stats["cache_misses"] == 2 and stats["cached_sentences"] == 2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        scores = list(executor.map(engine.score, texts * 50))
+    assert scores == results * 50
+    print("✓ 重复句子只打分一次")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 情感分析引擎测试")
+    print("=" * 50)
+    test_split_sentences()
+    test_aggregation()
+    test_memoization()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
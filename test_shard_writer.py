@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+测试分片 JSONL 输出
+"""
+import gzip
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from shard_writer import ShardedJsonlWriter
+
+
+def test_rotation():
+    """测试按大小轮换"""
+    print("测试分片轮换...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = ShardedJsonlWriter(tmp, max_bytes=100)
+        for i in range(10):
+            assert writer.write({"source": f"dir/{i}.txt", "text": "x" * 30})
+        shards = writer.close()
+
+        # 每片约 2 条记录后轮换，不留下空分片或临时文件
+        assert len(shards) == 5
+        assert not list(Path(tmp).glob("*.tmp"))
+        records = [json.loads(line) for path in shards
+                   for line in path.read_text(encoding='utf-8').splitlines()]
+        assert [r["source"] for r in records] == [f"dir/{i}.txt" for i in range(10)]
+    print("✓ 分片按大小轮换")
+
+
+def test_worker_shards():
+    """测试每个线程写自己的分片，以及 gzip 压缩"""
+    print("测试线程分片...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = ShardedJsonlWriter(tmp, compress=True, prefix="out")
+
+        def work(worker):
+            for i in range(50):
+                writer.write({"source": f"{worker}/{i}", "word_count": i})
+
+        threads = [threading.Thread(target=work, args=(w,)) for w in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        shards = writer.close()
+
+        assert len(shards) == 4
+        assert all(path.name.startswith("out-") and path.name.endswith(".jsonl.gz")
+                   for path in shards)
+        for path in shards:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                sources = {json.loads(line)["source"].split('/')[0] for line in f}
+            # 一个分片只包含一个线程的记录
+            assert len(sources) == 1
+        assert writer.stats()["records"] == 200
+    print("✓ 每个线程一个 gzip 分片")
+
+
+def test_same_second_runs():
+    """测试同一秒内创建的两个写入器不会写到同名分片"""
+    print("测试运行标识...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = ShardedJsonlWriter(tmp)
+        second = ShardedJsonlWriter(tmp)
+        assert first.run_id != second.run_id
+        first.write({"source": "a"})
+        second.write({"source": "b"})
+        shards = first.close() + second.close()
+
+        assert len(set(shards)) == 2
+        assert len(list(Path(tmp).glob("*.jsonl"))) == 2
+    print("✓ 同一秒内的多次运行使用不同的分片文件")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 分片输出测试")
+    print("=" * 50)
+    test_rotation()
+    test_worker_shards()
+    test_same_second_runs()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
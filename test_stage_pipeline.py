@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+测试分阶段流水线
+"""
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+import improved_file_handler
+from improved_file_handler import FileHandler
+from stage_pipeline import ByteBudget, Stage, StagePipeline
+
+
+def test_stages_and_errors():
+    """测试各阶段依次处理，失败和丢弃的项不进入下游"""
+    print("测试流水线阶段...")
+
+    def parse(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    outputs = []
+    lock = threading.Lock()
+
+    def collect(x):
+        with lock:
+            outputs.append(x)
+
+    pipeline = StagePipeline([
+        Stage("parse", parse, workers=2),
+        Stage("filter", lambda x: x if x % 2 == 0 else None, workers=3),
+        Stage("square", lambda x: x * x, workers=1),
+    ], queue_size=2, report_interval=None)
+    summary = pipeline.run(range(10), on_output=collect)
+
+    assert sorted(outputs) == [0, 4, 16, 36, 64]
+    assert summary["items"] == 10
+    stages = summary["stages"]
+    assert stages["parse"]["errors"] == 1
+    assert stages["filter"]["items"] == 9 and stages["filter"]["dropped"] == 4
+    assert stages["square"]["items"] == 5
+    print("✓ 项按阶段流转，错误和丢弃被统计")
+
+
+def test_byte_budget():
+    """测试字节预算阻塞与超大项"""
+    print("测试字节预算...")
+
+    budget = ByteBudget(100)
+    first = budget.acquire(60)
+    # 超过总预算的项按总预算计
+    assert ByteBudget(10).acquire(1000) == 10
+
+    acquired = threading.Event()
+
+    def waiter():
+        budget.release(budget.acquire(50))
+        acquired.set()
+
+    thread = threading.Thread(target=waiter)
+    thread.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+    budget.release(first)
+    thread.join(timeout=1)
+    assert acquired.is_set()
+    assert budget.in_use == 0 and budget.peak == 60
+    print("✓ 预算不足时阻塞，释放后继续")
+
+
+def test_staged_budget_released():
+    """测试处理结果为 None 的文件被丢弃，字节预算只释放一次"""
+    print("测试分阶段批处理的字节预算...")
+
+    budgets = []
+
+    class RecordingBudget(ByteBudget):
+        def __init__(self, capacity):
+            super().__init__(capacity)
+            budgets.append(self)
+
+    def processor(content):
+        return None if content.startswith("skip") else content.upper()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_folder = Path(tmp) / "input"
+        output_folder = Path(tmp) / "output"
+        input_folder.mkdir()
+        for name in ("a", "b", "c"):
+            (input_folder / f"{name}.txt").write_text(f"keep {name}", encoding='utf-8')
+        (input_folder / "skipped.txt").write_text("skip me", encoding='utf-8')
+
+        improved_file_handler.ByteBudget = RecordingBudget
+        try:
+            result = FileHandler().batch_process_staged(input_folder, output_folder, processor)
+        finally:
+            improved_file_handler.ByteBudget = ByteBudget
+
+        assert result["processed"] == 3 and result["errors"] == 1
+        assert not (output_folder / "skipped.processed.txt").exists()
+        assert (output_folder / "a.processed.txt").read_text(encoding='utf-8') == "KEEP A"
+        assert budgets[0].in_use == 0 and budgets[0].peak > 0
+    print("✓ 没有结果的文件被丢弃，预算全部归还")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 流水线测试")
+    print("=" * 50)
+    test_stages_and_errors()
+    test_byte_budget()
+    test_staged_budget_released()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+测试结构化文件的带类型读取
+"""
+import json
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from structured_content import StructuredContentBuilder, read_structured
+from text_extractors import classify_cell
+
+
+def test_cell_classification():
+    """测试单元格类型判断和收集"""
+    print("测试单元格分类...")
+
+    assert classify_cell(" -1,234.5 ") == ('number', -1234.5)
+    assert classify_cell("2024年1月15日") == ('date', "2024年1月15日")
+    assert classify_cell("12 apples") == ('text', "12 apples")
+
+    builder = StructuredContentBuilder()
+    builder.add_row(["Alice", 3, 2.5, True, None, datetime(2024, 1, 15), "  "])
+    builder.add_row([datetime(2024, 1, 15, 8, 30), "7", "很好"])
+    content = builder.build()
+
+    assert content.text == "Alice\n很好"
+    assert content.numbers == [2.5, 3.0, 7.0]
+    assert content.dates == ["2024-01-15", "2024-01-15 08:30:00"]
+    assert (content.typed_cells, content.text_cells) == (5, 2)
+    print("✓ 数字和日期单元格不进入自由文本")
+
+
+def test_csv_and_json():
+    """测试CSV和JSON的带类型读取"""
+    print("测试CSV和JSON...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = Path(tmp) / "data.csv"
+        csv_path.write_text('name,amount,date\nAlice,"1,234.50",2024-01-15\n', encoding='utf-8')
+        content = read_structured(csv_path)
+        assert content.text == "name amount date\nAlice"
+        assert content.numbers == [1234.5]
+        assert content.dates == ["2024-01-15"]
+
+        json_path = Path(tmp) / "data.json"
+        json_path.write_text(json.dumps({"items": [{"id": 7, "note": "Loved it"}], "total": 3.5}),
+                             encoding='utf-8')
+        content = read_structured(json_path)
+        # 键名不再作为文本
+        assert content.text == "Loved it"
+        assert content.numbers == [3.5, 7.0]
+    print("✓ CSV和JSON只保留自由文本")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 带类型读取测试")
+    print("=" * 50)
+    test_cell_classification()
+    test_csv_and_json()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+测试单次扫描的数字/日期提取
+"""
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from text_extractors import extract_numbers_and_dates
+
+
+def test_non_overlapping_spans():
+    """测试各格式互不重叠"""
+    print("测试数字/日期提取...")
+
+    text = ("Numbers: 42, 3.14159, 1,234.56 - Dates: 2024-01-15, 12/25/2023, "
+            "03-01-2024, 2024年1月15日 end")
+    numbers, dates = extract_numbers_and_dates(text)
+
+    # 小数的整数部分、日期中的数字都不应再单独计数
+    assert numbers == [3.14159, 42.0, 1234.56]
+    assert dates == ["2024-01-15", "12/25/2023", "03-01-2024", "2024年1月15日"]
+    print("✓ 数字和日期的匹配区间互不重叠")
+
+
+def test_edge_cases():
+    """测试边界情况"""
+    print("测试边界情况...")
+
+    assert extract_numbers_and_dates("") == ([], [])
+    assert extract_numbers_and_dates("no digits") == ([], [])
+    # 千分位格式不完整时按普通整数处理
+    assert extract_numbers_and_dates("1,2345")[0] == [1.0, 2345.0]
+    # 重复的数字和日期去重
+    assert extract_numbers_and_dates("7 7 2024-01-15 2024-01-15") == ([7.0], ["2024-01-15"])
+    print("✓ 边界情况处理正确")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 数字/日期提取测试")
+    print("=" * 50)
+    test_non_overlapping_spans()
+    test_edge_cases()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
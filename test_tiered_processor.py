@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+测试分层（turbo）处理
+"""
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from improved_data_processor import AdvancedTextProcessor
+from processing_profiles import get_profile
+from structured_content import StructuredContent
+from tiered_processor import EscalationRules, TieredTextProcessor
+
+
+def create_processor(**rules) -> TieredTextProcessor:
+    # 完整层使用 stats-only 配置档，测试不依赖情感和实体模型
+    return TieredTextProcessor(AdvancedTextProcessor(get_profile("stats-only")),
+                               rules=EscalationRules(**rules), simple_sentiment=False)
+
+
+def test_escalation_rules():
+    """测试长度、语言和关键词规则"""
+    print("测试升级规则...")
+
+    rules = EscalationRules(min_chars=50, languages=["zh"], keywords=["refund", "退款"])
+    assert rules.match("short note", "en") == []
+    assert rules.match("x" * 60, "en") == ["length"]
+    assert rules.match("你好", "zh") == ["language"]
+    assert rules.match("Please REFUND me", "en") == ["keywords"]
+    assert rules.match("refunds are not a keyword match", "en") == []
+    assert rules.match("申请退款", "en") == ["keywords"]
+    assert EscalationRules().match("anything at all " * 100, "zh") == []
+    print("✓ 命中任意规则即升级")
+
+
+def test_language_rule():
+    """测试 zh/en 以外的语言规则"""
+    print("测试语言规则...")
+
+    processor = create_processor(languages=["ja", "ko"])
+    japanese, korean, chinese = processor.process_texts(
+        ["これは日本語のテキストです。", "이것은 한국어 텍스트입니다.", "这是一段中文文本。"])
+    assert japanese.statistics["tier"] == "full" and japanese.statistics["escalated_by"] == ["language"]
+    assert korean.statistics["tier"] == "full"
+    assert chinese.statistics["tier"] == "simple" and chinese.language == "zh"
+    print("✓ 日文、韩文按语言规则升级")
+
+
+def test_shared_schema():
+    """测试两层输出字段一致"""
+    print("测试输出格式...")
+
+    processor = create_processor(keywords=["urgent"])
+    simple, full = processor.process_texts(["Paid 42 dollars on 2024-01-15.",
+                                            "Urgent: paid 42 dollars on 2024-01-15."])
+    assert simple.statistics["tier"] == "simple"
+    assert full.statistics["tier"] == "full" and full.statistics["escalated_by"] == ["keywords"]
+    assert set(simple.as_dict()) == set(full.as_dict())
+    assert set(simple.statistics) == set(full.statistics) - {"escalated_by"}
+    assert simple.numbers == full.numbers and simple.dates == full.dates
+    assert simple.statistics["word_count"] == 5 and simple.entities == []
+    print("✓ 简化层与完整层结果格式相同")
+
+
+def test_batch_order_and_content():
+    """测试批量处理顺序、空输入、结构化内容和计数"""
+    print("测试批量处理...")
+
+    processor = create_processor(min_chars=40)
+    texts = ["short", "", "this document is long enough to be escalated", "also short"]
+    results = processor.process_texts(texts)
+    assert [result.statistics.get("tier") for result in results] == ["simple", None, "full", "simple"]
+    assert results[1].errors and results[0].original_text == "short"
+    assert processor.stats() == {"simple": 2, "full": 1}
+
+    result = processor.process_content(StructuredContent(text="total", numbers=[3.5],
+                                                         dates=["2024-02-01"], typed_cells=2))
+    assert result.numbers == [3.5] and result.dates == ["2024-02-01"]
+    assert result.statistics["typed_cell_count"] == 2
+    print("✓ 结果顺序与输入一致")
+
+
+def test_streamed_chunks():
+    """测试流式分块内容默认留在简化层，开启 escalate_streamed 后按第一个块判定"""
+    print("测试流式分块...")
+
+    chunks = ["", "Invoice 12 paid on 2024-05-01. ", "Another line with 30 items. ", "Please refund."]
+    processor = create_processor(keywords=["invoice"])
+    result = processor.process_content(iter(chunks))
+    assert result.statistics["tier"] == "simple" and result.statistics["streamed"]
+    assert result.numbers == [12.0, 30.0] and result.dates == ["2024-05-01"]
+    assert result.statistics["chunk_count"] == 3
+    assert result.statistics["word_count"] == len("".join(chunks).split())
+
+    processor.escalate_streamed = True
+    result = processor.process_content(iter(chunks))
+    assert result.statistics["tier"] == "full" and result.statistics["escalated_by"] == ["keywords"]
+    assert result.numbers == [12.0, 30.0]
+
+    # 关键词不在第一个块中时不升级
+    processor.rules = EscalationRules(keywords=["refund"])
+    assert processor.process_content(iter(chunks)).statistics["tier"] == "simple"
+    print("✓ 流式内容按配置分层")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 分层处理测试")
+    print("=" * 50)
+    test_escalation_rules()
+    test_language_rule()
+    test_shared_schema()
+    test_batch_order_and_content()
+    test_streamed_chunks()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+测试向量化 VADER 打分与 NLTK 逐句打分结果一致
+"""
+import random
+import sys
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+from sentiment_engine import SentimentEngine
+from simple_data_processor import SimpleTextProcessor
+from vader_vectorized import VectorizedVader
+
+TRICKY_SENTENCES = [
+    "",
+    "The movie was good.",
+    "The movie was not good.",
+    "The movie was VERY GOOD!!!",
+    "The movie was very very good",
+    "It wasn't bad at all, but the ending was terrible.",
+    "I am not at least happy",
+    "at least good",
+    "It was kind of ok",
+    "never so good",
+    "it is never this bad",
+    "the shit is so good",
+    "This is the bomb!!",
+    "you cut the mustard great",
+    "yeah right sure good",
+    "good good bad good",
+    "Is it good??",
+    "GOOD but BAD",
+    ":) great :(",
+    "...good...",
+    "不错 good",
+]
+
+
+def test_tricky_sentences():
+    """测试否定、加强词、大写、but、least、习语和标点等规则"""
+    print("测试特殊规则...")
+
+    analyzer = SentimentEngine().get_analyzer()
+    vectorized = VectorizedVader.from_analyzer(analyzer)
+
+    results = vectorized.polarity_scores_batch(TRICKY_SENTENCES)
+    for sentence, scores in zip(TRICKY_SENTENCES, results):
+        assert scores == analyzer.polarity_scores(sentence), sentence
+    assert vectorized.polarity_scores("not bad") == analyzer.polarity_scores("not bad")
+    print("✓ 与 polarity_scores 结果完全一致")
+
+
+def test_random_corpus():
+    """测试随机生成的大批量句子"""
+    print("测试随机语料...")
+
+    analyzer = SentimentEngine().get_analyzer()
+    vectorized = VectorizedVader.from_analyzer(analyzer)
+    rng = random.Random(7)
+    words = sorted(analyzer.lexicon)[:2000] + [
+        "not", "never", "very", "extremely", "kind", "of", "but", "least", "at", "so", "this",
+        "GREAT", "BAD", "movie", "the", "a", "!", "?", "!!!"]
+
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randint(0, 20))) for _ in range(2000)]
+    for text, scores in zip(texts, vectorized.polarity_scores_batch(texts)):
+        assert scores == analyzer.polarity_scores(text), text
+    print(f"✓ {len(texts)} 个随机句子结果一致")
+
+
+def test_engine_backend():
+    """测试引擎的 numpy 后端和 SimpleTextProcessor 的情感分析"""
+    print("测试 numpy 后端...")
+
+    texts = ["Great service. The food was cold.", "Nothing special.", ""]
+    numpy_engine = SentimentEngine(backend="numpy", cache_size=0)
+    assert numpy_engine.score_many(texts) == SentimentEngine(cache_size=0).score_many(texts)
+
+    processor = SimpleTextProcessor(sentiment_engine=numpy_engine)
+    results = processor.process_texts(texts)
+    assert results[0].sentiment == numpy_engine.score(texts[0])
+    assert results[2].sentiment == {}
+    assert processor.process_text(texts[1]).sentiment == results[1].sentiment
+    assert SimpleTextProcessor().process_text(texts[0]).sentiment == {}
+    print("✓ 引擎和简化处理器可使用向量化打分")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - 向量化情感打分测试")
+    print("=" * 50)
+    test_tricky_sentences()
+    test_random_corpus()
+    test_engine_backend()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
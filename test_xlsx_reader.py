@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+测试直接解析XML的 .xlsx 读取
+"""
+import sys
+import tempfile
+import zipfile
+from datetime import datetime
+from pathlib import Path
+
+# 添加当前目录到路径
+sys.path.append(str(Path(__file__).parent))
+
+import xlsx_reader
+from xlsx_reader import XlsxWorkbook, read_workbook_text
+
+MAIN_NS = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+REL_NS = 'xmlns="http://schemas.openxmlformats.org/package/2006/relationships"'
+
+
+def build_workbook(path: Path) -> None:
+    """构造包含共享字符串、内联字符串、数字、日期、布尔和空列的工作簿"""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml", (
+            f'<workbook {MAIN_NS} '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="数据" sheetId="1" r:id="rId1"/>'
+            '<sheet name="Empty" sheetId="2" r:id="rId2"/></sheets></workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            f'<Relationships {REL_NS}>'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml" Type="worksheet"/>'
+            '<Relationship Id="rId2" Target="/xl/worksheets/sheet2.xml" Type="worksheet"/>'
+            '</Relationships>'))
+        zf.writestr("xl/sharedStrings.xml", (
+            f'<sst {MAIN_NS}><si><t>Hello</t></si>'
+            '<si><r><t>Rich </t></r><r><t>text</t></r></si></sst>'))
+        zf.writestr("xl/styles.xml", (
+            f'<styleSheet {MAIN_NS}>'
+            '<numFmts><numFmt numFmtId="164" formatCode="yyyy/mm/dd"/></numFmts>'
+            '<cellXfs><xf numFmtId="0"/><xf numFmtId="14"/><xf numFmtId="164"/></cellXfs>'
+            '</styleSheet>'))
+        zf.writestr("xl/worksheets/sheet1.xml", (
+            f'<worksheet {MAIN_NS}><sheetData>'
+            '<row r="1"><c r="A1" t="s"><v>0</v></c><c r="C1" t="s"><v>1</v></c></row>'
+            '<row r="2"><c r="A2"><v>42</v></c><c r="B2"><v>1.5</v></c>'
+            '<c r="C2" s="1"><v>45306</v></c><c r="D2" s="2"><v>45306.5</v></c></row>'
+            '<row r="3"><c r="A3" t="inlineStr"><is><t>内联</t></is></c>'
+            '<c r="B3" t="b"><v>1</v></c></row>'
+            '</sheetData></worksheet>'))
+        zf.writestr("xl/worksheets/sheet2.xml",
+                    f'<worksheet {MAIN_NS}><sheetData/></worksheet>')
+
+
+def test_typed_rows():
+    """测试逐行返回的单元格值和类型"""
+    print("测试单元格解析...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.xlsx"
+        build_workbook(path)
+        with XlsxWorkbook(path) as workbook:
+            assert workbook.sheet_names == ["数据", "Empty"]
+            rows = list(workbook.iter_rows("数据"))
+
+    assert rows[0] == ["Hello", None, "Rich text"]
+    assert rows[1] == [42, 1.5, datetime(2024, 1, 15), datetime(2024, 1, 15, 12)]
+    assert rows[2] == ["内联", True]
+    print("✓ 字符串、数字、日期和布尔值解析正确，空列保留位置")
+
+
+def test_workbook_text():
+    """测试工作簿文本与 openpyxl 路径的格式一致"""
+    print("测试工作簿文本...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "book.xlsx"
+        build_workbook(path)
+        text = read_workbook_text(path)
+
+    assert text == ("Sheet: 数据\nHello Rich text\n"
+                    "42 1.5 2024-01-15 00:00:00 2024-01-15 12:00:00\n内联 True")
+    print("✓ 空工作表被跳过，文本格式一致")
+
+
+def build_large_workbook(path: Path, rows: int) -> None:
+    """构造一个每行引用一个共享字符串的大工作表"""
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr("xl/workbook.xml", (
+            f'<workbook {MAIN_NS} '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            '<sheets><sheet name="Big" sheetId="1" r:id="rId1"/></sheets></workbook>'))
+        zf.writestr("xl/_rels/workbook.xml.rels", (
+            f'<Relationships {REL_NS}>'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml" Type="worksheet"/>'
+            '</Relationships>'))
+        zf.writestr("xl/sharedStrings.xml", f'<sst {MAIN_NS}>' + ''.join(
+            f'<si><t>s{i}</t></si>' for i in range(rows)) + '</sst>')
+        zf.writestr("xl/worksheets/sheet1.xml", f'<worksheet {MAIN_NS}><sheetData>' + ''.join(
+            f'<row r="{i + 1}"><c r="A{i + 1}" t="s"><v>{i}</v></c><c r="B{i + 1}"><v>{i}</v></c></row>'
+            for i in range(rows)) + '</sheetData></worksheet>')
+
+
+def test_tree_stays_bounded():
+    """测试已处理的行和共享字符串从父元素中移除，树不随行数增长"""
+    print("测试大工作表的内存占用...")
+
+    rows = 5000
+    parents = {}
+    max_children = {"sheetData": 0, "sst": 0}
+    original_iterparse = xlsx_reader.iterparse
+
+    def recording_iterparse(source, events=None):
+        # 记录 sheetData / sst 元素，每处理完一行或一个字符串时统计其子元素数
+        for event, elem in original_iterparse(source, events=events):
+            name = elem.tag.rsplit('}', 1)[-1]
+            if event == "start" and name in max_children:
+                parents[name] = elem
+            elif event == "end" and name in ("row", "si"):
+                parent = "sheetData" if name == "row" else "sst"
+                max_children[parent] = max(max_children[parent], len(parents[parent]))
+            yield event, elem
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "big.xlsx"
+        build_large_workbook(path, rows)
+        xlsx_reader.iterparse = recording_iterparse
+        try:
+            with XlsxWorkbook(path) as workbook:
+                values = list(workbook.iter_rows("Big"))
+        finally:
+            xlsx_reader.iterparse = original_iterparse
+
+    assert len(values) == rows and values[-1] == [f"s{rows - 1}", rows - 1]
+    # 只剩解析器预读的一小段，不会累积到全部行数
+    assert max_children["sheetData"] < rows // 4
+    assert max_children["sst"] < rows // 4
+    assert len(parents["sheetData"]) == 0 and len(parents["sst"]) == 0
+    print("✓ sheetData 和 sst 的子元素数保持有界")
+
+
+def main():
+    """主测试函数"""
+    print("智能文件处理工具 - Excel读取测试")
+    print("=" * 50)
+    test_typed_rows()
+    test_workbook_text()
+    test_tree_stays_bounded()
+    print("🎉 所有测试通过！")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+数字和日期提取模块
+
+所有数字格式和日期格式合并为一个预编译的正则表达式，一次扫描同时得到
+数字和日期。各分支按“日期 → 千分位数字 → 小数/整数”的优先级排列，
+匹配区间互不重叠：日期中的数字不会再计为数字，小数中的整数部分也不会
+被重复计数。AdvancedTextProcessor 和 SimpleTextProcessor 共用本模块。
+"""
+import re
+from typing import Any, List, Tuple
+
+_DATE_PATTERN = r"""
+        \b\d{4}-\d{1,2}-\d{1,2}\b           # YYYY-MM-DD
+      | \b\d{1,2}/\d{1,2}/\d{4}\b           # MM/DD/YYYY
+      | \b\d{1,2}-\d{1,2}-\d{4}\b           # MM-DD-YYYY
+      | \b\d{4}年\d{1,2}月\d{1,2}日\b        # 中文日期
+"""
+
+_SCANNER = re.compile(
+    r"""
+    (?P<date>""" + _DATE_PATTERN + r"""    )
+  | (?P<grouped>\b\d{1,3}(?:,\d{3})+(?:\.\d+)?\b)   # 带逗号的数字
+  | (?P<number>\b\d+(?:\.\d+)?\b)                    # 小数或整数
+    """,
+    re.VERBOSE,
+)
+
+# 整个单元格是一个日期或一个数字（允许正负号和千分位）
+_CELL = re.compile(
+    r"""
+    \s*(?:
+        (?P<date>""" + _DATE_PATTERN + r"""        )
+      | (?P<number>[-+]?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)
+    )\s*
+    """,
+    re.VERBOSE,
+)
+
+
+def extract_numbers_and_dates(text: str) -> Tuple[List[float], List[str]]:
+    """单次扫描提取数字和日期
+
+    返回 (去重并排序的数字, 按首次出现顺序去重的日期)。
+    """
+    if not text:
+        return [], []
+
+    numbers = set()
+    dates = {}
+
+    for match in _SCANNER.finditer(text):
+        kind = match.lastgroup
+        if kind == 'date':
+            dates.setdefault(match.group(), None)
+        elif kind == 'grouped':
+            numbers.add(float(match.group().replace(',', '')))
+        else:
+            numbers.add(float(match.group()))
+
+    return sorted(numbers), list(dates)
+
+
+def extract_numbers(text: str) -> List[float]:
+    """提取数字（去重并排序）"""
+    return extract_numbers_and_dates(text)[0]
+
+
+def extract_dates(text: str) -> List[str]:
+    """提取日期（按首次出现顺序去重）"""
+    return extract_numbers_and_dates(text)[1]
+
+
+def classify_cell(value: str) -> Tuple[str, Any]:
+    """判断字符串单元格的类型
+
+    返回 ("number", float)、("date", str) 或 ("text", str)。
+    """
+    match = _CELL.fullmatch(value)
+    if match is None:
+        return 'text', value
+    if match.lastgroup == 'date':
+        return 'date', match.group('date')
+    return 'number', float(match.group('number').replace(',', ''))
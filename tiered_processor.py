@@ -0,0 +1,317 @@
+"""
+分层（turbo）处理模块
+
+所有文档先经过不依赖任何模型的 SimpleTextProcessor（简化层），只有命中
+升级规则（长度、语言、关键词）的文档才交给 AdvancedTextProcessor 做完整的
+spaCy / VADER 处理（完整层）。两层都输出 ProcessingResult，字段和统计项相同；
+statistics["tier"] 记录结果来自哪一层，升级的文档在 statistics["escalated_by"]
+中记录命中的规则。
+"""
+import itertools
+import logging
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Union
+
+from config import config
+from entity_spans import EntitySpans
+from improved_data_processor import (
+    AdvancedTextProcessor, ProcessingResult, merge_structured, text_processor
+)
+from sentiment_engine import sentiment_engine
+from simple_data_processor import SimpleProcessingResult, SimpleTextProcessor
+from structured_content import StructuredContent
+
+logger = logging.getLogger(__name__)
+
+TIER_SIMPLE = "simple"
+TIER_FULL = "full"
+
+
+def _compile_keywords(keywords: List[str]) -> Optional[Pattern]:
+    """把关键词编译为一个不区分大小写的正则；英文单词按整词匹配"""
+    parts = []
+    for keyword in keywords:
+        if not keyword:
+            continue
+        if re.fullmatch(r'\w+', keyword, re.ASCII):
+            parts.append(rf'\b{re.escape(keyword)}\b')
+        else:
+            # 中文等没有单词边界的关键词按子串匹配
+            parts.append(re.escape(keyword))
+    return re.compile('|'.join(parts), re.IGNORECASE) if parts else None
+
+
+@dataclass
+class EscalationRules:
+    """升级规则：命中任意一条的文档交给完整层，没有配置任何规则时全部留在简化层"""
+    min_chars: Optional[int] = None
+    languages: List[str] = field(default_factory=list)
+    keywords: List[str] = field(default_factory=list)
+    _keyword_pattern: Optional[Pattern] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._keyword_pattern = _compile_keywords(self.keywords)
+
+    @classmethod
+    def from_config(cls) -> "EscalationRules":
+        return cls(
+            min_chars=config.get('turbo.escalate_min_chars'),
+            languages=list(config.get('turbo.escalate_languages', [])),
+            keywords=list(config.get('turbo.escalate_keywords', []))
+        )
+
+    def match(self, text: str, language: str) -> List[str]:
+        """返回文档命中的规则名（length / language / keywords）"""
+        reasons = []
+        if self.min_chars is not None and len(text) >= self.min_chars:
+            reasons.append("length")
+        if language in self.languages:
+            reasons.append("language")
+        if self._keyword_pattern is not None and self._keyword_pattern.search(text):
+            reasons.append("keywords")
+        return reasons
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"min_chars": self.min_chars, "languages": self.languages,
+                "keywords": self.keywords}
+
+
+class TieredTextProcessor:
+    """简化层 + 按规则升级到完整层的文本处理器
+
+    接口与 AdvancedTextProcessor 相同（process_text / process_texts /
+    process_content），可以直接替换批量处理中的文本处理器。
+    """
+
+    def __init__(self, full_processor: Optional[AdvancedTextProcessor] = None,
+                 rules: Optional[EscalationRules] = None,
+                 simple_processor: Optional[SimpleTextProcessor] = None,
+                 simple_sentiment: Optional[bool] = None):
+        self.full_processor = full_processor or AdvancedTextProcessor()
+        self.rules = rules or EscalationRules.from_config()
+        self.simple_processor = simple_processor or SimpleTextProcessor()
+        if simple_sentiment is None:
+            simple_sentiment = config.get('turbo.sentiment', False)
+        # 简化层的情感分析在升级判定之后批量计算，升级的文档不会重复打分
+        self.sentiment_engine = sentiment_engine if simple_sentiment else None
+        self.escalate_streamed = config.get('turbo.escalate_streamed', False)
+        self._lock = threading.Lock()
+        self._counts = {TIER_SIMPLE: 0, TIER_FULL: 0}
+
+    @property
+    def profile(self):
+        """完整层使用的处理配置档"""
+        return self.full_processor.profile
+
+    def set_profile(self, profile) -> None:
+        self.full_processor.set_profile(profile)
+
+    @property
+    def language_detector(self):
+        return self.full_processor.language_detector
+
+    def stats(self) -> Dict[str, int]:
+        """各层处理的文档数"""
+        with self._lock:
+            return dict(self._counts)
+
+    def process_text(self, text: str) -> ProcessingResult:
+        return self.process_texts([text])[0]
+
+    def process_content(self, content: Union[str, Iterable[str], StructuredContent]
+                        ) -> ProcessingResult:
+        """处理文件内容
+
+        结构化内容按自由文本判定是否升级。流式分块读取的大文件默认在简化层
+        逐块处理；turbo.escalate_streamed 为 True 时用第一个非空块判定升级规则，
+        命中时交给完整层逐块处理。两种方式的内存占用都与文件大小无关。
+        """
+        if content is None or isinstance(content, str):
+            return self.process_text(content)
+        if isinstance(content, StructuredContent):
+            return merge_structured(self.process_text(content.text), content)
+        return self.process_chunks(content)
+
+    def process_chunks(self, chunks: Iterable[str]) -> ProcessingResult:
+        """流式处理文本块（见 process_content）"""
+        chunks = iter(chunks)
+        skipped = []
+        first = None
+        for chunk in chunks:
+            if chunk and chunk.strip():
+                first = chunk
+                break
+            skipped.append(chunk or "")
+        if first is None:
+            return self.full_processor.process_text("")
+
+        language = self.language_detector.detect(first)
+        reasons = self.rules.match(first, language) if self.escalate_streamed else []
+        all_chunks = itertools.chain(skipped, [first], chunks)
+        if reasons:
+            self._count(TIER_FULL, 1)
+            return self._mark_full(self.full_processor.process_chunks(all_chunks), reasons)
+        self._count(TIER_SIMPLE, 1)
+        return self._from_simple_chunks(all_chunks, language)
+
+    def process_texts(self, texts: List[str], batch_size: Optional[int] = None,
+                      n_process: Optional[int] = None) -> List[ProcessingResult]:
+        """批量处理文本，升级的文档一起交给完整层（nlp.pipe）"""
+        results: List[Optional[ProcessingResult]] = [None] * len(texts)
+        simple_indexes = []
+        escalated = []
+
+        for index, text in enumerate(texts):
+            if not text or not text.strip():
+                # 空输入与完整层的结果一致，不会加载模型
+                results[index] = self.full_processor.process_text(text)
+                continue
+
+            # 使用完整层的语言检测器（文字分布判定不需要模型），支持 zh/en 以外的语言规则
+            language = self.language_detector.detect(text)
+            reasons = self.rules.match(text, language)
+            if reasons:
+                escalated.append((index, reasons))
+            else:
+                simple = self.simple_processor.process_text(text)
+                results[index] = self._from_simple(simple, language)
+                simple_indexes.append(index)
+
+        if self.sentiment_engine is not None and simple_indexes:
+            scores = self.sentiment_engine.score_many([texts[index] for index in simple_indexes])
+            for index, sentiment in zip(simple_indexes, scores):
+                results[index].sentiment = sentiment
+
+        if escalated:
+            full_results = self.full_processor.process_texts(
+                [texts[index] for index, _ in escalated], batch_size, n_process
+            )
+            for (index, reasons), result in zip(escalated, full_results):
+                results[index] = self._mark_full(result, reasons)
+
+        self._count(TIER_SIMPLE, len(simple_indexes))
+        self._count(TIER_FULL, len(escalated))
+        return results
+
+    def _count(self, tier: str, count: int) -> None:
+        with self._lock:
+            self._counts[tier] += count
+
+    @staticmethod
+    def _mark_full(result: ProcessingResult, reasons: List[str]) -> ProcessingResult:
+        result.statistics["tier"] = TIER_FULL
+        result.statistics["escalated_by"] = reasons
+        return result
+
+    @staticmethod
+    def _from_simple(simple: SimpleProcessingResult, language: str) -> ProcessingResult:
+        """把简化层结果转换为与完整层相同的 ProcessingResult（语言以检测器结果为准）"""
+        text = simple.original_text
+        words = text.split()
+        result = ProcessingResult(
+            original_text=text,
+            processed_text=simple.processed_text,
+            language=language,
+            sentiment=simple.sentiment,
+            numbers=simple.numbers,
+            dates=simple.dates,
+            entities=EntitySpans(text),
+            statistics={},
+            errors=[]
+        )
+        # 统计项与 AdvancedTextProcessor._generate_statistics 一致，token_count 为简化层的词数
+        result.statistics = {
+            "char_count": len(text),
+            "word_count": len(words),
+            "token_count": simple.word_count,
+            "sentence_count": simple.sentence_count,
+            "avg_word_length": sum(len(word) for word in words) / len(words) if words else 0,
+            "number_count": len(simple.numbers),
+            "date_count": len(simple.dates),
+            "entity_count": 0,
+            "language": result.language,
+            "processing_errors": 0,
+            "tier": TIER_SIMPLE
+        }
+        return result
+
+    def _from_simple_chunks(self, chunks: Iterable[str], language: str) -> ProcessingResult:
+        """在简化层逐块处理并合并，上限与 AdvancedTextProcessor.process_chunks 相同"""
+        max_processed_chars = config.get('processing.stream_max_processed_chars', 1000000)
+        processed_parts = []
+        processed_chars = 0
+        processed_truncated = False
+        numbers = set()
+        dates = set()
+        sentiment_sums: Dict[str, float] = {}
+        sentiment_chars = 0
+        totals = {"char_count": 0, "word_count": 0, "token_count": 0, "sentence_count": 0}
+        total_word_length = 0
+        chunk_count = 0
+
+        for chunk in chunks:
+            totals["char_count"] += len(chunk)
+            if not chunk.strip():
+                continue
+            chunk_count += 1
+            simple = self.simple_processor.process_text(chunk)
+
+            room = max_processed_chars - processed_chars
+            kept = simple.processed_text[:max(room, 0)]
+            if kept:
+                processed_parts.append(kept)
+                processed_chars += len(kept) + 1
+            processed_truncated = processed_truncated or len(kept) < len(simple.processed_text)
+
+            numbers.update(simple.numbers)
+            dates.update(simple.dates)
+            words = chunk.split()
+            totals["word_count"] += len(words)
+            totals["token_count"] += simple.word_count
+            totals["sentence_count"] += simple.sentence_count
+            total_word_length += sum(len(word) for word in words)
+
+            if self.sentiment_engine is not None:
+                for key, value in self.sentiment_engine.score(chunk).items():
+                    sentiment_sums[key] = sentiment_sums.get(key, 0.0) + value * len(chunk)
+                sentiment_chars += len(chunk)
+
+        result = ProcessingResult(
+            original_text="",
+            processed_text=" ".join(processed_parts),
+            language=language,
+            sentiment={key: value / sentiment_chars for key, value in sentiment_sums.items()}
+                      if sentiment_chars else {},
+            numbers=sorted(numbers),
+            dates=sorted(dates),
+            entities=EntitySpans(),
+            statistics={},
+            errors=[]
+        )
+        result.statistics = {
+            **totals,
+            "avg_word_length": total_word_length / totals["word_count"] if totals["word_count"] else 0,
+            "number_count": len(result.numbers),
+            "date_count": len(result.dates),
+            "entity_count": 0,
+            "language": language,
+            "processing_errors": 0,
+            "chunk_count": chunk_count,
+            "streamed": True,
+            "processed_text_truncated": processed_truncated,
+            "entities_truncated": False,
+            "tier": TIER_SIMPLE
+        }
+        return result
+
+
+# 全局分层处理器（完整层与 improved_data_processor.text_processor 共用）
+tiered_processor = TieredTextProcessor(text_processor)
+
+
+def process_tiered_in_worker(content: Union[str, Iterable[str], StructuredContent]
+                             ) -> ProcessingResult:
+    """进程池任务函数（配合 improved_data_processor.init_worker 使用）"""
+    return tiered_processor.process_content(content)
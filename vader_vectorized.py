@@ -0,0 +1,335 @@
+"""
+NumPy 向量化的 VADER 批量打分模块
+
+NLTK 的 SentimentIntensityAnalyzer 逐词用纯 Python 计算情感值。这里把词典
+编译为“词ID → 特征”数组（情感值、是否在词典中、程度副词、否定词、全大写等），
+一批句子的所有词拼接成一个扁平数组，按 polarity_scores 的规则（全大写强调、
+前 3 个词的程度副词和否定窗口、never so/this、least、but、标点强调和归一化）
+一次性计算。分词仍在 Python 中完成，规则与 SentiText 相同；少见的习语
+（SPECIAL_CASE_IDIOMS）只对候选位置逐个处理。结果与 polarity_scores 的差异
+只来自浮点求和顺序。
+"""
+import math
+import string
+import threading
+from typing import Dict, List
+
+import numpy as np
+from nltk.sentiment.vader import VaderConstants
+
+_PUNCTUATION = string.punctuation
+_PUNCTUATION_SET = frozenset(_PUNCTUATION)
+
+# 每个词ID的特征列
+_FLOAT_FEATURES = ("lex", "booster")
+_BOOL_FEATURES = ("in_lex", "is_booster", "negated", "upper", "never", "so_this",
+                  "least", "at_very", "kind", "of", "but", "idiom_word")
+
+
+class VectorizedVader:
+    """按批计算 VADER 分数，结果格式与 polarity_scores 相同"""
+
+    def __init__(self, lexicon: Dict[str, float], max_vocab: int = 2_000_000):
+        self.lexicon = lexicon
+        self.constants = VaderConstants()
+        self.max_vocab = max_vocab
+        self._punc_set = set(self.constants.PUNC_LIST)
+        self._remove_punctuation = self.constants.REGEX_REMOVE_PUNCTUATION
+        # 习语和多词程度副词中出现的词（区分大小写，与原实现一致）
+        self._idiom_words = {word for phrase in self.constants.SPECIAL_CASE_IDIOMS
+                             for word in phrase.split()}
+        self._idiom_words.update(word for phrase in self.constants.BOOSTER_DICT
+                                 if ' ' in phrase for word in phrase.split())
+        self._lock = threading.Lock()
+        self._reset_vocab()
+
+    @classmethod
+    def from_analyzer(cls, analyzer, **kwargs) -> "VectorizedVader":
+        """使用已加载的 SentimentIntensityAnalyzer 的词典"""
+        return cls(analyzer.lexicon, **kwargs)
+
+    def polarity_scores(self, text: str) -> Dict[str, float]:
+        return self.polarity_scores_batch([text])[0]
+
+    def polarity_scores_batch(self, texts: List[str]) -> List[Dict[str, float]]:
+        """一批句子的 neg / neu / pos / compound"""
+        tokenized = [self._tokenize(text) for text in texts]
+        results = [{"neg": 0.0, "neu": 0.0, "pos": 0.0, "compound": 0.0} for _ in texts]
+        nonempty = [index for index, words in enumerate(tokenized) if words]
+        if not nonempty:
+            return results
+
+        with self._lock:
+            if self._size >= self.max_vocab:
+                # 词表过大时在批次开始前清空重建；已取出特征快照的其他批次不受影响
+                self._reset_vocab()
+            known = self._ids.get
+            ids = []
+            for index in nonempty:
+                for word in tokenized[index]:
+                    token_id = known(word)
+                    ids.append(token_id if token_id is not None else self._token_id(word))
+            features = {name: column[:self._size] for name, column in self._features.items()}
+
+        lengths = np.array([len(tokenized[index]) for index in nonempty], dtype=np.int64)
+        sentiments = self._token_sentiments(np.array(ids, dtype=np.int64), lengths, features,
+                                            [tokenized[index] for index in nonempty])
+
+        columns = np.stack((sentiments,
+                            np.where(sentiments > 0, sentiments + 1, 0.0),
+                            np.where(sentiments < 0, sentiments - 1, 0.0),
+                            (sentiments == 0).astype(np.float64)))
+        sums, pos_sums, neg_sums, neu_counts = _sequential_sums(columns, lengths)
+
+        for row, index in enumerate(nonempty):
+            results[index] = self._score_valence(texts[index], float(sums[row]),
+                                                 float(pos_sums[row]), float(neg_sums[row]),
+                                                 int(neu_counts[row]))
+        return results
+
+    def _tokenize(self, text: str) -> List[str]:
+        """与 SentiText._words_and_emoticons 相同的分词：去掉长度为 1 的词，
+        去掉词首或词尾的单个标点（PUNC_LIST 中的项），保留缩写和表情"""
+        words_only = None
+        words = []
+        for word in text.split():
+            if len(word) <= 1:
+                continue
+            if word[0] not in _PUNCTUATION_SET and word[-1] not in _PUNCTUATION_SET:
+                words.append(word)
+                continue
+            if words_only is None:
+                words_only = {item for item in self._remove_punctuation.sub("", text).split()
+                              if len(item) > 1}
+            stripped = word.rstrip(_PUNCTUATION)
+            if stripped != word and word[len(stripped):] in self._punc_set and stripped in words_only:
+                word = stripped
+            else:
+                stripped = word.lstrip(_PUNCTUATION)
+                if (stripped != word and word[:len(word) - len(stripped)] in self._punc_set
+                        and stripped in words_only):
+                    word = stripped
+            words.append(word)
+        return words
+
+    def _reset_vocab(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._size = 0
+        capacity = 4096
+        self._features = {name: np.zeros(capacity, dtype=np.float64) for name in _FLOAT_FEATURES}
+        self._features.update({name: np.zeros(capacity, dtype=bool) for name in _BOOL_FEATURES})
+
+    def _token_id(self, word: str) -> int:
+        """返回词的ID，首次出现时计算它的特征（调用方持有锁）"""
+        index = self._ids.get(word)
+        if index is not None:
+            return index
+        capacity = len(self._features["lex"])
+        if self._size >= capacity:
+            for name, column in self._features.items():
+                grown = np.zeros(capacity * 2, dtype=column.dtype)
+                grown[:capacity] = column
+                self._features[name] = grown
+
+        index = self._size
+        lower = word.lower()
+        constants = self.constants
+        values = {
+            "lex": self.lexicon.get(lower, 0.0),
+            "booster": constants.BOOSTER_DICT.get(lower, 0.0),
+            "in_lex": lower in self.lexicon,
+            "is_booster": lower in constants.BOOSTER_DICT,
+            "negated": lower in constants.NEGATE or "n't" in lower,
+            "upper": word.isupper(),
+            "never": word == "never",
+            "so_this": word in ("so", "this"),
+            "least": lower == "least",
+            "at_very": lower in ("at", "very"),
+            "kind": lower == "kind",
+            "of": lower == "of",
+            "but": lower == "but",
+            "idiom_word": word in self._idiom_words,
+        }
+        for name, value in values.items():
+            self._features[name][index] = value
+        self._ids[word] = index
+        self._size += 1
+        return index
+
+    def _token_sentiments(self, ids: np.ndarray, lengths: np.ndarray,
+                          features: Dict[str, np.ndarray],
+                          sentences: List[List[str]]) -> np.ndarray:
+        """计算每个词位置的情感值（对应 polarity_scores 中的 sentiments 列表）"""
+        constants = self.constants
+        count = len(ids)
+        sentence_ids = np.repeat(np.arange(len(lengths)), lengths)
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        positions = np.arange(count) - starts[sentence_ids]
+        length_of = lengths[sentence_ids]
+
+        def feature(name: str, shift: int = 0) -> np.ndarray:
+            """每个位置前 shift 个词（shift 为负时为之后的词）的特征，越过句子边界时为 0"""
+            column = features[name][ids]
+            if shift == 0:
+                return column
+            shifted = np.zeros_like(column)
+            if shift > 0:
+                shifted[shift:] = column[:-shift]
+                shifted[positions < shift] = 0
+            else:
+                shifted[:shift] = column[-shift:]
+                shifted[positions >= length_of + shift] = 0
+            return shifted
+
+        in_lex = feature("in_lex")
+        upper = feature("upper")
+        upper_count = np.add.reduceat(upper.astype(np.int64), starts)
+        cap_diff_by_sentence = (lengths - upper_count > 0) & (lengths - upper_count < lengths)
+        cap_diff = cap_diff_by_sentence[sentence_ids]
+
+        valence = np.where(in_lex, feature("lex"), 0.0)
+        emphasized = in_lex & upper & cap_diff
+        valence = np.where(emphasized,
+                           np.where(valence > 0, valence + constants.C_INCR,
+                                    valence - constants.C_INCR), valence)
+
+        for start_i in range(3):
+            shift = start_i + 1
+            active = in_lex & (positions > start_i) & ~feature("in_lex", shift)
+
+            # 程度副词（scalar_inc_dec）
+            is_booster = feature("is_booster", shift)
+            scalar = np.where(valence < 0, -feature("booster", shift), feature("booster", shift))
+            capped = is_booster & feature("upper", shift) & cap_diff
+            scalar = np.where(capped, np.where(valence > 0, scalar + constants.C_INCR,
+                                               scalar - constants.C_INCR), scalar)
+            if start_i == 1:
+                scalar = scalar * 0.95
+            elif start_i == 2:
+                scalar = scalar * 0.9
+            valence = np.where(active, valence + scalar, valence)
+
+            # 否定窗口（_never_check）
+            if start_i == 0:
+                negate = active & feature("negated", 1)
+                valence = np.where(negate, valence * constants.N_SCALAR, valence)
+            elif start_i == 1:
+                boost = active & feature("never", 2) & feature("so_this", 1)
+                negate = active & ~boost & feature("negated", 2)
+                valence = np.where(boost, valence * 1.5,
+                                   np.where(negate, valence * constants.N_SCALAR, valence))
+            else:
+                boost = active & ((feature("never", 3) & feature("so_this", 2))
+                                  | feature("so_this", 1))
+                negate = active & ~boost & feature("negated", 3)
+                valence = np.where(boost, valence * 1.25,
+                                   np.where(negate, valence * constants.N_SCALAR, valence))
+
+                # 习语（_idioms_check）：只处理附近有习语词的位置
+                nearby = (feature("idiom_word", 3) | feature("idiom_word", 2)
+                          | feature("idiom_word", 1) | feature("idiom_word")
+                          | feature("idiom_word", -1) | feature("idiom_word", -2))
+                for flat in np.nonzero(active & nearby)[0]:
+                    words = sentences[sentence_ids[flat]]
+                    valence[flat] = self._idioms_check(valence[flat], words, int(positions[flat]))
+
+        # least 否定（_least_check）
+        after_least = in_lex & (positions > 0) & ~feature("in_lex", 1) & feature("least", 1)
+        excused = (positions > 1) & feature("at_very", 2)
+        valence = np.where(after_least & ~excused, valence * constants.N_SCALAR, valence)
+
+        # 程度副词本身和 "kind of" 中的 kind 不计分
+        skip = feature("is_booster") | (feature("kind") & feature("of", -1))
+        valence = np.where(skip, 0.0, valence)
+
+        # 重复出现的词都使用第一次出现位置的值（与 polarity_scores 一致）
+        keys = sentence_ids.astype(np.int64) * (int(ids.max()) + 1) + ids
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        sentiments = valence[first[inverse.reshape(-1)]]
+
+        # but 之前的分数减半，之后的乘 1.5（_but_check）
+        but = feature("but")
+        but_positions = np.where(but, positions, np.iinfo(np.int64).max)
+        first_but = np.minimum.reduceat(but_positions, starts)[sentence_ids]
+        has_but = first_but != np.iinfo(np.int64).max
+        sentiments = np.where(has_but & (positions < first_but), sentiments * 0.5,
+                              np.where(has_but & (positions > first_but), sentiments * 1.5,
+                                       sentiments))
+        return sentiments
+
+    def _idioms_check(self, valence: float, words: List[str], i: int) -> float:
+        """与 SentimentIntensityAnalyzer._idioms_check 相同"""
+        idioms = self.constants.SPECIAL_CASE_IDIOMS
+        onezero = f"{words[i - 1]} {words[i]}"
+        twoonezero = f"{words[i - 2]} {words[i - 1]} {words[i]}"
+        twoone = f"{words[i - 2]} {words[i - 1]}"
+        threetwoone = f"{words[i - 3]} {words[i - 2]} {words[i - 1]}"
+        threetwo = f"{words[i - 3]} {words[i - 2]}"
+
+        for sequence in (onezero, twoonezero, twoone, threetwoone, threetwo):
+            if sequence in idioms:
+                valence = idioms[sequence]
+                break
+
+        if len(words) - 1 > i:
+            zeroone = f"{words[i]} {words[i + 1]}"
+            if zeroone in idioms:
+                valence = idioms[zeroone]
+        if len(words) - 1 > i + 1:
+            zeroonetwo = f"{words[i]} {words[i + 1]} {words[i + 2]}"
+            if zeroonetwo in idioms:
+                valence = idioms[zeroonetwo]
+
+        if threetwo in self.constants.BOOSTER_DICT or twoone in self.constants.BOOSTER_DICT:
+            valence = valence + self.constants.B_DECR
+        return valence
+
+    def _score_valence(self, text: str, sum_s: float, pos_sum: float, neg_sum: float,
+                       neu_count: int) -> Dict[str, float]:
+        """标点强调和归一化（与 score_valence 相同）"""
+        amplifier = self._punctuation_amplifier(text)
+        if sum_s > 0:
+            sum_s += amplifier
+        elif sum_s < 0:
+            sum_s -= amplifier
+        compound = self.constants.normalize(sum_s)
+
+        if pos_sum > math.fabs(neg_sum):
+            pos_sum += amplifier
+        elif pos_sum < math.fabs(neg_sum):
+            neg_sum -= amplifier
+
+        total = pos_sum + math.fabs(neg_sum) + neu_count
+        return {
+            "neg": round(math.fabs(neg_sum / total), 3),
+            "neu": round(math.fabs(neu_count / total), 3),
+            "pos": round(math.fabs(pos_sum / total), 3),
+            "compound": round(compound, 4),
+        }
+
+    @staticmethod
+    def _punctuation_amplifier(text: str) -> float:
+        exclamations = min(text.count("!"), 4)
+        questions = text.count("?")
+        amplifier = exclamations * 0.292
+        if questions > 1:
+            amplifier += questions * 0.18 if questions <= 3 else 0.96
+        return amplifier
+
+
+def _sequential_sums(columns: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """按句子从左到右依次求和
+
+    np.add.reduceat 的求和顺序与 Python 的 sum 不同，和恰好为 0 的句子可能得到
+    1e-16 之类的残差，从而改变标点强调的方向；这里在所有句子间并行、在句内按
+    位置顺序累加，结果与逐个相加完全一致。
+    """
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    order = np.argsort(-lengths, kind="stable")
+    descending = lengths[order]
+    sums = np.zeros((columns.shape[0], len(lengths)))
+    for position in range(int(descending[0])):
+        # 长度大于 position 的句子排在 order 的最前面
+        rows = order[:np.searchsorted(-descending, -position, side="left")]
+        sums[:, rows] += columns[:, starts[rows] + position]
+    return sums
@@ -0,0 +1,260 @@
+"""
+直接解析 XML 的 .xlsx 流式读取模块
+
+不经过 openpyxl 的单元格对象，直接从 zip 中用 iterparse 流式解析
+sharedStrings.xml 和各工作表的 XML，逐行惰性返回单元格值；
+多个工作表可以在进程池中并行读取。
+"""
+import logging
+import posixpath
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple, Union
+from xml.etree.ElementTree import iterparse
+
+logger = logging.getLogger(__name__)
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Excel 内置的日期/时间数字格式编号
+_BUILTIN_DATE_FORMATS = set(range(14, 23)) | {45, 46, 47}
+
+# 去掉格式代码中的引号文本、转义字符和颜色/条件段后再判断是否含日期占位符
+_FORMAT_NOISE_RE = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+_DATE_TOKEN_RE = re.compile(r'[dmyhs]', re.IGNORECASE)
+
+_EPOCH_1900 = datetime(1899, 12, 30)
+_EPOCH_1904 = datetime(1904, 1, 1)
+
+
+class XlsxWorkbook:
+    """.xlsx 工作簿（只读，直接解析XML）"""
+
+    def __init__(self, file_path: Union[str, Path]):
+        self.file_path = str(file_path)
+        self._zip = zipfile.ZipFile(self.file_path)
+        self.sheets: List[Tuple[str, str]] = []
+        self.date1904 = False
+        self._shared_strings: Optional[List[str]] = None
+        self._date_styles: Optional[set] = None
+        self._load_workbook()
+
+    def __enter__(self) -> "XlsxWorkbook":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        self._zip.close()
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return [name for name, _ in self.sheets]
+
+    def _load_workbook(self) -> None:
+        """读取工作表名称及其在包内的路径"""
+        targets = {}
+        with self._zip.open("xl/_rels/workbook.xml.rels") as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f"{_NS_PKG_REL}Relationship":
+                    target = elem.get("Target", "")
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join("xl", target))
+                    targets[elem.get("Id")] = target
+
+        with self._zip.open("xl/workbook.xml") as f:
+            for _, elem in iterparse(f):
+                if elem.tag == f"{_NS_MAIN}workbookPr":
+                    self.date1904 = elem.get("date1904") in ("1", "true")
+                elif elem.tag == f"{_NS_MAIN}sheet":
+                    target = targets.get(elem.get(f"{_NS_REL}id"))
+                    if target:
+                        self.sheets.append((elem.get("name"), target))
+
+    @property
+    def shared_strings(self) -> List[str]:
+        """流式解析共享字符串表（只解析一次）"""
+        if self._shared_strings is None:
+            strings = []
+            try:
+                with self._zip.open("xl/sharedStrings.xml") as f:
+                    sst = None
+                    for event, elem in iterparse(f, events=("start", "end")):
+                        if event == "start":
+                            if elem.tag == f"{_NS_MAIN}sst":
+                                sst = elem
+                            continue
+                        if elem.tag == f"{_NS_MAIN}si":
+                            # 富文本由多个 <r><t> 组成，需要拼接
+                            strings.append("".join(t.text or "" for t in elem.iter(f"{_NS_MAIN}t")))
+                            # 从 sst 中移除已处理的 <si>，树不随字符串数增长
+                            elem.clear()
+                            if sst is not None:
+                                sst.clear()
+            except KeyError:
+                pass  # 没有共享字符串表
+            self._shared_strings = strings
+        return self._shared_strings
+
+    @property
+    def date_styles(self) -> set:
+        """返回使用日期格式的单元格样式下标"""
+        if self._date_styles is None:
+            custom_formats = {}
+            date_styles = set()
+            try:
+                with self._zip.open("xl/styles.xml") as f:
+                    in_cell_xfs = False
+                    xf_index = 0
+                    for event, elem in iterparse(f, events=("start", "end")):
+                        if event == "start":
+                            if elem.tag == f"{_NS_MAIN}cellXfs":
+                                in_cell_xfs = True
+                            continue
+                        if elem.tag == f"{_NS_MAIN}numFmt":
+                            custom_formats[int(elem.get("numFmtId"))] = elem.get("formatCode", "")
+                        elif elem.tag == f"{_NS_MAIN}cellXfs":
+                            in_cell_xfs = False
+                        elif elem.tag == f"{_NS_MAIN}xf" and in_cell_xfs:
+                            fmt_id = int(elem.get("numFmtId", 0))
+                            if fmt_id in _BUILTIN_DATE_FORMATS or (
+                                    fmt_id in custom_formats
+                                    and _is_date_format(custom_formats[fmt_id])):
+                                date_styles.add(xf_index)
+                            xf_index += 1
+            except KeyError:
+                pass  # 没有样式表
+            self._date_styles = date_styles
+        return self._date_styles
+
+    def iter_rows(self, sheet_name: str) -> Iterator[list]:
+        """逐行返回工作表的单元格值
+
+        值的类型：共享/内联字符串为 str，数字为 int/float，日期格式的数字为
+        datetime，布尔为 bool；空单元格为 None，行内列位置保持不变。
+        """
+        target = dict(self.sheets)[sheet_name]
+        shared = self.shared_strings
+        date_styles = self.date_styles
+        epoch = _EPOCH_1904 if self.date1904 else _EPOCH_1900
+
+        row_tag = f"{_NS_MAIN}row"
+        cell_tag = f"{_NS_MAIN}c"
+        sheet_data_tag = f"{_NS_MAIN}sheetData"
+
+        with self._zip.open(target) as f:
+            sheet_data = None
+            for event, elem in iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == sheet_data_tag:
+                        sheet_data = elem
+                    continue
+                if elem.tag != row_tag:
+                    continue
+
+                row = []
+                for cell in elem.iter(cell_tag):
+                    column = _column_index(cell.get("r"))
+                    if column is not None and column > len(row):
+                        row.extend([None] * (column - len(row)))
+                    row.append(_cell_value(cell, shared, date_styles, epoch))
+                # 已处理的行从 sheetData 中移除（只 clear 行时空元素仍挂在树上），
+                # 保持内存占用恒定
+                elem.clear()
+                if sheet_data is not None:
+                    sheet_data.clear()
+                yield row
+
+    def iter_text_rows(self, sheet_name: str) -> Iterator[str]:
+        """逐行返回以空格连接的非空单元格文本"""
+        for row in self.iter_rows(sheet_name):
+            row_text = ' '.join(str(value) for value in row if value is not None)
+            if row_text.strip():
+                yield row_text
+
+
+def _is_date_format(format_code: str) -> bool:
+    """判断自定义数字格式是否为日期/时间格式"""
+    return bool(_DATE_TOKEN_RE.search(_FORMAT_NOISE_RE.sub("", format_code)))
+
+
+_DIGITS = "0123456789"
+
+
+@lru_cache(maxsize=16384)
+def _column_letters_index(letters: str) -> int:
+    """把列字母（如 "AB"）转换为从0开始的列号"""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char.upper()) - 64)
+    return index - 1
+
+
+def _column_index(reference: Optional[str]) -> Optional[int]:
+    """把单元格引用（如 "AB12"）转换为从0开始的列号"""
+    if not reference:
+        return None
+    return _column_letters_index(reference.rstrip(_DIGITS))
+
+
+def _cell_value(cell, shared: List[str], date_styles: set, epoch: datetime):
+    """解析单个 <c> 元素的值"""
+    cell_type = cell.get("t", "n")
+
+    if cell_type == "inlineStr":
+        return "".join(t.text or "" for t in cell.iter(f"{_NS_MAIN}t"))
+
+    value_elem = cell.find(f"{_NS_MAIN}v")
+    if value_elem is None or value_elem.text is None:
+        return None
+    raw = value_elem.text
+
+    if cell_type == "s":
+        return shared[int(raw)]
+    if cell_type == "b":
+        return raw == "1"
+    if cell_type in ("str", "e"):
+        return raw
+
+    number = float(raw) if any(c in raw for c in ".eE") else int(raw)
+    if int(cell.get("s", 0)) in date_styles:
+        try:
+            return epoch + timedelta(days=number)
+        except OverflowError:
+            return number
+    return number
+
+
+def _read_sheet_text(file_path: str, sheet_name: str) -> str:
+    """进程池任务：读取单个工作表的文本"""
+    with XlsxWorkbook(file_path) as workbook:
+        rows = list(workbook.iter_text_rows(sheet_name))
+    return f"Sheet: {sheet_name}\n" + '\n'.join(rows) if rows else ""
+
+
+def read_workbook_text(file_path: Union[str, Path], workers: int = 1) -> str:
+    """读取整个工作簿的文本，格式与 openpyxl 路径相同
+
+    workers > 1 且有多个工作表时，各工作表在进程池中并行解析。
+    """
+    file_path = str(file_path)
+    with XlsxWorkbook(file_path) as workbook:
+        sheet_names = workbook.sheet_names
+
+    if workers > 1 and len(sheet_names) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sheet_names))) as executor:
+            parts = list(executor.map(_read_sheet_text,
+                                      [file_path] * len(sheet_names), sheet_names))
+    else:
+        parts = [_read_sheet_text(file_path, name) for name in sheet_names]
+
+    return '\n\n'.join(part for part in parts if part)